@@ -0,0 +1,117 @@
+"""
+Synthetic graph generator: nodes.parquet / edges.parquet with power-law degrees.
+
+Edge endpoints are drawn from a Zipf-like distribution over node ranks, so a
+few hubs collect a large share of the edges while most nodes have one or two.
+Ranks are scattered over the id space, so hubs are not simply the lowest ids.
+Output is deterministic for a given seed and written by DuckDB in parallel,
+so 100M-edge graphs only need disk space, not RAM.
+
+    python -m benchmarks.generate --out bench_data [--edges 1000000] [--nodes N] [--skew 0.8] [--seed 42]
+"""
+import argparse
+import math
+import os
+import time
+import duckdb
+
+NODE_TYPES = ["entity", "officer", "intermediary", "address"]
+EDGE_TYPES = ["officer_of", "intermediary_of", "registered_address", "similar"]
+# Words display names are built from, so fuzzy searches match realistic numbers of rows
+NAME_WORDS = [
+    "Global", "Holdings", "Capital", "Trust", "Pacific", "Ocean", "Star", "Trading",
+    "Limited", "Group", "Investments", "Partners", "Atlantic", "Crown", "Summit", "Harbor",
+]
+# Salts of the per-row hashes, one independent stream per random column
+SALTS = {"word1": 1, "word2": 2, "node_type": 3, "country": 4, "source": 5, "target": 6, "edge_type": 7}
+# Multiplier that scatters node ranks over the id space; bumped until coprime with the node count
+SCATTER = 2654435761
+
+
+def generate(out_dir: str, num_edges: int, num_nodes: int = None, skew: float = 0.8, seed: int = 42) -> dict:
+    """
+    Write `num_nodes` nodes (default num_edges // 5) and `num_edges` edges
+    into `out_dir`. The share of edge endpoints on the node of rank r falls
+    off as r ** -skew (0 <= skew < 1; higher is more skewed).
+    Returns counts and the largest degree.
+    """
+    if not 0 <= skew < 1:
+        raise ValueError("skew must be in [0, 1)")
+    num_nodes = num_nodes or max(num_edges // 5, 1)
+    os.makedirs(out_dir, exist_ok=True)
+    started = time.perf_counter()
+
+    scatter = SCATTER
+    while math.gcd(scatter, num_nodes) != 1:
+        scatter += 2
+
+    # Inverse CDF of a density proportional to x ** -skew on [0, num_nodes)
+    exponent = 1.0 / (1.0 - skew)
+
+    def random(column: str) -> str:
+        # hash() over several arguments correlates across salts; rehashing an offset does not
+        return f"hash(hash(range) + {int(seed) * len(SALTS) + SALTS[column]})"
+
+    def choice(column: str, values: list) -> str:
+        return f"list_element([{', '.join(repr(v) for v in values)}], ({random(column)} % {len(values)})::INTEGER + 1)"
+
+    def endpoint(column: str) -> str:
+        uniform = f"(({random(column)} >> 11)::DOUBLE / 9007199254740992.0)"
+        rank = f"least(floor({num_nodes} * pow({uniform}, {exponent}))::BIGINT, {num_nodes - 1})"
+        return f"(1 + ({rank} * {scatter}) % {num_nodes})::BIGINT"
+
+    conn = duckdb.connect(":memory:")
+    options = "FORMAT PARQUET, COMPRESSION zstd"
+
+    print(f"Writing {num_nodes} nodes...")
+    conn.execute(f"""
+        COPY (
+            SELECT
+                (range + 1)::BIGINT AS id,
+                {choice('word1', NAME_WORDS)} || ' ' || {choice('word2', NAME_WORDS)} || ' ' || (range + 1) AS display_name,
+                {choice('node_type', NODE_TYPES)} AS node_type,
+                CASE WHEN {random('country')} % 5 = 0 THEN NULL ELSE 'JPN' END AS country_codes,
+                'Synthetic' AS sourceID
+            FROM range({num_nodes})
+        ) TO '{os.path.join(out_dir, "nodes.parquet")}' ({options})
+    """)
+
+    print(f"Writing {num_edges} edges (skew {skew})...")
+    conn.execute(f"""
+        COPY (
+            SELECT
+                (range + 1)::BIGINT AS id,
+                {endpoint('source')} AS source_id,
+                {endpoint('target')} AS target_id,
+                {choice('edge_type', EDGE_TYPES)} AS edge_type
+            FROM range({num_edges})
+        ) TO '{os.path.join(out_dir, "edges.parquet")}' ({options})
+    """)
+
+    max_degree = conn.execute(f"""
+        SELECT max(degree) FROM (
+            SELECT count(*) AS degree
+            FROM (SELECT source_id AS id FROM '{os.path.join(out_dir, "edges.parquet")}'
+                  UNION ALL SELECT target_id FROM '{os.path.join(out_dir, "edges.parquet")}')
+            GROUP BY id
+        )
+    """).fetchone()[0]
+    conn.close()
+
+    print(f"Synthetic graph written to {out_dir} in {time.perf_counter() - started:.3f}s (max degree {max_degree}).")
+    return {"nodes": num_nodes, "edges": num_edges, "max_degree": int(max_degree or 0)}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--out", required=True, help="Output directory (use it as DATA_DIR)")
+    parser.add_argument("--edges", type=int, default=1_000_000)
+    parser.add_argument("--nodes", type=int, default=None, help="Default: edges / 5")
+    parser.add_argument("--skew", type=float, default=0.8, help="Power-law exponent of endpoint ranks, in [0, 1)")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args(argv)
+    generate(args.out, args.edges, args.nodes, args.skew, args.seed)
+
+
+if __name__ == "__main__":
+    main()
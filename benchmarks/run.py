@@ -0,0 +1,248 @@
+"""
+Benchmark runner: drives every endpoint of the API through the app and
+reports latency percentiles, throughput, startup time and peak RSS as JSON.
+
+Request targets are skewed the way real traffic is: most node ids are drawn
+from random edge endpoints (so hubs are hit in proportion to their degree),
+the rest uniformly. Generate a dataset with `benchmarks.generate` first.
+
+    python -m benchmarks.run --data bench_data [--requests 200] [--concurrency 4] [--out result.json]
+    python -m benchmarks.run --data bench_data --compare baseline.json
+"""
+import argparse
+import concurrent.futures
+import contextlib
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+import duckdb
+import numpy as np
+
+# Share of node ids drawn by degree (random edge endpoints) rather than uniformly
+SKEWED_SHARE = 0.8
+# Settings that change results enough to be recorded next to them
+CONFIG_ENV = [
+    "LOAD_MODE", "DB_PATH", "DB_POOL_SIZE", "CACHE_MAX_ENTRIES", "SEARCH_INDEX_COLUMNS",
+    "EXECUTOR_POINT_WORKERS", "EXECUTOR_HEAVY_WORKERS", "DUCKDB_MEMORY_LIMIT", "DUCKDB_THREADS",
+    "GRAPH_ANALYTICS", "PAGERANK_DAMPING",
+]
+
+
+def sample_targets(data_dir: str, size: int, seed: int) -> dict:
+    """
+    Node ids, display names and name words to aim requests at, read straight
+    from the Parquet inputs before the app starts.
+    """
+    conn = duckdb.connect(":memory:")
+    nodes = os.path.join(data_dir, "nodes.parquet")
+    edges = os.path.join(data_dir, "edges.parquet")
+    counts = conn.execute(f"SELECT (SELECT count(*) FROM '{nodes}'), (SELECT count(*) FROM '{edges}')").fetchone()
+
+    ends = conn.execute(
+        f"SELECT source_id, target_id FROM '{edges}' USING SAMPLE reservoir({size} ROWS) REPEATABLE ({seed})"
+    ).fetchnumpy()
+    uniform = conn.execute(
+        f"SELECT id, display_name FROM '{nodes}' USING SAMPLE reservoir({size} ROWS) REPEATABLE ({seed})"
+    ).fetchnumpy()
+    conn.close()
+
+    rng = np.random.default_rng(seed)
+    by_degree = np.where(rng.random(len(ends["source_id"])) < 0.5, ends["source_id"], ends["target_id"])
+    ids = np.where(rng.random(size) < SKEWED_SHARE, rng.choice(by_degree, size), rng.choice(uniform["id"], size))
+    names = [str(name) for name in uniform["display_name"] if name is not None]
+    words = sorted({word for name in names for word in name.split() if len(word) >= 3 and not word.isdigit()})
+    return {
+        "nodes": int(counts[0]),
+        "edges": int(counts[1]),
+        "ids": ids.astype(np.int64).tolist(),
+        "names": names,
+        "words": words,
+    }
+
+
+def scenarios(targets: dict) -> dict:
+    """
+    One request factory per endpoint: f(rng) -> (method, url, params, body).
+    """
+    ids, names, words = targets["ids"], targets["names"], targets["words"]
+
+    def node_id(rng):
+        return ids[rng.integers(len(ids))]
+
+    return {
+        "node": lambda rng: ("GET", f"/api/v1/nodes/{node_id(rng)}", None, None),
+        "neighbors": lambda rng: ("GET", f"/api/v1/nodes/{node_id(rng)}/neighbors", None, None),
+        "neighbors_depth2": lambda rng: (
+            "GET", f"/api/v1/nodes/{node_id(rng)}/neighbors", {"depth": 2, "max_fanout": 100}, None
+        ),
+        "neighbors_sorted": lambda rng: (
+            "GET", f"/api/v1/nodes/{node_id(rng)}/neighbors", {"sort": "pagerank", "limit": 100}, None
+        ),
+        "neighbors_count": lambda rng: ("GET", f"/api/v1/nodes/{node_id(rng)}/neighbors/count", None, None),
+        "search_exact": lambda rng: (
+            "GET", "/api/v1/search", {"display_name": names[rng.integers(len(names))]}, None
+        ),
+        "search_fuzzy": lambda rng: (
+            "GET", "/api/v1/search", {"display_name": words[rng.integers(len(words))], "fuzzy": "true"}, None
+        ),
+        "degrees_top": lambda rng: ("GET", "/api/v1/degrees/top", {"limit": 25}, None),
+        "paths": lambda rng: (
+            "GET", "/api/v1/paths", {"from": node_id(rng), "to": node_id(rng), "max_depth": 4}, None
+        ),
+        "batch_get": lambda rng: (
+            "POST", "/api/v1/nodes:batchGet", None, {"ids": [node_id(rng) for _ in range(100)]}
+        ),
+        "batch_neighbors": lambda rng: (
+            "POST", "/api/v1/nodes/neighbors:batch", None, {"ids": [node_id(rng) for _ in range(10)]}
+        ),
+        "subgraph": lambda rng: (
+            "POST", "/api/v1/subgraph", None, {"ids": [node_id(rng) for _ in range(20)], "depth": 1, "max_nodes": 500}
+        ),
+        "schema": lambda rng: ("GET", "/api/v1/schema", None, None),
+    }
+
+
+def drive(client, make_request, requests: int, concurrency: int, seed: int) -> dict:
+    """
+    Send `requests` requests from `concurrency` threads and summarize them.
+    """
+    rng = np.random.default_rng(seed)
+    planned = [make_request(rng) for _ in range(requests)]
+
+    def send(request):
+        method, url, params, body = request
+        started = time.perf_counter()
+        response = client.request(method, url, params=params, json=body)
+        return time.perf_counter() - started, response.status_code
+
+    started = time.perf_counter()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=concurrency) as threads:
+        outcomes = list(threads.map(send, planned))
+    wall = time.perf_counter() - started
+
+    latencies = np.array([seconds for seconds, _ in outcomes]) * 1000
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+    return {
+        "requests": requests,
+        "errors": sum(1 for _, status in outcomes if status >= 400),
+        "p50_ms": round(float(p50), 3),
+        "p95_ms": round(float(p95), 3),
+        "p99_ms": round(float(p99), 3),
+        "mean_ms": round(float(latencies.mean()), 3),
+        "throughput_rps": round(requests / wall, 1),
+    }
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is in KiB on Linux and bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(rss / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(data_dir: str, requests: int, concurrency: int, seed: int, only=None) -> dict:
+    """
+    Start the app on `data_dir` and benchmark each endpoint in turn.
+    App logs go to stderr so stdout stays valid JSON.
+    """
+    os.environ["DATA_DIR"] = data_dir
+    targets = sample_targets(data_dir, max(requests, 1000), seed)
+
+    with contextlib.redirect_stdout(sys.stderr):
+        from fastapi.testclient import TestClient
+        from src.main import app
+
+        client = TestClient(app)
+        started = time.perf_counter()
+        client.__enter__()
+        startup = time.perf_counter() - started
+        rss_after_startup = peak_rss_mb()
+
+        endpoints = {}
+        try:
+            for i, (name, make_request) in enumerate(scenarios(targets).items()):
+                if only and name not in only:
+                    continue
+                print(f"Benchmarking {name}...")
+                # A short warm-up so first-request effects do not land in p99
+                drive(client, make_request, min(10, requests), 1, seed + 1000 + i)
+                endpoints[name] = drive(client, make_request, requests, concurrency, seed + i)
+        finally:
+            client.__exit__(None, None, None)
+
+    return {
+        "commit": git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "duckdb": duckdb.__version__,
+        "dataset": {"path": data_dir, "nodes": targets["nodes"], "edges": targets["edges"]},
+        "config": {
+            "requests": requests,
+            "concurrency": concurrency,
+            "seed": seed,
+            "env": {k: v for k, v in os.environ.items() if k in CONFIG_ENV or k.startswith("BUDGET_")},
+        },
+        "startup_seconds": round(startup, 3),
+        "rss_after_startup_mb": rss_after_startup,
+        "peak_rss_mb": peak_rss_mb(),
+        "endpoints": endpoints,
+    }
+
+
+def compare(baseline: dict, current: dict):
+    """
+    Print per-endpoint p50/p95 changes of `current` against `baseline`.
+    """
+    print(f"baseline {baseline.get('commit')} -> current {current.get('commit')}", file=sys.stderr)
+    print(f"  {'startup':<18} {baseline['startup_seconds']:>9.3f}s -> {current['startup_seconds']:>9.3f}s", file=sys.stderr)
+    print(f"  {'peak rss':<18} {baseline['peak_rss_mb']:>8.1f}MB -> {current['peak_rss_mb']:>8.1f}MB", file=sys.stderr)
+    for name, now in current["endpoints"].items():
+        before = baseline["endpoints"].get(name)
+        if before is None:
+            continue
+        print(
+            f"  {name:<18} p50 {before['p50_ms']:>8.2f} -> {now['p50_ms']:>8.2f} ms ({now['p50_ms'] / max(before['p50_ms'], 1e-9):.2f}x)"
+            f"   p95 {before['p95_ms']:>8.2f} -> {now['p95_ms']:>8.2f} ms ({now['p95_ms'] / max(before['p95_ms'], 1e-9):.2f}x)",
+            file=sys.stderr,
+        )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--data", required=True, help="Directory with nodes.parquet and edges.parquet")
+    parser.add_argument("--requests", type=int, default=200, help="Requests per endpoint")
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--endpoint", action="append", help="Only run this endpoint (repeatable)")
+    parser.add_argument("--no-cache", action="store_true", help="Disable the result cache (CACHE_MAX_ENTRIES=0)")
+    parser.add_argument("--out", help="Write the JSON report here instead of stdout")
+    parser.add_argument("--compare", help="Earlier JSON report to compare against")
+    args = parser.parse_args(argv)
+
+    if args.no_cache:
+        os.environ["CACHE_MAX_ENTRIES"] = "0"
+    report = run(args.data, args.requests, args.concurrency, args.seed, args.endpoint)
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    if args.compare:
+        with open(args.compare) as f:
+            compare(json.load(f), report)
+
+
+if __name__ == "__main__":
+    main()
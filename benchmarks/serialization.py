@@ -0,0 +1,108 @@
+"""
+Micro-benchmark: JSON responses of a 10k-edge hub, with and without the
+fast JSON path (FAST_JSON).
+
+Serves /nodes/{id}/neighbors for a hub with `--edges` neighbors through
+the app and reports latency and throughput for the validating path
+(FAST_JSON=0: one Node / Edge model per row, then FastAPI's encoder) and
+the direct orjson encoding (FAST_JSON=1). Repeated requests hit the
+result cache unless --no-cache is given, so the numbers isolate response
+encoding; the encoders alone are also timed on the same result.
+
+    python -m benchmarks.serialization [--edges 10000] [--requests 50] [--no-cache]
+"""
+import argparse
+import contextlib
+import json
+import os
+import sys
+import tempfile
+import time
+import numpy as np
+from benchmarks.neighbors_response import HUB_ID, build_hub_graph
+
+MODES = {"validated": "0", "fast": "1"}
+
+
+def write_hub_dataset(out_dir: str, num_edges: int):
+    conn = build_hub_graph(num_edges)
+    for table in ["nodes", "edges"]:
+        conn.execute(f"COPY {table} TO '{os.path.join(out_dir, table + '.parquet')}' (FORMAT PARQUET)")
+    conn.close()
+
+
+def drive(client, url: str, requests: int) -> dict:
+    latencies = []
+    size = 0
+    for _ in range(requests):
+        started = time.perf_counter()
+        response = client.get(url)
+        latencies.append(time.perf_counter() - started)
+        size = len(response.content)
+    latencies = np.array(latencies) * 1000
+    return {
+        "p50_ms": round(float(np.percentile(latencies, 50)), 3),
+        "p95_ms": round(float(np.percentile(latencies, 95)), 3),
+        "throughput_rps": round(requests / (latencies.sum() / 1000), 1),
+        "response_mb": round(size / 1e6, 2),
+    }
+
+
+def encoders(result: dict, repeat: int) -> dict:
+    """
+    Best-of-`repeat` time of each encoding of one neighbors result.
+    """
+    from src import fastjson
+    from src.schemas import NeighborsResponse
+
+    def validated():
+        return NeighborsResponse.model_validate(result).model_dump_json().encode()
+
+    timings = {}
+    for name, fn in [("validated", validated), ("fast", lambda: fastjson.dumps(result))]:
+        best = float("inf")
+        for _ in range(repeat):
+            started = time.perf_counter()
+            fn()
+            best = min(best, time.perf_counter() - started)
+        timings[f"{name}_ms"] = round(best * 1000, 3)
+    return timings
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--edges", type=int, default=10_000)
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--no-cache", action="store_true", help="Disable the result cache (CACHE_MAX_ENTRIES=0)")
+    args = parser.parse_args(argv)
+
+    data_dir = tempfile.mkdtemp()
+    write_hub_dataset(data_dir, args.edges)
+    os.environ["DATA_DIR"] = data_dir
+    os.environ["BUDGET_NEIGHBORS_MAX_ROWS"] = str(args.edges)
+    if args.no_cache:
+        os.environ["CACHE_MAX_ENTRIES"] = "0"
+    url = f"/api/v1/nodes/{HUB_ID}/neighbors"
+
+    report = {"edges": args.edges, "requests": args.requests, "cache": not args.no_cache, "endpoint": {}}
+    with contextlib.redirect_stdout(sys.stderr):
+        from fastapi.testclient import TestClient
+        from src.main import app
+
+        with TestClient(app) as client:
+            result = client.get(url).json()
+            assert len(result["edges"]) == args.edges
+            for mode, flag in MODES.items():
+                os.environ["FAST_JSON"] = flag
+                drive(client, url, min(5, args.requests))
+                report["endpoint"][mode] = drive(client, url, args.requests)
+        report["encoders"] = encoders(result, max(args.requests // 5, 3))
+
+    endpoint = report["endpoint"]
+    report["speedup"] = round(endpoint["validated"]["p50_ms"] / max(endpoint["fast"]["p50_ms"], 1e-9), 2)
+    json.dump(report, sys.stdout, indent=2)
+    print()
+
+
+if __name__ == "__main__":
+    main()
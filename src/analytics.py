@@ -0,0 +1,197 @@
+import os
+import time
+import duckdb
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional
+from src.graph import AdjacencyIndex, INDEX_SCHEMA
+
+# Node fields computed here, usable as `sort` keys (highest first)
+SORT_KEYS = ["pagerank", "component_size"]
+
+PAGERANK_DAMPING = 0.85
+PAGERANK_MAX_ITER = 100
+# Convergence threshold on the L1 change of the rank vector per iteration
+PAGERANK_TOL = 1e-9
+
+
+def enabled() -> bool:
+    """
+    Whether datasets compute graph analytics at load (GRAPH_ANALYTICS, on by default).
+    """
+    return os.environ.get("GRAPH_ANALYTICS", "1") != "0"
+
+
+def damping() -> float:
+    """
+    PageRank damping factor (PAGERANK_DAMPING).
+    """
+    return float(os.environ.get("PAGERANK_DAMPING", str(PAGERANK_DAMPING)))
+
+
+class GraphAnalytics:
+    """
+    Whole-graph node metrics computed from the adjacency index after load:
+    PageRank over directed edges, weakly connected component (labelled by
+    its smallest node id) and component size, one value per dense position.
+
+    Both algorithms are vectorized over the edge arrays (bincount sparse
+    matrix-vector products, min-label hooking with pointer jumping), so no
+    Python code runs per edge. Persistent databases (DB_PATH) store them at
+    build time, so restarts on unchanged inputs skip the computation.
+    """
+
+    def __init__(self, node_ids: np.ndarray, pagerank: np.ndarray, component: np.ndarray, component_size: np.ndarray, iterations: int = 0):
+        self.node_ids = node_ids
+        self.pagerank = pagerank
+        # Smallest node id in the node's weakly connected component
+        self.component = component
+        self.component_size = component_size
+        self.iterations = iterations
+
+    @classmethod
+    def from_graph(cls, graph: AdjacencyIndex, damping: float = PAGERANK_DAMPING) -> "GraphAnalytics":
+        started = time.perf_counter()
+        pagerank, iterations = _pagerank(graph.edge_src, graph.edge_tgt, graph.num_nodes, damping)
+        labels = _components(graph.edge_src, graph.edge_tgt, graph.num_nodes)
+        sizes = np.bincount(labels, minlength=graph.num_nodes)[labels]
+        analytics = cls(graph.node_ids, pagerank, graph.node_ids[labels], sizes, iterations)
+        print(
+            f"Graph analytics computed: PageRank ({iterations} iterations), "
+            f"{len(np.unique(labels))} components in {time.perf_counter() - started:.3f}s"
+        )
+        return analytics
+
+    @classmethod
+    def from_connection(cls, conn: duckdb.DuckDBPyConnection, graph: AdjacencyIndex, damping: float = PAGERANK_DAMPING) -> "GraphAnalytics":
+        """
+        Analytics for `graph`. A persistent database built for the same
+        inputs and damping carries a saved copy (see `save`), which is loaded
+        instead of recomputing.
+        """
+        started = time.perf_counter()
+        if _saved_damping(conn) == damping:
+            analytics = cls.load(conn, graph.node_ids)
+            print(f"Graph analytics loaded in {time.perf_counter() - started:.3f}s")
+            return analytics
+        return cls.from_graph(graph, damping)
+
+    def save(self, conn: duckdb.DuckDBPyConnection, damping: float = PAGERANK_DAMPING):
+        """
+        Persist the per-position arrays into the `yata` schema next to the
+        adjacency index, read back in insertion order.
+        """
+        conn.execute(f"CREATE SCHEMA IF NOT EXISTS {INDEX_SCHEMA}")
+        nodes = pd.DataFrame({
+            "pagerank": self.pagerank,
+            "component": self.component,
+            "component_size": self.component_size,
+        })
+        params = pd.DataFrame({"damping": [damping], "iterations": [self.iterations]})
+        for name, df in [("analytics_nodes", nodes), ("analytics_params", params)]:
+            conn.execute(f"CREATE OR REPLACE TABLE {INDEX_SCHEMA}.{name} AS SELECT * FROM df")
+
+    @classmethod
+    def load(cls, conn: duckdb.DuckDBPyConnection, node_ids: np.ndarray) -> "GraphAnalytics":
+        """
+        Load analytics previously written by `save`.
+        """
+        nodes = conn.execute(f"SELECT * FROM {INDEX_SCHEMA}.analytics_nodes").fetchnumpy()
+        iterations = conn.execute(f"SELECT iterations FROM {INDEX_SCHEMA}.analytics_params").fetchone()[0]
+        return cls(
+            node_ids,
+            np.asarray(nodes["pagerank"], dtype=np.float64),
+            np.asarray(nodes["component"], dtype=np.int64),
+            np.asarray(nodes["component_size"], dtype=np.int64),
+            int(iterations),
+        )
+
+    def values(self, key: str) -> np.ndarray:
+        if key not in SORT_KEYS:
+            raise ValueError(f"Unknown sort key '{key}'. Must be one of {SORT_KEYS}")
+        return getattr(self, key)
+
+    def order(self, ids: np.ndarray, key: str) -> np.ndarray:
+        """
+        `ids` reordered by `key`, highest first; ties (and ids unknown to the
+        graph, which sort last) keep their input order.
+        """
+        ids = np.asarray(ids, dtype=np.int64)
+        if ids.size == 0:
+            return ids
+        pos = np.minimum(np.searchsorted(self.node_ids, ids), len(self.node_ids) - 1)
+        values = np.where(self.node_ids[pos] == ids, self.values(key)[pos], -np.inf)
+        return ids[np.argsort(-values, kind="stable")]
+
+    def fields(self, ids: np.ndarray) -> Dict[str, List]:
+        """
+        pagerank / component / component_size for node `ids` as lists (None for unknown ids).
+        """
+        ids = np.asarray(ids, dtype=np.int64)
+        if ids.size == 0 or len(self.node_ids) == 0:
+            return {"pagerank": [None] * len(ids), "component": [None] * len(ids), "component_size": [None] * len(ids)}
+        pos = np.minimum(np.searchsorted(self.node_ids, ids), len(self.node_ids) - 1)
+        known = (self.node_ids[pos] == ids).tolist()
+
+        def column(values):
+            return [v if ok else None for v, ok in zip(values[pos].tolist(), known)]
+
+        return {
+            "pagerank": column(self.pagerank),
+            "component": column(self.component),
+            "component_size": column(self.component_size),
+        }
+
+
+def _pagerank(src: np.ndarray, tgt: np.ndarray, n: int, damping: float):
+    """
+    Power iteration. Rank of dangling nodes (no out-edges) is spread evenly.
+    Returns (ranks summing to 1, iterations run).
+    """
+    if n == 0:
+        return np.empty(0, dtype=np.float64), 0
+    out_degree = np.bincount(src, minlength=n)
+    dangling = out_degree == 0
+    # Share of a node's rank sent along each of its edges
+    weight = 1.0 / out_degree[src]
+
+    rank = np.full(n, 1.0 / n)
+    iterations = 0
+    for iterations in range(1, PAGERANK_MAX_ITER + 1):
+        spread = np.bincount(tgt, weights=rank[src] * weight, minlength=n)
+        new = damping * (spread + rank[dangling].sum() / n) + (1.0 - damping) / n
+        change = np.abs(new - rank).sum()
+        rank = new
+        if change < PAGERANK_TOL:
+            break
+    return rank, iterations
+
+
+def _components(src: np.ndarray, tgt: np.ndarray, n: int) -> np.ndarray:
+    """
+    Weakly connected components as the smallest dense position in each.
+    Each round hooks the larger root of every edge whose endpoints disagree
+    onto the smaller one, then flattens the forest by pointer jumping.
+    """
+    parent = np.arange(n, dtype=np.int64)
+    while True:
+        pu, pv = parent[src], parent[tgt]
+        differ = pu != pv
+        if not differ.any():
+            return parent
+        np.minimum.at(parent, np.maximum(pu[differ], pv[differ]), np.minimum(pu[differ], pv[differ]))
+        while True:
+            grand = parent[parent]
+            if np.array_equal(grand, parent):
+                break
+            parent = grand
+
+
+def _saved_damping(conn: duckdb.DuckDBPyConnection) -> Optional[float]:
+    row = conn.execute(
+        "SELECT count(*) FROM duckdb_tables() WHERE schema_name = ? AND table_name = 'analytics_params'",
+        [INDEX_SCHEMA]
+    ).fetchone()
+    if row[0] == 0:
+        return None
+    return conn.execute(f"SELECT damping FROM {INDEX_SCHEMA}.analytics_params").fetchone()[0]
@@ -1,282 +1,885 @@
-from fastapi import APIRouter, Depends, HTTPException, Request, Query
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, Response, Query
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+import hmac
+import os
+import threading
+import time
+import traceback
 import duckdb
-from src.deps import get_db
-from src.schemas import NodeResponse, NeighborsResponse, NeighborsCountResponse, Node, Edge, SchemaResponse, ColumnInfo, SearchResponse
-from typing import Optional
+import numpy as np
+import pyarrow as pa
+from src import deps, fastjson, metrics, profiling
+from src.deps import get_analytics, get_budgets, get_dataset, get_executor, get_graph, get_degrees, get_match_query, get_pool, get_search_index, get_catalog, get_cache
+from src.analytics import GraphAnalytics, SORT_KEYS
+from src.budget import Budget, interrupt_after
+from src.cache import ResultCache, MISS
+from src.catalog import Catalog
+from src.cursor import CursorError, encode_cursor, decode_cursor
+from src.dataset import Dataset
+from src.degrees import DegreeTable
+from src.executor import QueryExecutor, QueryTimeout, POINT, HEAVY
+from src.graph import AdjacencyIndex
+from src.pgq import MatchQuery, PatternError
+from src.pool import CursorPool, PoolTimeout
+from src.records import node_records, edge_records, row_records
+from src.search_index import SearchIndex
+from src.streaming import GRAPHML, STREAM_MEDIA_TYPES, arrow_table, negotiate, stream_batches, stream_graphml, stream_neighbors, stream_rows_by_ids
+from src.schemas import NodeResponse, NeighborsResponse, NeighborsCountResponse, Node, Edge, SchemaResponse, ColumnInfo, SearchResponse, StatsResponse, TopDegreeResponse, PathResponse, MatchRequest, MatchResponse, BatchGetRequest, BatchGetResponse, BatchNeighborsRequest, BatchNeighborsResponse, SubgraphRequest, SubgraphResponse, ReloadResponse
+from typing import Dict, List, Optional, Tuple, Type
 
-router = APIRouter()
+# Routes record latency and serialization histograms for /metrics
+router = APIRouter(route_class=metrics.InstrumentedRoute)
+
+# Upper bound for /nodes/{id}/neighbors?depth=N
+MAX_DEPTH = 5
+
+# Partition key of each table; filters on it are always exact so files can be pruned
+PARTITION_COLUMNS = {"nodes": "node_type", "edges": "edge_type"}
+
+# Upper bound for /paths?max_depth=N; bidirectional search only explores half the depth per side
+MAX_PATH_DEPTH = 10
+
+# Budgeted search scans of tables above SCAN_WINDOW_ROWS rows walk the id
+# range in growing windows, the first 1/SCAN_WINDOWS of it
+SCAN_WINDOW_ROWS = 1_000_000
+SCAN_WINDOWS = 64
+
+async def _run(executor: QueryExecutor, lane: str, dataset: Dataset, fn, *args):
+    """
+    Await `fn` on an executor lane with a cursor from the dataset's pool.
+    The dataset stays pinned until the worker is done, even after a
+    timeout. Lane timeouts map to 504 and an exhausted cursor pool to 503.
+    """
+    try:
+        return await executor.run(lane, dataset.pool, fn, *args, pin=dataset)
+    except QueryTimeout as e:
+        raise HTTPException(status_code=504, detail=str(e))
+    except PoolTimeout as e:
+        raise HTTPException(status_code=503, detail=str(e))
 
 @router.get("/search", response_model=SearchResponse)
-def search_nodes(
+async def search_nodes(
     request: Request,
     table: str = "nodes",
     fuzzy: bool = False,
     limit: int = Query(25, le=100),
     offset: int = Query(0, ge=0),
-    conn: duckdb.DuckDBPyConnection = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    profile: bool = Query(False, description="Attach DuckDB plans and timings (requires QUERY_PROFILING=1)"),
+    sort: Optional[str] = Query(None, description="Order nodes by pagerank or component_size, highest first"),
+    dataset: Dataset = Depends(get_dataset),
+    search_index: SearchIndex = Depends(get_search_index),
+    analytics: Optional[GraphAnalytics] = Depends(get_analytics),
+    catalog: Catalog = Depends(get_catalog),
+    degrees: DegreeTable = Depends(get_degrees),
+    budgets: Dict[str, Budget] = Depends(get_budgets),
+    executor: QueryExecutor = Depends(get_executor)
 ):
     """
     Search nodes or edges by arbitrary columns.
-    Example: /search?display_name=Apple&fuzzy=true
+    Example: /search?display_name=Apple&fuzzy=true&node_type=officer
+    Fuzzy searches on indexed node columns (values of 3+ bytes) are answered
+    from the trigram index, relevance-ranked, and report the total hit count.
+    `node_type` (nodes) and `edge_type` (edges) always match exactly, even
+    with fuzzy=true, so partitioned inputs only read the matching files.
+    Send `Accept: application/x-ndjson` or `application/vnd.apache.arrow.stream`
+    to stream the rows instead of receiving one JSON document.
+    Bounded by the search budget: indexed searches rank at most max_rows
+    candidates and scans are interrupted after max_seconds; either returns
+    a partial page with truncated=true. Follow `next_cursor` for more rows.
+    Streamed scans obey the same budget and carry `X-Truncated` and
+    `X-Next-Cursor` headers instead.
+    Scans return rows ordered by id and their cursor resumes after the last
+    id seen (`id > ?`), so deep pages cost the same as the first; ranked
+    index results page by rank position.
+    With profile=true the response gains a `profile` object holding each
+    query's DuckDB operator tree and the Python-side time breakdown.
+    sort=pagerank|component_size orders node hits by graph analytics
+    (highest first, ties by id or relevance); the matching ids (at most
+    max_rows) are collected first and paged by position.
     """
-    try:
-        # Validate table name to prevent injection
-        if table not in ["nodes", "edges"]:
-            raise HTTPException(status_code=400, detail="Invalid table name. Must be 'nodes' or 'edges'.")
-
-        # Get schema to validate columns
-        # We could cache this, but for now DESCRIBE is fast enough for loose schema
-        schema_df = conn.execute(f"DESCRIBE {table}").df()
-        valid_columns = set(schema_df["column_name"].tolist())
+    budget = budgets["search"]
+    state = _decode_cursor(cursor, dataset)
+    if profile:
+        _check_profiling(request)
+    _check_sort(sort, analytics)
+
+    def work(conn):
+        try:
+            # Validate table name to prevent injection
+            if table not in ["nodes", "edges"]:
+                raise HTTPException(status_code=400, detail="Invalid table name. Must be 'nodes' or 'edges'.")
+            if sort is not None and table != "nodes":
+                raise HTTPException(status_code=400, detail="sort is only supported for table=nodes")
+
+            # Validate columns against the catalog captured at load time
+            valid_columns = catalog.column_names(table)
         
-        # Parse query params
-        # Exclude reserved params
-        reserved = ["table", "fuzzy", "limit", "offset"]
-        search_params = {k: v for k, v in request.query_params.items() if k not in reserved}
+            # Parse query params
+            # Exclude reserved params
+            reserved = ["table", "fuzzy", "limit", "offset", "cursor", "profile", "sort"]
+            search_params = {k: v for k, v in request.query_params.items() if k not in reserved}
         
-        if not search_params:
-            return {"count": 0, "results": []}
+            if not search_params:
+                return {"count": 0, "results": []}
             
-        # Build Query
-        conditions = []
-        params = []
+            for col in search_params:
+                if col not in valid_columns:
+                    raise HTTPException(status_code=400, detail=f"Invalid column: {col}")
+
+            # Partition key filter: exact match, pushed down as its own condition
+            partition_col = PARTITION_COLUMNS[table]
+            partition_value = search_params.pop(partition_col, None)
+
+            media_type = negotiate(request)
+
+            # One page of an already ordered id list, continued by position
+            def ranked_page(ranked, truncated):
+                if sort is not None:
+                    ranked = analytics.order(ranked, sort)
+                start = _cursor_value(state, "offset", offset)
+                page = ranked[start:start + limit]
+                if media_type:
+                    return stream_rows_by_ids(conn, table, page, media_type)
+                results = row_records(conn, table, page)
+                more = start + limit < len(ranked)
+                return {
+                    "count": len(results),
+                    "total": len(ranked),
+                    "results": results,
+                    "truncated": truncated,
+                    "next_cursor": encode_cursor(dataset.version, offset=start + limit) if more else None
+                }
+
+            if fuzzy and table == "nodes" and search_index.covers(search_params):
+                with profiling.phase("index"):
+                    ranked = search_index.search(search_params)
+                if partition_value is not None:
+                    ranked = ranked[degrees.has_type(ranked, partition_value)]
+                truncated = budget.max_rows is not None and len(ranked) > budget.max_rows
+                if truncated:
+                    ranked = ranked[:budget.max_rows]
+                return ranked_page(ranked, truncated)
+
+            # Build Query
+            conditions = []
+            params = []
+
+            if partition_value is not None:
+                conditions.append(f"{partition_col} = ?")
+                params.append(partition_value)
         
-        for col, val in search_params.items():
-            if col not in valid_columns:
-                raise HTTPException(status_code=400, detail=f"Invalid column: {col}")
-            
-            if fuzzy:
-                # ILIKE for fuzzy search
-                conditions.append(f"{col} ILIKE ?")
-                params.append(f"%{val}%")
+            for col, val in search_params.items():
+                if fuzzy:
+                    # ILIKE for fuzzy search
+                    conditions.append(f"{col} ILIKE ?")
+                    params.append(f"%{val}%")
+                else:
+                    # Exact match
+                    # Check data type? DuckDB handles string to int casting usually, 
+                    # but we should be careful. 
+                    # For now rely on DuckDB's parameterized query casting.
+                    conditions.append(f"{col} = ?")
+                    params.append(val)
+
+            relation = table if fuzzy else catalog.lookup_relation(table, search_params)
+
+            if sort is not None:
+                # Every match is needed to order by analytics; the budget caps how many
+                query = f"SELECT id FROM {relation} WHERE {' AND '.join(conditions)} ORDER BY id"
+                if budget.max_rows is not None:
+                    query += " LIMIT ?"
+                    params.append(budget.max_rows + 1)
+                with interrupt_after(conn, budget.max_seconds) as interrupted:
+                    try:
+                        result = profiling.execute(conn, query, params)
+                        with profiling.conversion():
+                            ids = np.ma.getdata(result.fetchnumpy()["id"]).astype(np.int64)
+                    except duckdb.InterruptException:
+                        if not interrupted.is_set():
+                            raise
+                        # Ranking needs every match: nothing to return, retry the same page
+                        retry = encode_cursor(dataset.version, offset=_cursor_value(state, "offset", offset))
+                        return {"count": 0, "results": [], "truncated": True, "next_cursor": retry}
+                metrics.observe(metrics.QUERY_ROWS, len(ids))
+                truncated = budget.max_rows is not None and len(ids) > budget.max_rows
+                return ranked_page(ids[:budget.max_rows] if truncated else ids, truncated)
+
+            # Keyset continuation: resume after the last id of the previous page.
+            # A page cut short by the budget without an id to resume from
+            # carries its offset instead.
+            if state is not None and "offset" in state:
+                after, skip = None, _cursor_value(state, "offset", 0)
             else:
-                # Exact match
-                # Check data type? DuckDB handles string to int casting usually, 
-                # but we should be careful. 
-                # For now rely on DuckDB's parameterized query casting.
-                conditions.append(f"{col} = ?")
-                params.append(val)
-                
-        where_clause = " AND ".join(conditions)
-        
-        query = f"SELECT * FROM {table} WHERE {where_clause} LIMIT ? OFFSET ?"
-        params.append(limit)
-        params.append(offset)
-        
-        df = conn.execute(query, params).df()
-        
-        results = []
-        if not df.empty:
-            # Convert NaN to None
-            results = df.replace({float('nan'): None}).to_dict(orient="records")
-            
-        return {
-            "count": len(results),
-            "results": results
-        }
+                after, skip = _cursor_value(state, "after", None, minimum=None), offset if state is None else 0
 
-    except HTTPException as he:
-        raise he
-    except Exception as e:
-        print(f"Search Error: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+            chunks, resume_after, truncated = _scan_page(
+                conn, relation, conditions, params, after, skip, limit,
+                catalog.id_range(table) if catalog.table(table).row_count > SCAN_WINDOW_ROWS else None,
+                budget.max_seconds,
+                fetch=arrow_table if media_type else lambda result: result.df(),
+            )
+            if resume_after is not None:
+                next_cursor = encode_cursor(dataset.version, after=resume_after)
+            elif truncated:
+                next_cursor = encode_cursor(dataset.version, offset=skip)
+            else:
+                next_cursor = None
+
+            if media_type:
+                if not chunks:
+                    chunks = [arrow_table(conn.execute(f"SELECT * FROM {relation} LIMIT 0"))]
+                response = stream_batches(pa.concat_tables(chunks).to_reader(), media_type)
+                if truncated:
+                    response.headers["X-Truncated"] = "true"
+                if next_cursor is not None:
+                    response.headers["X-Next-Cursor"] = next_cursor
+                return response
+
+            results = []
+            with profiling.conversion():
+                for df in chunks:
+                    if not df.empty:
+                        # Convert NaN to None
+                        results.extend(df.replace({float('nan'): None}).to_dict(orient="records"))
+            metrics.observe(metrics.QUERY_ROWS, len(results))
+
+            return {
+                "count": len(results),
+                "results": results,
+                "truncated": truncated,
+                "next_cursor": next_cursor
+            }
+
+        except HTTPException as he:
+            raise he
+        except Exception as e:
+            print(f"Search Error: {e}")
+            raise HTTPException(status_code=500, detail=str(e))
+
+    return await _run(executor, HEAVY, dataset, _fast_json(_profiled(work, SearchResponse) if profile else work, SearchResponse))
 
 
 @router.get("/schema", response_model=SchemaResponse)
-def get_schema(
-    conn: duckdb.DuckDBPyConnection = Depends(get_db)
+async def get_schema(
+    request: Request,
+    response: Response,
+    catalog: Catalog = Depends(get_catalog)
 ):
     """
     Get schema definition for nodes and edges tables.
+    Served from the catalog captured at load time; the ETag changes only when
+    the data is reloaded with a different schema or statistics.
     """
-    try:
-        nodes_df = conn.execute("DESCRIBE nodes").df()
-        edges_df = conn.execute("DESCRIBE edges").df()
-        
-        nodes_schema = []
-        for _, row in nodes_df.iterrows():
-            nodes_schema.append(ColumnInfo(
-                name=row['column_name'],
-                type=row['column_type'],
-                nullable=True if row['null'] == 'YES' else False
-            ))
-            
-        edges_schema = []
-        for _, row in edges_df.iterrows():
-            edges_schema.append(ColumnInfo(
-                name=row['column_name'],
-                type=row['column_type'],
-                nullable=True if row['null'] == 'YES' else False
-            ))
-            
-        return SchemaResponse(nodes=nodes_schema, edges=edges_schema)
+    if request.headers.get("if-none-match") == catalog.etag:
+        return Response(status_code=304, headers={"ETag": catalog.etag})
 
-    except Exception as e:
-        print(f"Schema Error: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    response.headers["ETag"] = catalog.etag
+    return catalog.schema_response
+
+
+@router.post("/nodes:batchGet", response_model=BatchGetResponse)
+async def batch_get_nodes(
+    body: BatchGetRequest,
+    dataset: Dataset = Depends(get_dataset),
+    analytics: Optional[GraphAnalytics] = Depends(get_analytics),
+    executor: QueryExecutor = Depends(get_executor)
+):
+    """
+    Fetch many nodes in one semi-join instead of one query per ID.
+    The response is keyed by ID; unknown IDs map to null.
+    """
+    def work(conn):
+        try:
+            ids = list(dict.fromkeys(body.ids))
+            found = {node["id"]: node for node in node_records(conn, np.asarray(ids, dtype=np.int64), analytics=analytics)}
+            return {
+                "count": len(found),
+                "data": {node_id: found.get(node_id) for node_id in ids}
+            }
+
+        except Exception as e:
+            print(f"Database Error: {e}")
+            raise HTTPException(status_code=500, detail="Internal Server Error")
+
+    return await _run(executor, HEAVY, dataset, _fast_json(work, BatchGetResponse))
 
 
 @router.get("/nodes/{id}", response_model=NodeResponse)
-def get_node(
+async def get_node(
     id: str,
-    conn: duckdb.DuckDBPyConnection = Depends(get_db)
+    dataset: Dataset = Depends(get_dataset),
+    cache: ResultCache = Depends(get_cache),
+    analytics: Optional[GraphAnalytics] = Depends(get_analytics),
+    executor: QueryExecutor = Depends(get_executor)
 ):
     """
     Fetch a node by ID directly from the nodes table.
+    Results are served from the hot-node cache when possible; cache hits are
+    answered on the event loop without taking a cursor.
     """
-    try:
-        # Validate ID is a number to match DB schema (BIGINT)
-        if not id.isdigit():
-            return {"count": 0, "data": None}
+    # Validate ID is a number to match DB schema (BIGINT)
+    if not id.isdigit():
+        return {"count": 0, "data": None}
 
-        # Convert input id to int for safe comparisons/usage if needed, 
-        # though DuckDB query param handles string digits fine usually. 
-        # But consistency is good.
-        node_id_int = int(id)
+    # Convert input id to int for safe comparisons/usage if needed, 
+    # though DuckDB query param handles string digits fine usually. 
+    # But consistency is good.
+    node_id_int = int(id)
 
-        query = "SELECT * FROM nodes WHERE id = ?"
-        df = conn.execute(query, [node_id_int]).df()
+    cache_key = ("node", node_id_int)
+    cached = cache.get(cache_key)
+    if cached is not MISS:
+        return cached
+
+    def work(conn):
+        try:
+            query = "SELECT * FROM nodes WHERE id = ?"
+            result = profiling.execute(conn, query, [node_id_int])
+            with profiling.conversion():
+                df = result.df()
+            metrics.observe(metrics.QUERY_ROWS, len(df))
         
-        if df.empty:
-            return {"count": 0, "data": None}
+            if df.empty:
+                result = {"count": 0, "data": None}
+                cache.put(cache_key, result)
+                return result
         
-        # Convert first row to dict and handle None/NaN
-        record = df.iloc[0].replace({float('nan'): None}).to_dict()
+            # Convert first row to dict and handle None/NaN
+            record = df.iloc[0].replace({float('nan'): None}).to_dict()
+            if analytics is not None:
+                record.update({name: values[0] for name, values in analytics.fields([node_id_int]).items()})
         
-        # Ensure ID is treated consistently
-        # The parquet schema has ID as BIGINT.
+            # Ensure ID is treated consistently
+            # The parquet schema has ID as BIGINT.
         
-        return {"count": 1, "data": record}
+            result = {"count": 1, "data": record}
+            cache.put(cache_key, result)
+            return result
 
-    except Exception as e:
-        print(f"Database Error: {e}")
-        raise HTTPException(status_code=500, detail="Internal Server Error")
+        except Exception as e:
+            print(f"Database Error: {e}")
+            raise HTTPException(status_code=500, detail="Internal Server Error")
+
+    return await _run(executor, POINT, dataset, work)
 
 @router.get("/nodes/{id}/neighbors", response_model=NeighborsResponse)
-def get_node_neighbors(
+async def get_node_neighbors(
+    request: Request,
     id: str,
-    depth: int = 1,
+    depth: int = Query(1, ge=1, le=MAX_DEPTH),
     direction: str = "both",
-    conn: duckdb.DuckDBPyConnection = Depends(get_db)
+    max_fanout: Optional[int] = Query(None, ge=1, description="Max newly discovered nodes per hop"),
+    node_type: Optional[str] = Query(None, description="Only return neighbors of this node type"),
+    edge_type: Optional[List[str]] = Query(None, description="Only traverse edges of these types (repeatable)"),
+    limit: Optional[int] = Query(None, ge=1, description="Page size, capped by the neighbors budget"),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    profile: bool = Query(False, description="Attach DuckDB plans and timings (requires QUERY_PROFILING=1)"),
+    sort: Optional[str] = Query(None, description="Order neighbors by pagerank or component_size, highest first"),
+    dataset: Dataset = Depends(get_dataset),
+    graph: AdjacencyIndex = Depends(get_graph),
+    analytics: Optional[GraphAnalytics] = Depends(get_analytics),
+    degrees: DegreeTable = Depends(get_degrees),
+    cache: ResultCache = Depends(get_cache),
+    budgets: Dict[str, Budget] = Depends(get_budgets),
+    executor: QueryExecutor = Depends(get_executor)
 ):
     """
-    Fetch neighbors specifically from edges table.
-    We need to join edges with nodes table to get neighbor details.
+    Fetch the k-hop neighborhood of a node.
+    Traversal runs on the in-memory CSR adjacency; only the node details of
+    the discovered neighbors are read from the nodes table (one query).
+    `node_type` filters the returned neighbors (traversal still passes
+    through other types); `edge_type` restricts which edges are followed.
+    Supports the same streaming Accept types as /search.
+    Cache hits, unknown nodes and nodes without edges in `direction` are
+    answered on the event loop without taking a cursor (empty streams
+    still read the nodes schema on the point lane).
+    Bounded by the neighbors budget: the traversal scans at most
+    max_frontier adjacency slots and starts no hop after max_seconds, and a
+    page holds at most max_rows nodes (or `limit`, if smaller). Cut results
+    set truncated=true; `next_cursor` pages through the rest.
+    Direct neighborhoods (depth=1 without max_fanout) page through the
+    node's edges in edge id order, `limit` edges at a time, resuming from
+    the cursor by binary search, so a hub is paged without reading all of
+    its edges. Deeper traversals page through their discovery order.
+    Streams are never paged; a cut traversal sets `X-Truncated: true`.
+    profile=true works as on /search and bypasses the result cache.
+    sort=pagerank|component_size returns the neighborhood highest first
+    (ties in discovery order); it pages like a deeper traversal and is
+    not supported for streams.
     """
+    budget = budgets["neighbors"]
+    if profile:
+        _check_profiling(request)
+    _check_sort(sort, analytics)
+    if sort is not None and negotiate(request):
+        raise HTTPException(status_code=400, detail="sort is not supported for streamed responses")
+    page_size = min(filter(None, [limit, budget.max_rows]), default=None)
+    position = _cursor_value(_decode_cursor(cursor, dataset), *_page_key(depth, max_fanout, sort))
+
+    async def empty():
+        # Nothing to traverse: JSON is answered here, only an (empty) stream needs a cursor
+        if negotiate(request) is None:
+            return {"nodes": [], "edges": []}
+        return await _run(executor, POINT, dataset, _empty_neighbors, graph, negotiate(request))
     
     # Validate ID is a number
     if not id.isdigit():
-        return {"nodes": [], "edges": []}
+        return await empty()
 
     node_id_int = int(id)
 
-    # We are looking for edges where source_id = id OR target_id = id
-    # And we need to filter by direction.
-    
-    try:
-        # Base query for edges
-        # We need two parts: Outgoing and Incoming
-        
-        queries = []
-        
-        # Outgoing: (Me) -> (Neighbor)
-        # source_id = Me, target_id = Neighbor
-        if direction in ["out", "both"]:
-            queries.append("""
-                SELECT 
-                    'out' as dir,
-                    e.id as edge_id, e.edge_type, 
-                    n.id as neighbor_id, n.node_type as neighbor_type, n.display_name as neighbor_name,
-                    n.* EXCLUDE (id, node_type, display_name)
-                FROM edges e
-                JOIN nodes n ON e.target_id = n.id
-                WHERE e.source_id = ?
-            """)
-            
-        # Incoming: (Neighbor) -> (Me)
-        # source_id = Neighbor, target_id = Me
-        if direction in ["in", "both"]:
-            queries.append("""
-                SELECT 
-                    'in' as dir,
-                    e.id as edge_id, e.edge_type,
-                    n.id as neighbor_id, n.node_type as neighbor_type, n.display_name as neighbor_name,
-                    n.* EXCLUDE (id, node_type, display_name)
-                FROM edges e
-                JOIN nodes n ON e.source_id = n.id
-                WHERE e.target_id = ?
-            """)
-            
-        if not queries:
-             return {"nodes": [], "edges": []}
+    if direction not in ["out", "in", "both"]:
+        return await empty()
 
-        full_query = " UNION ALL ".join(queries)
-        
-        # Params: we need to pass 'id' for each query part
-        params = [node_id_int] * len(queries)
-        
-        df = conn.execute(full_query, params).df()
-        
-        nodes_list = []
-        edges_list = []
-        
-        # Track unique nodes to simple list
-        seen_nodes = set()
-        
-        for _, row in df.iterrows():
-            # Process Neighbor Node
-            # neighbor_id comes as int (BIGINT) from DuckDB DF if schema is correct
-            nid = row["neighbor_id"]
-            
-            # Key for set should be consistent (int)
-            if nid not in seen_nodes:
-                # Let's simplify row processing
-                row_dict = row.replace({float('nan'): None}).to_dict()
-                
-                # Construct node object
-                node_obj = {
-                    "id": nid, # Keep as int
-                    "node_type": row_dict["neighbor_type"],
-                    "display_name": row_dict["neighbor_name"],
-                    "properties": {k: v for k, v in row_dict.items() if k not in ["dir", "edge_id", "edge_type", "neighbor_id", "neighbor_type", "neighbor_name"]}
+    start = graph.position_of(node_id_int)
+    if start is None or degrees.degree(direction)[start] == 0:
+        return await empty()
+
+    media_type = negotiate(request)
+
+    cache_key = ("neighbors", node_id_int, depth, direction, max_fanout, node_type, tuple(edge_type or ()), sort, position, page_size)
+    if not media_type and not profile:
+        cached = cache.get(cache_key)
+        if cached is not MISS:
+            return fastjson.response(cached, NeighborsResponse)
+
+    def work(conn):
+        try:
+            if media_type:
+                node_pos, edge_rows, cut = graph.expand_within(
+                    start, depth, direction, max_fanout, edge_type, budget.max_frontier, budget.deadline()
+                )
+                if node_type is not None:
+                    node_pos, edge_rows = _filter_node_type(graph, degrees, start, node_pos, edge_rows, node_type)
+                response = stream_neighbors(conn, graph, node_pos, edge_rows, media_type)
+                if cut:
+                    response.headers["X-Truncated"] = "true"
+                return response
+
+            with profiling.phase("traversal"):
+                node_pos, edge_rows, cut, next_state = _neighborhood_page(
+                    graph, degrees, start, depth, direction, max_fanout, edge_type, node_type, budget, page_size, position,
+                    order=analytics.values(sort) if sort is not None else None
+                )
+            next_cursor = encode_cursor(dataset.version, **next_state) if next_state else None
+            if node_pos.size == 0 and edge_rows.size == 0:
+                result = {"nodes": [], "edges": [], "truncated": cut or next_state is not None, "next_cursor": next_cursor}
+            else:
+                # Node details in one columnar round-trip, edges straight from the index arrays
+                nodes_list = node_records(conn, graph.node_ids[node_pos], node_type, analytics)
+                edges_list = edge_records(graph, edge_rows)
+
+                result = {
+                    "nodes": nodes_list,
+                    "edges": edges_list,
+                    "truncated": cut or next_state is not None,
+                    "next_cursor": next_cursor
                 }
-                nodes_list.append(node_obj)
-                seen_nodes.add(nid)
-            
-            row_dict = row.replace({float('nan'): None}).to_dict()
-            
-            # Edge
-            # edge_id comes as int
-            edge_id = row_dict["edge_id"]
-            
-            # Determine source/target using numeric IDs
-            # If dir is out, source is Me (node_id_int), target is Neighbor (nid)
-            src_val = node_id_int if row_dict["dir"] == 'out' else nid
-            tgt_val = nid if row_dict["dir"] == 'out' else node_id_int
-            
-            edge_obj = {
-                "id": edge_id,
-                "type": row_dict["edge_type"],
-                "source": src_val,
-                "target": tgt_val
+            # A traversal cut short depends on timing; only complete ones are reusable
+            if not cut:
+                cache.put(cache_key, result)
+            return result
+
+        except Exception as e:
+            print(f"Graph Error: {e}")
+            raise HTTPException(status_code=500, detail=str(e))
+
+    return await _run(executor, HEAVY, dataset, _fast_json(_profiled(work, NeighborsResponse) if profile else work, NeighborsResponse))
+
+@router.post("/nodes/neighbors:batch", response_model=BatchNeighborsResponse)
+async def batch_node_neighbors(
+    body: BatchNeighborsRequest,
+    dataset: Dataset = Depends(get_dataset),
+    graph: AdjacencyIndex = Depends(get_graph),
+    analytics: Optional[GraphAnalytics] = Depends(get_analytics),
+    budgets: Dict[str, Budget] = Depends(get_budgets),
+    executor: QueryExecutor = Depends(get_executor)
+):
+    """
+    Expand the neighborhoods of many nodes at once.
+    Each traversal runs on the CSR adjacency; node details for the union of
+    all neighborhoods are read in a single query. Keyed by requested ID.
+    Each traversal gets the neighbors budget (max_frontier, max_rows) and
+    the batch as a whole gets its max_seconds; neighborhoods that were cut
+    or not reached in time have truncated=true. Page a truncated one with
+    /nodes/{id}/neighbors.
+    """
+    budget = budgets["neighbors"]
+
+    def work(conn):
+        if body.direction not in ["out", "in", "both"]:
+            raise HTTPException(status_code=400, detail="Invalid direction. Must be 'out', 'in' or 'both'.")
+
+        try:
+            deadline = budget.deadline()
+            empty = np.empty(0, dtype=np.int64)
+            expansions = {}
+            for node_id in dict.fromkeys(body.ids):
+                start = graph.position_of(node_id)
+                if start is None:
+                    expansions[node_id] = None
+                    continue
+                if deadline is not None and time.perf_counter() > deadline:
+                    expansions[node_id] = (empty, empty, True)
+                    continue
+                node_pos, edge_rows, cut, next_state = _neighborhood_page(
+                    graph, None, start, body.depth, body.direction, body.max_fanout, None, None,
+                    budget, budget.max_rows, None, deadline
+                )
+                expansions[node_id] = (node_pos, edge_rows, cut or next_state is not None)
+
+            reached = [found[0] for found in expansions.values() if found is not None]
+            positions = np.sort(np.concatenate(reached)) if reached else np.empty(0, dtype=np.int64)
+            positions = positions[np.append(True, positions[1:] != positions[:-1])] if positions.size else positions
+            records = {node["id"]: node for node in node_records(conn, graph.node_ids[positions], analytics=analytics)}
+
+            results = {}
+            for node_id, found in expansions.items():
+                if found is None:
+                    results[node_id] = {"nodes": [], "edges": [], "truncated": False, "next_cursor": None}
+                    continue
+                node_pos, edge_rows, truncated = found
+                results[node_id] = {
+                    "nodes": [records[nid] for nid in graph.node_ids[node_pos].tolist() if nid in records],
+                    "edges": edge_records(graph, edge_rows),
+                    "truncated": truncated,
+                    "next_cursor": None
+                }
+            return {"results": results}
+
+        except Exception as e:
+            print(f"Graph Error: {e}")
+            raise HTTPException(status_code=500, detail=str(e))
+
+    return await _run(executor, HEAVY, dataset, _fast_json(work, BatchNeighborsResponse))
+
+@router.post("/subgraph", response_model=SubgraphResponse)
+async def get_subgraph(
+    request: Request,
+    body: SubgraphRequest,
+    dataset: Dataset = Depends(get_dataset),
+    graph: AdjacencyIndex = Depends(get_graph),
+    degrees: DegreeTable = Depends(get_degrees),
+    analytics: Optional[GraphAnalytics] = Depends(get_analytics),
+    budgets: Dict[str, Budget] = Depends(get_budgets),
+    executor: QueryExecutor = Depends(get_executor)
+):
+    """
+    Export the subgraph around a set of seed nodes: the seeds plus
+    everything within `depth` hops, and every edge among those nodes
+    (including edges between seeds and between nodes of the same hop).
+    Traversal and edge resolution run on the CSR adjacency; node details
+    are read in one semi-join. Unknown seeds are skipped.
+    Bounded by the subgraph budget: max_rows (or `max_nodes`, if smaller)
+    nodes, nearest first, max_frontier adjacency slots per phase and
+    max_seconds per traversal; a cut subgraph has truncated=true.
+    Besides the NDJSON / Arrow streams of /nodes/{id}/neighbors, `Accept:
+    application/graphml+xml` streams a GraphML document.
+    """
+    budget = budgets["subgraph"]
+    media_type = negotiate(request, STREAM_MEDIA_TYPES + [GRAPHML])
+
+    def work(conn):
+        if body.direction not in ["out", "in", "both"]:
+            raise HTTPException(status_code=400, detail="Invalid direction. Must be 'out', 'in' or 'both'.")
+
+        try:
+            seeds = [graph.position_of(node_id) for node_id in dict.fromkeys(body.ids)]
+            seeds = np.array([pos for pos in seeds if pos is not None], dtype=np.int64)
+            node_pos, cut = seeds, False
+            if body.depth and seeds.size:
+                with profiling.phase("traversal"):
+                    found, _, cut = graph.expand_within(
+                        seeds, body.depth, body.direction, None, body.edge_types, budget.max_frontier, budget.deadline()
+                    )
+                node_pos = np.concatenate([seeds, found])
+            if body.node_types is not None:
+                codes = [degrees.type_code(node_type) for node_type in body.node_types]
+                node_pos = node_pos[np.isin(degrees.type_codes[node_pos], codes)]
+            max_nodes = min(filter(None, [body.max_nodes, budget.max_rows]), default=None)
+            if max_nodes is not None and node_pos.size > max_nodes:
+                node_pos, cut = node_pos[:max_nodes], True
+            edge_rows, edges_cut = graph.induced_edges(node_pos, body.edge_types, budget.max_frontier)
+            cut = cut or edges_cut
+
+            if media_type:
+                if media_type == GRAPHML:
+                    response = stream_graphml(conn, graph, node_pos, edge_rows)
+                else:
+                    response = stream_neighbors(conn, graph, node_pos, edge_rows, media_type)
+                if cut:
+                    response.headers["X-Truncated"] = "true"
+                return response
+
+            return {
+                "nodes": node_records(conn, graph.node_ids[node_pos], analytics=analytics),
+                "edges": edge_records(graph, edge_rows),
+                "truncated": cut
             }
-            edges_list.append(edge_obj)
-            
-        return {
-            "nodes": nodes_list,
-            "edges": edges_list
-        }
 
-    except Exception as e:
-        print(f"Graph Error: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+        except Exception as e:
+            print(f"Graph Error: {e}")
+            raise HTTPException(status_code=500, detail=str(e))
+
+    return await _run(executor, HEAVY, dataset, _fast_json(work, SubgraphResponse))
+
+def _filter_node_type(
+    graph: AdjacencyIndex,
+    degrees: DegreeTable,
+    start: int,
+    node_pos: np.ndarray,
+    edge_rows: np.ndarray,
+    node_type: str,
+):
+    """
+    Keep neighbors of `node_type` and the edges among them and the start node.
+    """
+    node_pos = node_pos[degrees.type_codes[node_pos] == degrees.type_code(node_type)]
+    kept = np.append(node_pos, start)
+    edge_rows = edge_rows[np.isin(graph.edge_src[edge_rows], kept) & np.isin(graph.edge_tgt[edge_rows], kept)]
+    return node_pos, edge_rows
+
+def _check_sort(sort: Optional[str], analytics: Optional[GraphAnalytics]):
+    if sort is None:
+        return
+    if sort not in SORT_KEYS:
+        raise HTTPException(status_code=400, detail=f"Invalid sort key. Must be one of {SORT_KEYS}.")
+    if analytics is None:
+        raise HTTPException(status_code=400, detail="Graph analytics are disabled. Set GRAPH_ANALYTICS=1.")
+
+def _check_profiling(request: Request):
+    if not profiling.enabled():
+        raise HTTPException(status_code=403, detail="Query profiling is disabled. Set QUERY_PROFILING=1.")
+    if negotiate(request):
+        raise HTTPException(status_code=400, detail="profile=true is not supported for streamed responses")
+
+def _profiled(work, response_model: Type[BaseModel]):
+    """
+    Wrap `work(conn)` to run with DuckDB profiling on its cursor and answer
+    with the validated response plus a `profile` extension.
+    """
+    def run(conn):
+        with profiling.profiled(conn) as profile:
+            result = work(conn)
+        body = response_model.model_validate(result).model_dump(mode="json")
+        body["profile"] = profile.to_dict()
+        return JSONResponse(body)
+    return run
+
+def _fast_json(work, response_model: Type[BaseModel]):
+    """
+    Wrap `work(conn)` so its result is encoded to JSON on the executor lane
+    instead of being validated row by row (see fastjson.response).
+    """
+    def run(conn):
+        return fastjson.response(work(conn), response_model)
+    return run
+
+def _page_key(depth: int, max_fanout: Optional[int], sort: Optional[str] = None):
+    """
+    Cursor key and lower bound for a neighborhood query: the last edge id
+    for unsorted direct neighborhoods, the number of nodes already returned
+    otherwise.
+    """
+    if depth == 1 and max_fanout is None and sort is None:
+        return "after", None, None
+    return "skip", 0, 0
+
+def _neighborhood_page(
+    graph: AdjacencyIndex,
+    degrees: Optional[DegreeTable],
+    start: int,
+    depth: int,
+    direction: str,
+    max_fanout: Optional[int],
+    edge_types: Optional[List[str]],
+    node_type: Optional[str],
+    budget: Budget,
+    page_size: Optional[int],
+    position: Optional[int],
+    deadline: Optional[float] = None,
+    order: Optional[np.ndarray] = None,
+):
+    """
+    One page of the neighborhood of `start` under `budget`, continuing from
+    `position` (see _page_key). Direct neighborhoods are keyset-paged over
+    the CSR slices; deeper traversals run to completion and are sliced.
+    With `order` (a value per node position) the whole neighborhood is
+    sorted by it, highest first, before slicing.
+    Returns (node positions, edge rows, whether the budget cut the scan,
+    cursor state of the next page or None).
+    """
+    if depth == 1 and max_fanout is None and order is None:
+        accept = None
+        if node_type is not None:
+            code = degrees.type_code(node_type)
+            accept = lambda nbrs: degrees.type_codes[nbrs] == code
+        nbrs, edge_rows, resume, cut = graph.incident_page(
+            start, direction, position, page_size or max(graph.num_edges, 1), edge_types, accept, budget.max_frontier
+        )
+        # Far ends in edge order, each once; a self-loop's end is the start node itself
+        _, first = np.unique(nbrs, return_index=True)
+        node_pos = nbrs[np.sort(first)]
+        node_pos = node_pos[node_pos != start]
+        return node_pos, edge_rows, cut, ({"after": resume} if resume is not None else None)
+
+    skip = position or 0
+    node_pos, edge_rows, cut = graph.expand_within(
+        start, depth, direction, max_fanout, edge_types, budget.max_frontier,
+        budget.deadline() if deadline is None else deadline
+    )
+    if node_type is not None:
+        node_pos, edge_rows = _filter_node_type(graph, degrees, start, node_pos, edge_rows, node_type)
+    if order is not None:
+        node_pos = node_pos[np.argsort(-order[node_pos], kind="stable")]
+    node_pos, edge_rows, more = _neighbors_page(graph, start, node_pos, edge_rows, skip, page_size)
+    return node_pos, edge_rows, cut, ({"skip": skip + len(node_pos)} if more else None)
+
+def _neighbors_page(
+    graph: AdjacencyIndex,
+    start: int,
+    node_pos: np.ndarray,
+    edge_rows: np.ndarray,
+    skip: int,
+    max_rows: Optional[int],
+):
+    """
+    One page of a neighborhood in discovery order: node_pos[skip:skip + max_rows]
+    plus the edges whose later-discovered endpoint is on that page (the start
+    node counts as discovered first), so each edge shows up on exactly one page.
+    Returns (page node positions, page edge rows, whether more pages follow).
+    """
+    end = len(node_pos) if max_rows is None else min(skip + max_rows, len(node_pos))
+    if skip == 0 and end == len(node_pos):
+        return node_pos, edge_rows, False
+    if skip >= len(node_pos):
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty, False
+
+    order = np.argsort(node_pos)
+    sorted_pos = node_pos[order]
+
+    def rank(pos):
+        found = np.minimum(np.searchsorted(sorted_pos, pos), len(sorted_pos) - 1)
+        return np.where(pos == start, -1, order[found])
+
+    last = np.maximum(rank(graph.edge_src[edge_rows]), rank(graph.edge_tgt[edge_rows]))
+    keep = (last >= skip) & (last < end)
+    return node_pos[skip:end], edge_rows[keep], end < len(node_pos)
+
+def _scan_page(
+    conn: duckdb.DuckDBPyConnection,
+    relation: str,
+    conditions: List[str],
+    params: list,
+    after: Optional[int],
+    skip: int,
+    limit: int,
+    id_range: Optional[Tuple[int, int]],
+    max_seconds: Optional[float],
+    fetch,
+):
+    """
+    Up to `limit` rows of `relation` matching `conditions`, in id order,
+    after id `after` (or past the first `skip` matches).
+
+    Given an id range the scan runs as one keyset query per id window
+    (`id > ? AND id <= ?`), the first spanning 1/SCAN_WINDOWS of the range
+    and each next one twice the last. When max_seconds runs out the windows
+    already finished are kept, so the page is partial rather than empty and
+    resumes after the last id it covered. Returns (chunks fetched with
+    `fetch`, id to resume after or None, truncated).
+    """
+    chunks = []
+    have = 0
+    if id_range is None or skip:
+        # One query over everything; an interrupted page restarts where it began
+        windows = [(after, None)]
+    else:
+        low, high = id_range
+        start = low - 1 if after is None else after
+        windows = []
+        span = max(1, (high - low + 1) // SCAN_WINDOWS)
+        while start < high:
+            windows.append((start, start + span if start + span < high else None))
+            start += span
+            span *= 2
+        if not windows:
+            windows = [(start, None)]
+
+    covered = None
+    with interrupt_after(conn, max_seconds) as interrupted:
+        for lo, hi in windows:
+            where = list(conditions)
+            args = list(params)
+            if lo is not None:
+                where.append("id > ?")
+                args.append(lo)
+            if hi is not None:
+                where.append("id <= ?")
+                args.append(hi)
+            query = f"SELECT * FROM {relation} WHERE {' AND '.join(where)} ORDER BY id LIMIT ? OFFSET ?"
+            args.extend([limit - have, skip])
+            try:
+                if interrupted.is_set():
+                    raise duckdb.InterruptException("Search budget exhausted")
+                chunk = fetch(profiling.execute(conn, query, args))
+            except duckdb.InterruptException:
+                if not interrupted.is_set():
+                    raise
+                return chunks, covered if covered is not None else windows[0][0], True
+            chunks.append(chunk)
+            have += len(chunk)
+            if have == limit:
+                return chunks, _last_id(chunk), False
+            covered = hi
+    return chunks, None, False
+
+def _last_id(chunk) -> int:
+    column = chunk["id"]
+    return int(column.iloc[-1]) if hasattr(column, "iloc") else column[-1].as_py()
+
+def _decode_cursor(cursor: Optional[str], dataset: Dataset) -> Optional[dict]:
+    """
+    State of a continuation cursor, or None without one.
+    Malformed and stale cursors are rejected with 400.
+    """
+    if cursor is None:
+        return None
+    try:
+        return decode_cursor(cursor, dataset.version)
+    except CursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+def _cursor_value(state: Optional[dict], key: str, default, minimum: Optional[int] = 0):
+    """
+    Integer stored under `key` in decoded cursor `state`, or `default` without
+    a cursor. A cursor issued for another kind of query is rejected with 400.
+    """
+    if state is None:
+        return default
+    value = state.get(key)
+    if not isinstance(value, int) or isinstance(value, bool) or (minimum is not None and value < minimum):
+        raise HTTPException(status_code=400, detail="Cursor does not match this query")
+    return value
+
+def _empty_neighbors(conn: duckdb.DuckDBPyConnection, graph: AdjacencyIndex, media_type: str):
+    empty = np.empty(0, dtype=np.int64)
+    return stream_neighbors(conn, graph, empty, empty, media_type)
 
 @router.get("/nodes/{id}/neighbors/count", response_model=NeighborsCountResponse)
-def get_node_neighbors_count(
+async def get_node_neighbors_count(
     id: str,
     direction: str = "both",
-    conn: duckdb.DuckDBPyConnection = Depends(get_db)
+    graph: AdjacencyIndex = Depends(get_graph),
+    degrees: DegreeTable = Depends(get_degrees)
 ):
+    """
+    Count the edges of a node, broken down by the neighbor's node_type.
+    Answered from the degree table precomputed at load time.
+    """
     try:
         # Validate ID
         if not id.isdigit():
@@ -284,45 +887,14 @@ def get_node_neighbors_count(
              
         node_id_int = int(id)
 
-        # Aggregation of neighbors by type
-        # Similarly, OUT and IN
-        
-        queries = []
-        
-        # Outgoing: neighbor is target
-        if direction in ["out", "both"]:
-            queries.append("""
-                SELECT n.node_type, COUNT(*) as cnt
-                FROM edges e
-                JOIN nodes n ON e.target_id = n.id
-                WHERE e.source_id = ?
-                GROUP BY n.node_type
-            """)
-            
-        # Incoming: neighbor is source
-        if direction in ["in", "both"]:
-            queries.append("""
-                SELECT n.node_type, COUNT(*) as cnt
-                FROM edges e
-                JOIN nodes n ON e.source_id = n.id
-                WHERE e.target_id = ?
-                GROUP BY n.node_type
-            """)
-            
-        full_query = " UNION ALL ".join(queries)
-        params = [node_id_int] * len(queries)
-        
-        df = conn.execute(full_query, params).df()
-        
-        breakdown = {}
-        total = 0
-        
-        if not df.empty:
-            # Group by node_type again because UNION might split them
-            grouped = df.groupby("node_type")["cnt"].sum()
-            total = int(grouped.sum())
-            breakdown = grouped.to_dict()
-            
+        if direction not in ["out", "in", "both"]:
+            return {"count": 0, "details": {}}
+
+        pos = graph.position_of(node_id_int)
+        if pos is None:
+            return {"count": 0, "details": {}}
+
+        total, breakdown = degrees.counts(pos, direction)
         return {
             "count": total,
             "details": breakdown
@@ -332,3 +904,192 @@ def get_node_neighbors_count(
         print(f"Graph Count Error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.get("/degrees/top", response_model=TopDegreeResponse)
+async def get_top_degree_nodes(
+    limit: int = Query(25, ge=1, le=100),
+    direction: str = "both",
+    node_type: Optional[str] = None,
+    dataset: Dataset = Depends(get_dataset),
+    degrees: DegreeTable = Depends(get_degrees),
+    analytics: Optional[GraphAnalytics] = Depends(get_analytics),
+    executor: QueryExecutor = Depends(get_executor)
+):
+    """
+    Highest-degree nodes (hubs), optionally restricted to one node_type.
+    Ranking comes from the precomputed degree table; only the returned
+    nodes are read from the nodes table.
+    """
+    def work(conn):
+        if direction not in ["out", "in", "both"]:
+            raise HTTPException(status_code=400, detail="Invalid direction. Must be 'out', 'in' or 'both'.")
+
+        try:
+            top = degrees.top(limit, direction, node_type)
+            nodes_list = node_records(conn, degrees.node_ids[top], analytics=analytics)
+            results = [
+                {
+                    "node": node,
+                    "degree": int(degree),
+                    "in_degree": int(in_deg),
+                    "out_degree": int(out_deg),
+                }
+                for node, degree, in_deg, out_deg in zip(
+                    nodes_list, degrees.degree(direction)[top], degrees.in_degree[top], degrees.out_degree[top]
+                )
+            ]
+            return {"count": len(results), "results": results}
+
+        except Exception as e:
+            print(f"Degree Error: {e}")
+            raise HTTPException(status_code=500, detail=str(e))
+
+    return await _run(executor, POINT, dataset, _fast_json(work, TopDegreeResponse))
+
+@router.get("/paths", response_model=PathResponse)
+async def get_path(
+    from_id: int = Query(..., alias="from", description="Source node ID"),
+    to_id: int = Query(..., alias="to", description="Target node ID"),
+    max_depth: int = Query(6, ge=1, le=MAX_PATH_DEPTH),
+    direction: str = "both",
+    edge_type: Optional[List[str]] = Query(None, description="Only follow edges of these types (repeatable)"),
+    dataset: Dataset = Depends(get_dataset),
+    graph: AdjacencyIndex = Depends(get_graph),
+    analytics: Optional[GraphAnalytics] = Depends(get_analytics),
+    executor: QueryExecutor = Depends(get_executor)
+):
+    """
+    Shortest path between two nodes.
+    Runs a bidirectional breadth-first search on the in-memory CSR adjacency;
+    with direction=out the path follows edge direction from `from` to `to`.
+    """
+    def work(conn):
+        if direction not in ["out", "in", "both"]:
+            raise HTTPException(status_code=400, detail="Invalid direction. Must be 'out', 'in' or 'both'.")
+
+        try:
+            source = graph.position_of(from_id)
+            target = graph.position_of(to_id)
+            if source is None or target is None:
+                return {"found": False, "nodes": [], "edges": []}
+
+            path = graph.shortest_path(source, target, max_depth, direction, edge_type)
+            if path is None:
+                return {"found": False, "nodes": [], "edges": []}
+
+            node_pos, edge_rows = path
+            return {
+                "found": True,
+                "length": len(edge_rows),
+                "nodes": node_records(conn, graph.node_ids[node_pos], analytics=analytics),
+                "edges": edge_records(graph, edge_rows)
+            }
+
+        except Exception as e:
+            print(f"Path Error: {e}")
+            raise HTTPException(status_code=500, detail=str(e))
+
+    return await _run(executor, HEAVY, dataset, _fast_json(work, PathResponse))
+
+@router.post("/graph/match", response_model=MatchResponse)
+async def match_pattern(
+    body: MatchRequest,
+    dataset: Dataset = Depends(get_dataset),
+    match_query: Optional[MatchQuery] = Depends(get_match_query),
+    executor: QueryExecutor = Depends(get_executor)
+):
+    """
+    Run a bounded SQL/PGQ MATCH pattern on the property graph (duckpgq).
+    Variable-length segments need an upper bound ({m,n}); ANY SHORTEST
+    path patterns can return path_length/vertices/edges of a path variable.
+    Example body: {"pattern": "p = ANY SHORTEST (a:nodes)-[e:edges]->{1,4}(b:nodes)",
+    "where": {"a.id": 12000001, "b.id": 14000001}, "columns": ["path_length(p)", "vertices(p)"]}
+    """
+    if match_query is None:
+        raise HTTPException(status_code=501, detail="Property graph mode is disabled. Set PROPERTY_GRAPH=1.")
+
+    try:
+        sql, params, columns = match_query.compile(body.pattern, body.columns, body.where, body.limit)
+    except PatternError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    def work(conn):
+        try:
+            result = profiling.execute(conn, sql, params)
+            with profiling.conversion():
+                results = [dict(zip(columns, row)) for row in result.fetchall()]
+            metrics.observe(metrics.QUERY_ROWS, len(results))
+            return {"count": len(results), "columns": columns, "results": results}
+
+        except (duckdb.ParserException, duckdb.BinderException) as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        except Exception as e:
+            print(f"Match Error: {e}")
+            raise HTTPException(status_code=500, detail=str(e))
+
+    return await _run(executor, HEAVY, dataset, _fast_json(work, MatchResponse))
+
+@router.get("/stats", response_model=StatsResponse)
+async def get_stats(
+    dataset: Dataset = Depends(get_dataset),
+    pool: CursorPool = Depends(get_pool),
+    cache: ResultCache = Depends(get_cache),
+    executor: QueryExecutor = Depends(get_executor)
+):
+    """
+    Runtime metrics for capacity planning (cursor pool utilisation and waits,
+    result cache hit ratio and evictions, dataset version and reloads,
+    executor lane queues and timeouts).
+    """
+    return {
+        "pool": pool.stats(),
+        "cache": cache.stats(),
+        "dataset": {**dataset.stats(), **deps.reload_stats()},
+        "executor": executor.stats()
+    }
+
+def _check_admin(authorization: Optional[str]):
+    """
+    Admin routes are off unless ADMIN_TOKEN is set, and then require
+    `Authorization: Bearer <ADMIN_TOKEN>`.
+    """
+    token = os.environ.get("ADMIN_TOKEN")
+    if not token:
+        raise HTTPException(status_code=403, detail="Admin endpoints are disabled. Set ADMIN_TOKEN.")
+    if not hmac.compare_digest((authorization or "").encode(), f"Bearer {token}".encode()):
+        raise HTTPException(status_code=401, detail="Invalid admin token", headers={"WWW-Authenticate": "Bearer"})
+
+@router.post("/admin/reload", response_model=ReloadResponse)
+def reload_data(response: Response, wait: bool = False, authorization: Optional[str] = Header(None)):
+    """
+    Reload the Parquet files under DATA_DIR without downtime.
+    The new dataset (tables, indexes, caches) is built next to the serving
+    one and swapped in atomically; in-flight requests finish on the old
+    dataset, which is closed once drained. With wait=false the build runs in
+    the background and 202 is returned immediately.
+    """
+    _check_admin(authorization)
+    if deps.reloading():
+        raise HTTPException(status_code=409, detail="A reload is already in progress")
+
+    if not wait:
+        threading.Thread(target=_background_reload, daemon=True, name="dataset-reload").start()
+        response.status_code = 202
+        return {"status": "started"}
+
+    try:
+        dataset = deps.reload_dataset()
+        return {"status": "reloaded", "version": dataset.version}
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except Exception as e:
+        print(f"Reload Error: {e}")
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=str(e))
+
+def _background_reload():
+    try:
+        deps.reload_dataset()
+    except Exception as e:
+        # Nobody awaits this thread, so the traceback is the only record
+        print(f"Reload Error: {e}")
+        traceback.print_exc()
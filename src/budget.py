@@ -0,0 +1,72 @@
+import contextlib
+import os
+import threading
+import time
+import duckdb
+from dataclasses import dataclass
+from typing import Optional
+
+# Default budget per endpoint; each limit is overridable as BUDGET_<ENDPOINT>_<LIMIT>
+# (e.g. BUDGET_NEIGHBORS_MAX_ROWS), 0 disables it
+DEFAULT_BUDGETS = {
+    "search": {"max_rows": 10000, "max_frontier": 0, "max_seconds": 10.0},
+    "neighbors": {"max_rows": 10000, "max_frontier": 1000000, "max_seconds": 5.0},
+    "subgraph": {"max_rows": 10000, "max_frontier": 1000000, "max_seconds": 5.0},
+}
+
+
+@dataclass(frozen=True)
+class Budget:
+    """
+    Work limits for one request. A request that reaches one returns what it
+    has so far, flagged as truncated, instead of failing.
+
+    max_rows:     rows returned per page (neighbors) / candidates ranked (search) /
+                  nodes returned (subgraph)
+    max_frontier: adjacency slots scanned by a traversal
+    max_seconds:  wall time before the traversal stops / the query is interrupted
+    """
+    max_rows: Optional[int] = None
+    max_frontier: Optional[int] = None
+    max_seconds: Optional[float] = None
+
+    @classmethod
+    def from_env(cls, endpoint: str) -> "Budget":
+        limits = {}
+        for name, default in DEFAULT_BUDGETS[endpoint].items():
+            value = float(os.environ.get(f"BUDGET_{endpoint.upper()}_{name.upper()}", default))
+            limits[name] = (value if name == "max_seconds" else int(value)) if value > 0 else None
+        return cls(**limits)
+
+    def deadline(self, started: Optional[float] = None) -> Optional[float]:
+        """
+        time.perf_counter() value at which max_seconds runs out, or None.
+        """
+        if self.max_seconds is None:
+            return None
+        return (time.perf_counter() if started is None else started) + self.max_seconds
+
+
+@contextlib.contextmanager
+def interrupt_after(conn: duckdb.DuckDBPyConnection, seconds: Optional[float]):
+    """
+    Interrupt whatever `conn` is running once `seconds` have passed. Yields
+    an Event that is set if the interrupt fired, so callers can tell a
+    budget stop from other errors.
+    """
+    fired = threading.Event()
+    if seconds is None:
+        yield fired
+        return
+
+    def stop():
+        fired.set()
+        conn.interrupt()
+
+    timer = threading.Timer(seconds, stop)
+    timer.daemon = True
+    timer.start()
+    try:
+        yield fired
+    finally:
+        timer.cancel()
@@ -0,0 +1,87 @@
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Hashable
+
+# Returned by ResultCache.get when the key is absent
+MISS = object()
+
+
+class ResultCache:
+    """
+    Bounded LRU cache for endpoint results.
+
+    The dataset is read-only, so a result is valid until the data is
+    reloaded, at which point the whole cache is replaced. Entries are capped
+    both by count and by approximate size (length of the JSON encoding).
+    """
+
+    def __init__(self, max_entries: int = 10000, max_bytes: int = 64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._rejected = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 and self.max_bytes > 0
+
+    def get(self, key: Hashable) -> Any:
+        """
+        Cached value for `key` (marking it most recently used), or MISS.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return MISS
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry[0]
+
+    def put(self, key: Hashable, value: Any):
+        """
+        Store `value`, evicting least recently used entries to stay within bounds.
+        Values larger than the whole byte budget are not cached.
+        """
+        if not self.enabled:
+            return
+        size = len(json.dumps(value, default=str))
+        with self._lock:
+            if size > self.max_bytes:
+                self._rejected += 1
+                return
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._entries[key] = (value, size)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self._evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_ratio": self._hits / lookups if lookups else 0.0,
+                "evictions": self._evictions,
+                "rejected": self._rejected,
+            }
@@ -0,0 +1,181 @@
+import hashlib
+import json
+import time
+import duckdb
+from dataclasses import dataclass, asdict
+from typing import Dict, Optional, Tuple
+
+# Tables exposed through /schema and /search
+TABLES = ["nodes", "edges"]
+
+# Optional copies of a table clustered on another column, keyed by (table, column)
+CLUSTERED_COPIES = {("edges", "target_id"): "edges_by_target"}
+
+
+@dataclass(frozen=True)
+class ColumnMeta:
+    name: str
+    type: str
+    nullable: bool
+    # Parquet footer statistics, aggregated over row groups (rendered as text)
+    min: Optional[str] = None
+    max: Optional[str] = None
+    null_count: Optional[int] = None
+    # HyperLogLog estimate from one pass at load time
+    distinct_estimate: Optional[int] = None
+
+
+@dataclass(frozen=True)
+class TableMeta:
+    name: str
+    row_count: int
+    columns: Tuple[ColumnMeta, ...]
+
+    @property
+    def column_names(self) -> frozenset:
+        return frozenset(c.name for c in self.columns)
+
+
+class Catalog:
+    """
+    Immutable snapshot of table schemas and column statistics, captured once
+    per dataset load. Serves /schema (with an ETag) and /search column
+    validation without touching the engine.
+    """
+
+    def __init__(self, tables: Dict[str, TableMeta], clustered: Optional[Dict[Tuple[str, str], str]] = None):
+        self._tables = dict(tables)
+        # (table, column) -> relation holding the same rows sorted by column
+        self._clustered = dict(clustered or {})
+        self.schema_response = {
+            name: [asdict(c) for c in table.columns]
+            for name, table in self._tables.items()
+        }
+        digest = hashlib.sha256(json.dumps(self.schema_response, sort_keys=True).encode()).hexdigest()
+        self.etag = f'"{digest[:32]}"'
+
+    @classmethod
+    def from_connection(
+        cls,
+        conn: duckdb.DuckDBPyConnection,
+        parquet_paths: Optional[Dict[str, str]] = None,
+        distinct: bool = True,
+    ) -> "Catalog":
+        """
+        Capture schemas for `nodes` and `edges`. Min/max/null counts are read
+        from the Parquet footers in `parquet_paths` (no data scan); distinct
+        estimates cost one approx_count_distinct pass per table.
+        """
+        started = time.perf_counter()
+        parquet_paths = parquet_paths or {}
+
+        tables = {}
+        for table in TABLES:
+            described = conn.execute(
+                f"SELECT column_name, column_type, \"null\" FROM (DESCRIBE {table})"
+            ).fetchall()
+            footer = _parquet_stats(conn, parquet_paths.get(table), described)
+            estimates = _distinct_estimates(conn, table, described) if distinct else {}
+            row_count = conn.execute(f"SELECT count(*) FROM {table}").fetchone()[0]
+
+            columns = []
+            for name, col_type, null in described:
+                stats = footer.get(name, {})
+                columns.append(ColumnMeta(
+                    name=name,
+                    type=col_type,
+                    nullable=null == "YES",
+                    min=stats.get("min"),
+                    max=stats.get("max"),
+                    null_count=stats.get("null_count"),
+                    distinct_estimate=estimates.get(name),
+                ))
+            tables[table] = TableMeta(name=table, row_count=row_count, columns=tuple(columns))
+
+        views = {name for (name,) in conn.execute("SELECT view_name FROM duckdb_views()").fetchall()}
+        clustered = {key: name for key, name in CLUSTERED_COPIES.items() if name in views}
+
+        print(f"Schema catalog captured in {time.perf_counter() - started:.3f}s")
+        return cls(tables, clustered)
+
+    def table(self, name: str) -> TableMeta:
+        return self._tables[name]
+
+    def column_names(self, table: str) -> frozenset:
+        return self._tables[table].column_names
+
+    def lookup_relation(self, table: str, columns) -> str:
+        """
+        Relation to scan for a lookup on `table` filtering on `columns`: the
+        copy clustered on that column when there is exactly one and a copy
+        exists (its row-group min/max stats then skip most of the file),
+        otherwise `table` itself.
+        """
+        columns = list(columns)
+        if len(columns) == 1:
+            return self._clustered.get((table, columns[0]), table)
+        return table
+
+    def column_types(self, table: str) -> Dict[str, str]:
+        return {c.name: c.type for c in self._tables[table].columns}
+
+    def id_range(self, table: str) -> Optional[Tuple[int, int]]:
+        """
+        (min, max) of the table's integer `id` column from the footer
+        statistics, or None when they were not captured.
+        """
+        for column in self._tables[table].columns:
+            if column.name == "id" and column.min is not None and column.max is not None:
+                try:
+                    return int(column.min), int(column.max)
+                except ValueError:
+                    return None
+        return None
+
+
+def _quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _parquet_stats(conn: duckdb.DuckDBPyConnection, path: Optional[str], described) -> Dict[str, dict]:
+    if not path:
+        return {}
+
+    types = {name: col_type for name, col_type, _ in described}
+    rows = conn.execute(
+        """
+        SELECT path_in_schema,
+               list(stats_min_value) AS mins,
+               list(stats_max_value) AS maxs,
+               CASE WHEN count(stats_null_count) = count(*) THEN sum(stats_null_count) END AS null_count
+        FROM parquet_metadata(?)
+        GROUP BY path_in_schema
+        """,
+        [path]
+    ).fetchall()
+
+    stats = {}
+    for name, mins, maxs, null_count in rows:
+        if name not in types:
+            continue
+        # Footer values are text; compare them as the column's own type
+        low, high = conn.execute(
+            f"SELECT list_min(list_transform(?, v -> TRY_CAST(v AS {types[name]})))::VARCHAR, "
+            f"list_max(list_transform(?, v -> TRY_CAST(v AS {types[name]})))::VARCHAR",
+            [mins, maxs]
+        ).fetchone()
+        stats[name] = {
+            "min": low,
+            "max": high,
+            "null_count": int(null_count) if null_count is not None else None,
+        }
+    return stats
+
+
+def _distinct_estimates(conn: duckdb.DuckDBPyConnection, table: str, described) -> Dict[str, int]:
+    names = [name for name, _, _ in described]
+    if not names:
+        return {}
+    select = ", ".join(f"approx_count_distinct({_quote(n)})" for n in names)
+    values = conn.execute(f"SELECT {select} FROM {table}").fetchone()
+    return {name: int(v) for name, v in zip(names, values)}
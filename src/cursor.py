@@ -0,0 +1,34 @@
+import base64
+import binascii
+import json
+
+
+class CursorError(ValueError):
+    """
+    A continuation cursor that is malformed or belongs to another dataset version.
+    """
+
+
+def encode_cursor(version: str, **state) -> str:
+    """
+    Opaque continuation token carrying `state`, bound to a dataset version.
+    """
+    payload = json.dumps({"v": version, **state}, separators=(",", ":"), sort_keys=True)
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: str, version: str) -> dict:
+    """
+    State of a token from `encode_cursor`. Tokens issued before a reload are
+    rejected: positions in them refer to the old data.
+    """
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        state = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise CursorError("Malformed cursor")
+    if not isinstance(state, dict):
+        raise CursorError("Malformed cursor")
+    if state.pop("v", None) != version:
+        raise CursorError("Cursor belongs to a previous dataset version; restart from the first page")
+    return state
@@ -0,0 +1,169 @@
+import hashlib
+import os
+import struct
+import threading
+import time
+import duckdb
+from typing import Optional
+from src import analytics, metrics
+from src.analytics import GraphAnalytics
+from src.cache import ResultCache
+from src.catalog import Catalog
+from src.degrees import DegreeTable
+from src.graph import AdjacencyIndex
+from src.loader import load_data, data_paths, source_fingerprint
+from src.pgq import MatchQuery
+from src.pool import CursorPool
+from src.search_index import SearchIndex
+
+
+class Dataset:
+    """
+    One loaded version of the Parquet inputs: the DuckDB connection and its
+    cursor pool plus every structure derived from it (adjacency, graph
+    analytics, degrees, search index, catalog, result cache).
+
+    Requests hold a reference for their whole lifetime (`acquire`/`release`),
+    so a reload can swap in a new Dataset while in-flight requests finish on
+    this one; a retired Dataset closes itself once the last one is done.
+    """
+
+    def __init__(
+        self,
+        conn: duckdb.DuckDBPyConnection,
+        pool: CursorPool,
+        graph: AdjacencyIndex,
+        degrees: DegreeTable,
+        search_index: SearchIndex,
+        catalog: Catalog,
+        cache: ResultCache,
+        match_query: Optional[MatchQuery] = None,
+        fingerprint: Optional[str] = None,
+        analytics: Optional[GraphAnalytics] = None,
+    ):
+        self.conn = conn
+        self.pool = pool
+        self.graph = graph
+        self.degrees = degrees
+        self.search_index = search_index
+        self.catalog = catalog
+        self.cache = cache
+        self.match_query = match_query
+        self.analytics = analytics
+        self.fingerprint = fingerprint
+        self.version = hashlib.sha256((fingerprint or "").encode()).hexdigest()[:12]
+        self.loaded_at = time.time()
+
+        self._lock = threading.Lock()
+        self._active = 0
+        self._retired = False
+        self._closed = False
+
+    @classmethod
+    def load(cls, pool_size: Optional[int] = None) -> "Dataset":
+        """
+        Load the inputs under DATA_DIR and build everything requests need, so
+        the first request on a fresh Dataset is not a cold start.
+        """
+        started = time.perf_counter()
+        fingerprint = current_fingerprint()
+
+        with metrics.phase("load_data"):
+            conn = load_data()
+        with metrics.phase("adjacency"):
+            graph = AdjacencyIndex.from_connection(conn)
+        graph_analytics = None
+        if analytics.enabled():
+            with metrics.phase("analytics"):
+                graph_analytics = GraphAnalytics.from_connection(conn, graph, analytics.damping())
+        with metrics.phase("catalog"):
+            catalog = Catalog.from_connection(
+                conn,
+                data_paths(),
+                distinct=os.environ.get("CATALOG_DISTINCT", "1") != "0",
+            )
+        with metrics.phase("degrees"):
+            degrees = DegreeTable.from_graph(conn, graph)
+        columns = [c.strip() for c in os.environ.get("SEARCH_INDEX_COLUMNS", "display_name").split(",") if c.strip()]
+        with metrics.phase("search_index"):
+            search_index = SearchIndex.from_connection(conn, columns)
+
+        dataset = cls(
+            conn=conn,
+            pool=CursorPool(
+                conn,
+                size=pool_size or int(os.environ.get("DB_POOL_SIZE", "8")),
+                timeout=float(os.environ.get("DB_POOL_TIMEOUT", "30")),
+            ),
+            graph=graph,
+            degrees=degrees,
+            search_index=search_index,
+            catalog=catalog,
+            cache=ResultCache(
+                max_entries=int(os.environ.get("CACHE_MAX_ENTRIES", "10000")),
+                max_bytes=int(os.environ.get("CACHE_MAX_BYTES", str(64 * 1024 * 1024))),
+            ),
+            match_query=MatchQuery(catalog) if os.environ.get("PROPERTY_GRAPH", "0") == "1" else None,
+            fingerprint=fingerprint,
+            analytics=graph_analytics,
+        )
+        elapsed = time.perf_counter() - started
+        metrics.STARTUP_PHASE_SECONDS.set(elapsed, "total")
+        print(f"Dataset {dataset.version} ready in {elapsed:.3f}s")
+        return dataset
+
+    def acquire(self) -> bool:
+        """
+        Take a reference for one request. Fails once the Dataset is closed.
+        """
+        with self._lock:
+            if self._closed:
+                return False
+            self._active += 1
+            return True
+
+    def release(self):
+        with self._lock:
+            self._active -= 1
+            drained = self._retired and self._active == 0
+        if drained:
+            self.close()
+
+    def retire(self):
+        """
+        Mark as replaced; closes now if idle, otherwise when the last request releases it.
+        """
+        with self._lock:
+            self._retired = True
+            idle = self._active == 0
+        if idle:
+            self.close()
+
+    def close(self):
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        print(f"Closing dataset {self.version}...")
+        self.pool.close()
+        self.conn.close()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "version": self.version,
+                "loaded_at": self.loaded_at,
+                "active_requests": self._active,
+            }
+
+
+def current_fingerprint() -> Optional[str]:
+    """
+    Fingerprint of the inputs currently on disk, or None while they are
+    missing or being rewritten (e.g. a truncated Parquet footer).
+    """
+    paths = data_paths()
+    try:
+        return source_fingerprint(paths["nodes"], paths["edges"], os.environ.get("LOAD_MODE", "view"))
+    except (OSError, ValueError, struct.error):
+        return None
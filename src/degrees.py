@@ -0,0 +1,148 @@
+import time
+import duckdb
+import numpy as np
+import pandas as pd
+from typing import Dict, Optional, Tuple
+from src.graph import AdjacencyIndex
+
+
+class DegreeTable:
+    """
+    Per-node degree summary derived from the adjacency index at load time.
+
+    For every node (dense position) it stores outgoing and incoming edge
+    counts broken down by the neighbor's node_type, as an (n, types) matrix
+    per direction, so /neighbors/count is an O(1) row read. Nodes are also
+    pre-sorted by degree to serve "top-N highest degree" queries.
+    """
+
+    def __init__(
+        self,
+        node_ids: np.ndarray,
+        type_codes: np.ndarray,
+        type_labels: np.ndarray,
+        out_by_type: np.ndarray,
+        in_by_type: np.ndarray,
+        out_degree: np.ndarray,
+        in_degree: np.ndarray,
+    ):
+        self.node_ids = node_ids
+        # Dense position -> node_type code (-1 for NULL)
+        self.type_codes = type_codes
+        self.type_labels = type_labels
+        self.out_by_type = out_by_type
+        self.in_by_type = in_by_type
+
+        # Edge counts including neighbors without a node_type
+        self.out_degree = out_degree
+        self.in_degree = in_degree
+
+        # Highest degree first, ties by id
+        self._order = {
+            direction: np.lexsort((node_ids, -self.degree(direction)))
+            for direction in ["out", "in", "both"]
+        }
+
+    @classmethod
+    def from_graph(cls, conn: duckdb.DuckDBPyConnection, graph: AdjacencyIndex) -> "DegreeTable":
+        started = time.perf_counter()
+
+        cols = conn.execute("SELECT id, node_type FROM nodes WHERE id IS NOT NULL").fetchnumpy()
+        ids = np.asarray(cols["id"], dtype=np.int64)
+        types = np.array(np.ma.getdata(cols["node_type"]), dtype=object)
+        types[np.ma.getmaskarray(cols["node_type"])] = None
+
+        # Node type per dense position of the adjacency index
+        pos = np.searchsorted(graph.node_ids, ids)
+        codes, labels = pd.factorize(pd.Series(types, dtype=object), use_na_sentinel=True)
+        type_codes = np.full(graph.num_nodes, -1, dtype=np.int64)
+        type_codes[pos] = codes
+        labels = np.asarray(labels, dtype=object)
+
+        n = graph.num_nodes
+        t = len(labels)
+        out_by_type = _count_by_type(graph.edge_src, type_codes[graph.edge_tgt], n, t)
+        in_by_type = _count_by_type(graph.edge_tgt, type_codes[graph.edge_src], n, t)
+
+        table = cls(
+            graph.node_ids, type_codes, labels, out_by_type, in_by_type,
+            out_degree=np.diff(graph.out_offsets), in_degree=np.diff(graph.in_offsets),
+        )
+        print(f"Degree table built: {n} nodes x {t} node types in {time.perf_counter() - started:.3f}s")
+        return table
+
+    def degree(self, direction: str) -> np.ndarray:
+        if direction == "out":
+            return self.out_degree
+        if direction == "in":
+            return self.in_degree
+        return self.out_degree + self.in_degree
+
+    def counts(self, pos: int, direction: str) -> Tuple[int, Dict[str, int]]:
+        """
+        (total, {neighbor node_type: count}) for one node, counting edges.
+        Neighbors with a NULL node_type count towards neither, as in the
+        GROUP BY node_type this replaces, so the total is sum(details).
+        """
+        row = np.zeros(len(self.type_labels), dtype=np.int64)
+        if direction in ["out", "both"]:
+            row += self.out_by_type[pos]
+        if direction in ["in", "both"]:
+            row += self.in_by_type[pos]
+        nonzero = np.flatnonzero(row)
+        details = dict(zip(self.type_labels[nonzero].tolist(), row[nonzero].tolist()))
+        return int(row.sum()), details
+
+    def type_code(self, node_type: str) -> int:
+        """
+        Code of `node_type` in `type_codes`, or -2 if no node has that type.
+        """
+        matches = np.flatnonzero(self.type_labels == node_type)
+        return int(matches[0]) if matches.size else -2
+
+    def has_type(self, ids: np.ndarray, node_type: str) -> np.ndarray:
+        """
+        Boolean mask over node `ids` selecting nodes of `node_type`.
+        """
+        ids = np.asarray(ids, dtype=np.int64)
+        if len(self.node_ids) == 0:
+            return np.zeros(len(ids), dtype=bool)
+        pos = np.minimum(np.searchsorted(self.node_ids, ids), len(self.node_ids) - 1)
+        return (self.node_ids[pos] == ids) & (self.type_codes[pos] == self.type_code(node_type))
+
+    def top(self, limit: int, direction: str = "both", node_type: Optional[str] = None) -> np.ndarray:
+        """
+        Dense positions of the `limit` highest-degree nodes, optionally of one node_type.
+        """
+        order = self._order[direction]
+        if node_type is None:
+            return order[:limit]
+
+        code = self.type_code(node_type)
+        if code < 0:
+            return order[:0]
+
+        # Walk the presorted order in growing chunks until enough nodes of the type turn up
+        found = []
+        have = 0
+        start = 0
+        chunk = max(4 * limit, 1024)
+        while start < len(order) and have < limit:
+            window = order[start:start + chunk]
+            hits = window[self.type_codes[window] == code]
+            found.append(hits)
+            have += len(hits)
+            start += chunk
+            chunk *= 2
+        if not found:
+            return order[:0]
+        return np.concatenate(found)[:limit]
+
+
+def _count_by_type(keys: np.ndarray, neighbor_types: np.ndarray, n: int, t: int) -> np.ndarray:
+    """
+    Count edges per (node, neighbor type); edges to untyped neighbors are dropped.
+    """
+    typed = neighbor_types >= 0
+    flat = keys[typed] * t + neighbor_types[typed]
+    return np.bincount(flat, minlength=n * t).reshape(n, t).astype(np.int64)
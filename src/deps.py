@@ -1,16 +1,187 @@
-import duckdb
-from src.loader import load_data
+import os
+import threading
+from typing import Dict, Optional
+from fastapi import Depends
+from src.budget import Budget, DEFAULT_BUDGETS
+from src.analytics import GraphAnalytics
+from src.dataset import Dataset, current_fingerprint
+from src.cache import ResultCache
+from src.catalog import Catalog
+from src.degrees import DegreeTable
+from src.executor import QueryExecutor
+from src.graph import AdjacencyIndex
+from src.pgq import MatchQuery
+from src.search_index import SearchIndex
 
-# Singleton connection
-_db_connection = None
+# Singleton dataset currently serving requests (connection, pool, indexes, caches)
+_dataset = None
+# Guards reads and swaps of _dataset
+_dataset_lock = threading.Lock()
+# Held while a replacement dataset is being built
+_reload_lock = threading.Lock()
+# Number of completed reloads since startup
+_reloads = 0
+# Process-wide query executor; its lanes outlive dataset reloads
+_executor = None
+_executor_lock = threading.Lock()
+# Per-endpoint budgets, read from the environment on first use
+_budgets = None
 
-def get_db():
+def get_current_dataset() -> Dataset:
     """
-    Dependency to get the DuckDB connection.
-    Lazy loads if not already initialized.
+    Dataset currently serving requests. Lazy loads if not already initialized.
     """
-    global _db_connection
-    if _db_connection is None:
-        _db_connection = load_data()
-    return _db_connection
+    global _dataset
+    with _dataset_lock:
+        if _dataset is None:
+            _dataset = Dataset.load()
+        return _dataset
 
+def get_dataset():
+    """
+    Dependency pinning one dataset for the duration of a request, so every
+    other dependency of the request resolves against the same version even
+    if a reload swaps in a new one meanwhile.
+    """
+    while True:
+        dataset = get_current_dataset()
+        # A dataset can be closed between the lookup and the acquire only if it
+        # was swapped out; the next lookup then returns its replacement.
+        if dataset.acquire():
+            break
+    try:
+        yield dataset
+    finally:
+        dataset.release()
+
+def get_executor() -> QueryExecutor:
+    """
+    Dependency to get the query executor that runs endpoint work off the
+    event loop, with separate point/heavy lanes (EXECUTOR_*_WORKERS) and
+    per-lane timeouts (QUERY_TIMEOUT_*).
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = QueryExecutor.from_env()
+        return _executor
+
+def get_budgets() -> Dict[str, Budget]:
+    """
+    Dependency to get the per-endpoint work budgets (BUDGET_<ENDPOINT>_<LIMIT>).
+    """
+    global _budgets
+    if _budgets is None:
+        _budgets = {endpoint: Budget.from_env(endpoint) for endpoint in DEFAULT_BUDGETS}
+    return _budgets
+
+def close_executor():
+    global _executor
+    with _executor_lock:
+        old, _executor = _executor, None
+    if old is not None:
+        old.shutdown()
+
+def get_pool(dataset: Dataset = Depends(get_dataset)):
+    """
+    Dependency to get the cursor pool, sized by DB_POOL_SIZE.
+    """
+    return dataset.pool
+
+def get_graph(dataset: Dataset = Depends(get_dataset)) -> AdjacencyIndex:
+    """
+    Dependency to get the in-memory CSR adjacency index.
+    """
+    return dataset.graph
+
+def get_analytics(dataset: Dataset = Depends(get_dataset)) -> Optional[GraphAnalytics]:
+    """
+    Dependency to get the PageRank / component analytics, or None when
+    GRAPH_ANALYTICS=0.
+    """
+    return dataset.analytics
+
+def get_degrees(dataset: Dataset = Depends(get_dataset)) -> DegreeTable:
+    """
+    Dependency to get the precomputed per-node degree table.
+    """
+    return dataset.degrees
+
+def get_search_index(dataset: Dataset = Depends(get_dataset)) -> SearchIndex:
+    """
+    Dependency to get the trigram index used by fuzzy /search.
+    Columns come from SEARCH_INDEX_COLUMNS (comma separated, default display_name).
+    """
+    return dataset.search_index
+
+def get_catalog(dataset: Dataset = Depends(get_dataset)) -> Catalog:
+    """
+    Dependency to get the schema catalog captured at load time.
+    CATALOG_DISTINCT=0 skips the distinct-count estimation pass.
+    """
+    return dataset.catalog
+
+def get_cache(dataset: Dataset = Depends(get_dataset)) -> ResultCache:
+    """
+    Dependency to get the hot-node result cache.
+    Bounded by CACHE_MAX_ENTRIES and CACHE_MAX_BYTES (0 disables caching).
+    Each dataset version has its own cache, so a reload starts cold but never stale.
+    """
+    return dataset.cache
+
+def get_match_query(dataset: Dataset = Depends(get_dataset)):
+    """
+    Dependency to get the SQL/PGQ MATCH compiler, or None when the property
+    graph mode is disabled (PROPERTY_GRAPH != 1).
+    """
+    return dataset.match_query
+
+def reload_dataset() -> Dataset:
+    """
+    Build a new dataset from the files under DATA_DIR next to the serving
+    one, then swap it in. Requests already running finish on the old
+    dataset, which is closed once drained. Raises RuntimeError if another
+    reload is in progress.
+    """
+    global _dataset, _reloads
+    if not _reload_lock.acquire(blocking=False):
+        raise RuntimeError("A reload is already in progress")
+    try:
+        fresh = Dataset.load()
+        with _dataset_lock:
+            old, _dataset = _dataset, fresh
+            _reloads += 1
+        if old is not None:
+            old.retire()
+        return fresh
+    finally:
+        _reload_lock.release()
+
+def reloading() -> bool:
+    return _reload_lock.locked()
+
+def reload_stats() -> dict:
+    return {"reloads": _reloads, "reloading": reloading()}
+
+def watch_data_dir(interval: float, stop: threading.Event):
+    """
+    Poll the input fingerprint every `interval` seconds and reload when it
+    changes (RELOAD_POLL_SECONDS). Half-written files are skipped until
+    their footer is readable.
+    """
+    while not stop.wait(interval):
+        fingerprint = current_fingerprint()
+        if fingerprint is None or fingerprint == get_current_dataset().fingerprint:
+            continue
+        print("Data files changed, reloading...")
+        try:
+            reload_dataset()
+        except Exception as e:
+            print(f"Reload Error: {e}")
+
+def close_dataset():
+    global _dataset
+    with _dataset_lock:
+        old, _dataset = _dataset, None
+    if old is not None:
+        old.retire()
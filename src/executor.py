@@ -0,0 +1,177 @@
+import asyncio
+import contextlib
+import contextvars
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+from fastapi.responses import StreamingResponse
+from src.dataset import Dataset
+from src.pool import CursorPool
+
+# Lane for cheap, bounded work: single-node lookups, top-N reads
+POINT = "point"
+# Lane for scans and traversals whose cost grows with the data
+HEAVY = "heavy"
+LANES = [POINT, HEAVY]
+
+
+class QueryTimeout(Exception):
+    """
+    Raised when a call does not finish within its lane's timeout.
+    """
+
+
+class QueryExecutor:
+    """
+    Runs blocking DuckDB/numpy work for async endpoints on dedicated thread
+    pools, one per priority lane, so the event loop never blocks and heavy
+    scans cannot occupy the threads cheap lookups need.
+
+    A cursor is checked out of the pool only once the call starts running on
+    its lane, so requests queued behind a slow lane do not hold cursors.
+    When a call exceeds its lane timeout the running query is interrupted
+    (`conn.interrupt()`) and the caller gets QueryTimeout right away; a call
+    still waiting in the queue is simply dropped. Work that ignores the
+    interrupt (numpy traversals) keeps its lane thread until it returns, and
+    its cursor goes back to the pool from the future's done-callback.
+    Interrupt and release are serialised per call, so a cursor is only ever
+    interrupted while the worker still runs on it, never once it is back
+    in the pool.
+    """
+
+    def __init__(self, workers: Dict[str, int], timeouts: Dict[str, Optional[float]]):
+        self.workers = dict(workers)
+        self.timeouts = dict(timeouts)
+        self._pools = {
+            lane: ThreadPoolExecutor(max_workers=self.workers[lane], thread_name_prefix=f"query-{lane}")
+            for lane in LANES
+        }
+
+        self._lock = threading.Lock()
+        self._stats = {
+            lane: {"submitted": 0, "running": 0, "completed": 0, "dropped": 0, "timeouts": 0, "queue_seconds_max": 0.0}
+            for lane in LANES
+        }
+
+    @classmethod
+    def from_env(cls) -> "QueryExecutor":
+        """
+        Lane sizes from EXECUTOR_POINT_WORKERS / EXECUTOR_HEAVY_WORKERS and
+        timeouts from QUERY_TIMEOUT_POINT / QUERY_TIMEOUT_HEAVY (seconds, 0 = none).
+        """
+        workers = {lane: int(os.environ.get(f"EXECUTOR_{lane.upper()}_WORKERS", "4")) for lane in LANES}
+        defaults = {POINT: "5", HEAVY: "30"}
+        timeouts = {}
+        for lane in LANES:
+            seconds = float(os.environ.get(f"QUERY_TIMEOUT_{lane.upper()}", defaults[lane]))
+            timeouts[lane] = seconds if seconds > 0 else None
+        return cls(workers, timeouts)
+
+    async def run(
+        self, lane: str, pool: Optional[CursorPool], fn: Callable, *args,
+        timeout: Optional[float] = None, pin: Optional[Dataset] = None
+    ):
+        """
+        Run `fn(cursor, *args)` on `lane` with a cursor from `pool` (or
+        `fn(*args)` when `pool` is None) and await its result. A returned
+        StreamingResponse keeps its cursor until the body has been sent.
+        `pin` is held until the worker is done with it (or the stream is
+        sent), even if the caller times out first.
+        """
+        # conn: cursor while `fn` runs on it; release: returns the cursor and pin
+        state = {"conn": None, "release": contextlib.ExitStack(), "cancelled": False, "lock": threading.Lock()}
+        if pin is not None and pin.acquire():
+            state["release"].callback(pin.release)
+        submitted = time.perf_counter()
+        with self._lock:
+            self._stats[lane]["submitted"] += 1
+        # The request's context (e.g. its route for metrics) carries over to the lane thread
+        context = contextvars.copy_context()
+        future = self._pools[lane].submit(context.run, self._call, lane, submitted, state, pool, fn, args)
+        future.add_done_callback(lambda _: _release(state))
+        waiter = asyncio.wrap_future(future)
+
+        limit = self.timeouts[lane] if timeout is None else timeout
+        try:
+            return await asyncio.wait_for(asyncio.shield(waiter), limit)
+        except asyncio.TimeoutError:
+            pass
+
+        # Nobody awaits the worker any more; retrieve its outcome so it is not reported as lost
+        waiter.add_done_callback(lambda f: f.cancelled() or f.exception())
+        if future.done():
+            # Finished as the timeout fired; a returned stream already owns its cursor
+            return future.result()
+        # Under the call's lock: the worker clears `conn` under it before its cursor is released
+        with state["lock"]:
+            state["cancelled"] = True
+            if state["conn"] is not None:
+                state["conn"].interrupt()
+        dropped = future.cancel()
+        with self._lock:
+            self._stats[lane]["timeouts"] += 1
+            self._stats[lane]["dropped"] += int(dropped)
+        raise QueryTimeout(f"Query exceeded the {lane} lane timeout of {limit}s")
+
+    def _call(self, lane: str, submitted: float, state: dict, pool: Optional[CursorPool], fn: Callable, args):
+        queued = time.perf_counter() - submitted
+        with self._lock:
+            stats = self._stats[lane]
+            stats["running"] += 1
+            stats["queue_seconds_max"] = max(stats["queue_seconds_max"], queued)
+        try:
+            if pool is None:
+                return fn(*args)
+
+            # Released by the done-callback, unless a returned stream takes it over
+            conn = state["release"].enter_context(pool.acquire())
+            with state["lock"]:
+                if state["cancelled"]:
+                    raise QueryTimeout("Query timed out before it started")
+                state["conn"] = conn
+            try:
+                result = fn(conn, *args)
+            finally:
+                with state["lock"]:
+                    state["conn"] = None
+            if isinstance(result, StreamingResponse) and not state["cancelled"]:
+                release = state["release"].pop_all().close
+                result.body_iterator = _release_after(result.body_iterator, release)
+            return result
+        finally:
+            with self._lock:
+                self._stats[lane]["running"] -= 1
+                self._stats[lane]["completed"] += 1
+
+    def stats(self) -> dict:
+        """
+        Per-lane snapshot of worker count, timeout, queue depth and counters.
+        """
+        with self._lock:
+            return {
+                lane: {
+                    "workers": self.workers[lane],
+                    "timeout_seconds": self.timeouts[lane],
+                    "queued": stats["submitted"] - stats["running"] - stats["completed"] - stats["dropped"],
+                    **stats,
+                }
+                for lane, stats in self._stats.items()
+            }
+
+    def shutdown(self):
+        for pool in self._pools.values():
+            pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _release(state: dict):
+    state["release"].close()
+
+
+async def _release_after(body, release: Callable):
+    try:
+        async for chunk in body:
+            yield chunk
+    finally:
+        release()
@@ -0,0 +1,632 @@
+import bisect
+import time
+import duckdb
+import numpy as np
+import pandas as pd
+from typing import Callable, List, Optional, Tuple, Union
+
+# Schema holding internal (non-API) tables in persistent databases
+INDEX_SCHEMA = "yata"
+
+# Direction followed by the backward half of a bidirectional search
+_REVERSE = {"out": "in", "in": "out", "both": "both"}
+
+
+class AdjacencyIndex:
+    """
+    In-memory compressed-sparse-row (CSR) adjacency built from the edges table.
+
+    Node IDs are BIGINT and sparse, so they are mapped to dense positions
+    (0..n-1) by sorting. Outgoing and incoming adjacency are stored as
+    separate offset/neighbor arrays, each neighbor slot also pointing back at
+    the originating edge row so edge id/type can be recovered. Within a
+    node's slice, slots are ordered by edge id, so incident edges can be
+    paged by keyset (see `incident_page`).
+    """
+
+    def __init__(
+        self,
+        node_ids: np.ndarray,
+        edge_ids: np.ndarray,
+        edge_src: np.ndarray,
+        edge_tgt: np.ndarray,
+        edge_type_codes: np.ndarray,
+        edge_type_labels: np.ndarray,
+        csr: Optional[Tuple[np.ndarray, ...]] = None,
+    ):
+        # Dense position -> node id (sorted, unique)
+        self.node_ids = node_ids
+        # Edge rows, endpoints stored as dense positions
+        self.edge_ids = edge_ids
+        self.edge_src = edge_src
+        self.edge_tgt = edge_tgt
+        self.edge_type_codes = edge_type_codes
+        self.edge_type_labels = edge_type_labels
+
+        if csr is None:
+            n = len(node_ids)
+            csr = _build_csr(edge_src, edge_tgt, edge_ids, n) + _build_csr(edge_tgt, edge_src, edge_ids, n)
+        (
+            self.out_offsets, self.out_neighbors, self.out_edges,
+            self.in_offsets, self.in_neighbors, self.in_edges,
+        ) = csr
+
+    @classmethod
+    def from_connection(cls, conn: duckdb.DuckDBPyConnection) -> "AdjacencyIndex":
+        """
+        Build the index from the `nodes` and `edges` relations of a loaded connection.
+        Edges whose endpoints are missing from `nodes` are dropped, matching the
+        inner-join semantics of the SQL neighbor queries.
+
+        If the connection is a persistent database that already carries a
+        saved index (see `save`), that copy is loaded instead.
+        """
+        started = time.perf_counter()
+
+        if _has_saved_index(conn):
+            index = cls.load(conn)
+            print(
+                f"Adjacency index loaded: {index.num_nodes} nodes, {index.num_edges} edges "
+                f"in {time.perf_counter() - started:.3f}s"
+            )
+            return index
+
+        node_ids = conn.execute("SELECT DISTINCT id FROM nodes WHERE id IS NOT NULL").fetchnumpy()["id"]
+        node_ids = np.sort(node_ids.astype(np.int64))
+
+        edges = conn.execute("SELECT id, source_id, target_id, edge_type FROM edges").fetchnumpy()
+        src_pos, src_ok = _lookup(node_ids, edges["source_id"])
+        tgt_pos, tgt_ok = _lookup(node_ids, edges["target_id"])
+        keep = src_ok & tgt_ok
+
+        edge_types = np.ma.filled(np.ma.asarray(edges["edge_type"], dtype=object), None)
+        codes, labels = pd.factorize(pd.Series(edge_types[keep], dtype=object), use_na_sentinel=True)
+        labels = np.append(np.asarray(labels, dtype=object), None)
+        codes = np.where(codes < 0, len(labels) - 1, codes).astype(np.int32)
+
+        index = cls(
+            node_ids=node_ids,
+            edge_ids=np.ma.filled(edges["id"], 0).astype(np.int64)[keep],
+            edge_src=src_pos[keep],
+            edge_tgt=tgt_pos[keep],
+            edge_type_codes=codes,
+            edge_type_labels=labels,
+        )
+        print(
+            f"Adjacency index built: {len(node_ids)} nodes, {int(keep.sum())} edges "
+            f"in {time.perf_counter() - started:.3f}s"
+        )
+        return index
+
+    def save(self, conn: duckdb.DuckDBPyConnection):
+        """
+        Persist the index into the `yata` schema of a (file-backed) connection.
+        Arrays are written as single-table columns grouped by length and read
+        back in insertion order.
+        """
+        conn.execute(f"CREATE SCHEMA IF NOT EXISTS {INDEX_SCHEMA}")
+
+        nodes = pd.DataFrame({"node_id": self.node_ids})
+        offsets = pd.DataFrame({"out_offset": self.out_offsets, "in_offset": self.in_offsets})
+        edges = pd.DataFrame({
+            "edge_id": self.edge_ids,
+            "edge_src": self.edge_src,
+            "edge_tgt": self.edge_tgt,
+            "edge_type_code": self.edge_type_codes,
+            "out_neighbor": self.out_neighbors,
+            "out_edge": self.out_edges,
+            "in_neighbor": self.in_neighbors,
+            "in_edge": self.in_edges,
+        })
+        labels = pd.DataFrame({"label": pd.Series(self.edge_type_labels, dtype=object)})
+
+        for name, df in [
+            ("adjacency_nodes", nodes),
+            ("adjacency_offsets", offsets),
+            ("adjacency_edges", edges),
+            ("adjacency_edge_types", labels),
+        ]:
+            conn.execute(f"CREATE OR REPLACE TABLE {INDEX_SCHEMA}.{name} AS SELECT * FROM df")
+
+    @classmethod
+    def load(cls, conn: duckdb.DuckDBPyConnection) -> "AdjacencyIndex":
+        """
+        Load an index previously written by `save`.
+        """
+        nodes = conn.execute(f"SELECT * FROM {INDEX_SCHEMA}.adjacency_nodes").fetchnumpy()
+        offsets = conn.execute(f"SELECT * FROM {INDEX_SCHEMA}.adjacency_offsets").fetchnumpy()
+        edges = conn.execute(f"SELECT * FROM {INDEX_SCHEMA}.adjacency_edges").fetchnumpy()
+        labels = conn.execute(f"SELECT label FROM {INDEX_SCHEMA}.adjacency_edge_types").fetchnumpy()["label"]
+
+        def col(arrays, name, dtype=np.int64):
+            return np.asarray(arrays[name], dtype=dtype)
+
+        return cls(
+            node_ids=col(nodes, "node_id"),
+            edge_ids=col(edges, "edge_id"),
+            edge_src=col(edges, "edge_src"),
+            edge_tgt=col(edges, "edge_tgt"),
+            edge_type_codes=col(edges, "edge_type_code", np.int32),
+            edge_type_labels=np.ma.filled(np.ma.asarray(labels, dtype=object), None),
+            csr=(
+                col(offsets, "out_offset"), col(edges, "out_neighbor"), col(edges, "out_edge"),
+                col(offsets, "in_offset"), col(edges, "in_neighbor"), col(edges, "in_edge"),
+            ),
+        )
+
+    @property
+    def num_nodes(self) -> int:
+        return len(self.node_ids)
+
+    @property
+    def num_edges(self) -> int:
+        return len(self.edge_ids)
+
+    def position_of(self, node_id: int) -> Optional[int]:
+        """
+        Dense position of a node id, or None if the node is unknown.
+        """
+        pos = int(np.searchsorted(self.node_ids, node_id))
+        if pos < len(self.node_ids) and self.node_ids[pos] == node_id:
+            return pos
+        return None
+
+    def gather(self, frontier: np.ndarray, direction: str) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Collect (neighbor positions, edge rows) adjacent to every node in `frontier`.
+        Outgoing slots come first, then incoming ones.
+        """
+        _, neighbors, edges = self._step(frontier, direction)
+        return neighbors, edges
+
+    def _step(self, frontier: np.ndarray, direction: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Like `gather`, but also returns the frontier node each slot came from.
+        """
+        frontier = np.asarray(frontier, dtype=np.int64)
+        parts = []
+        if direction in ["out", "both"]:
+            parts.append(_csr_slice(self.out_offsets, self.out_neighbors, self.out_edges, frontier))
+        if direction in ["in", "both"]:
+            parts.append(_csr_slice(self.in_offsets, self.in_neighbors, self.in_edges, frontier))
+        if not parts:
+            empty = np.empty(0, dtype=np.int64)
+            return empty, empty, empty
+        return tuple(np.concatenate(arrays) for arrays in zip(*parts))
+
+    def edge_type_mask(self, edge_types: List[str]) -> np.ndarray:
+        """
+        Boolean mask over edge type codes selecting the given edge_type labels.
+        """
+        return np.isin(self.edge_type_labels.astype(object), list(edge_types))
+
+    def expand(
+        self,
+        start: int,
+        depth: int,
+        direction: str = "both",
+        max_fanout: Optional[int] = None,
+        edge_types: Optional[List[str]] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Breadth-first k-hop expansion from dense position `start`.
+
+        Returns (discovered node positions in discovery order, excluding `start`;
+        edge rows connecting nodes of the result set). Each hop admits at most
+        `max_fanout` newly discovered nodes; already visited nodes are never
+        expanded twice. `edge_types` restricts the traversal to those types.
+        """
+        nodes, edges, _ = self.expand_within(start, depth, direction, max_fanout, edge_types)
+        return nodes, edges
+
+    def expand_within(
+        self,
+        start: Union[int, np.ndarray],
+        depth: int,
+        direction: str = "both",
+        max_fanout: Optional[int] = None,
+        edge_types: Optional[List[str]] = None,
+        max_edges: Optional[int] = None,
+        deadline: Optional[float] = None,
+    ) -> Tuple[np.ndarray, np.ndarray, bool]:
+        """
+        `expand` under a work budget: at most `max_edges` adjacency slots are
+        scanned in total (a hub's slice is cut rather than gathered whole),
+        and no further hop starts after `deadline` (time.perf_counter()).
+        `start` may also be an array of positions, expanded together.
+        Returns (node positions, edge rows, truncated).
+        """
+        allowed = self.edge_type_mask(edge_types) if edge_types is not None else None
+        visited = np.zeros(self.num_nodes, dtype=bool)
+        frontier = np.atleast_1d(np.asarray(start, dtype=np.int64))
+        visited[frontier] = True
+
+        node_chunks = []
+        edge_chunks = []
+        scanned = 0
+        truncated = False
+
+        for hop in range(depth):
+            if frontier.size == 0:
+                break
+            if hop and deadline is not None and time.perf_counter() > deadline:
+                truncated = True
+                break
+
+            if max_edges is None:
+                nbrs, eids = self.gather(frontier, direction)
+            else:
+                _, nbrs, eids, cut = self._step_within(frontier, direction, max_edges - scanned)
+                scanned += len(nbrs)
+                truncated = truncated or cut
+            if allowed is not None:
+                keep = allowed[self.edge_type_codes[eids]]
+                nbrs, eids = nbrs[keep], eids[keep]
+            if nbrs.size == 0:
+                break
+
+            # New nodes in first-seen order
+            fresh = nbrs[~visited[nbrs]]
+            _, first = np.unique(fresh, return_index=True)
+            fresh = fresh[np.sort(first)]
+            if max_fanout is not None and fresh.size > max_fanout:
+                fresh = fresh[:max_fanout]
+
+            visited[fresh] = True
+            # Keep edges whose far end made it into the result set
+            edge_chunks.append(eids[visited[nbrs]])
+            node_chunks.append(fresh)
+            frontier = fresh
+            if truncated:
+                break
+
+        if not node_chunks:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), truncated
+
+        nodes = np.concatenate(node_chunks)
+        edges = np.concatenate(edge_chunks)
+        # An edge between two frontier nodes is reachable from both ends
+        _, first = np.unique(edges, return_index=True)
+        edges = edges[np.sort(first)]
+        return nodes, edges, truncated
+
+    def induced_edges(
+        self,
+        node_pos: np.ndarray,
+        edge_types: Optional[List[str]] = None,
+        max_edges: Optional[int] = None,
+    ) -> Tuple[np.ndarray, bool]:
+        """
+        Rows of the edges with both endpoints in `node_pos`, in edge id order.
+        Only the outgoing slices of those nodes are scanned (each edge once,
+        from its source), at most `max_edges` slots of them.
+        Returns (edge rows, whether slots were left unscanned).
+        """
+        node_pos = np.asarray(node_pos, dtype=np.int64)
+        inside = np.zeros(self.num_nodes, dtype=bool)
+        inside[node_pos] = True
+        if max_edges is None:
+            _, nbrs, edges = _csr_slice(self.out_offsets, self.out_neighbors, self.out_edges, node_pos)
+            cut = False
+        else:
+            _, nbrs, edges, cut = _csr_slice_limited(self.out_offsets, self.out_neighbors, self.out_edges, node_pos, max_edges)
+        edges = edges[inside[nbrs]]
+        if edge_types is not None:
+            edges = edges[self.edge_type_mask(edge_types)[self.edge_type_codes[edges]]]
+        return edges[np.argsort(self.edge_ids[edges], kind="stable")], cut
+
+    def _step_within(
+        self, frontier: np.ndarray, direction: str, limit: int
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, bool]:
+        """
+        Like `_step`, but returns only the first `limit` slots (in `_step`
+        order) without materializing the rest. The last flag tells whether
+        slots were left out.
+        """
+        frontier = np.asarray(frontier, dtype=np.int64)
+        parts = []
+        cut = False
+        csrs = []
+        if direction in ["out", "both"]:
+            csrs.append((self.out_offsets, self.out_neighbors, self.out_edges))
+        if direction in ["in", "both"]:
+            csrs.append((self.in_offsets, self.in_neighbors, self.in_edges))
+        for offsets, neighbors, edges in csrs:
+            if limit <= 0:
+                cut = cut or bool((offsets[frontier + 1] - offsets[frontier]).any())
+                break
+            origin, nbr, edge, part_cut = _csr_slice_limited(offsets, neighbors, edges, frontier, limit)
+            parts.append((origin, nbr, edge))
+            limit -= len(nbr)
+            cut = cut or part_cut
+        if not parts:
+            empty = np.empty(0, dtype=np.int64)
+            return empty, empty, empty, cut
+        return tuple(np.concatenate(arrays) for arrays in zip(*parts)) + (cut,)
+
+    def incident_page(
+        self,
+        node: int,
+        direction: str,
+        after: Optional[int] = None,
+        limit: int = 1000,
+        edge_types: Optional[List[str]] = None,
+        accept: Optional[Callable[[np.ndarray], np.ndarray]] = None,
+        max_slots: Optional[int] = None,
+    ) -> Tuple[np.ndarray, np.ndarray, Optional[int], bool]:
+        """
+        Keyset page of the edges incident to dense position `node`: up to
+        `limit` edges with edge id greater than `after`, in edge id order,
+        optionally of `edge_types` and with neighbors accepted by `accept`
+        (a mask function over neighbor positions). Finding the start costs a
+        binary search per direction, so page N costs the same as page 1.
+        At most `max_slots` slots are examined.
+
+        Returns (neighbor positions, edge rows, edge id to resume after or
+        None once the slices are exhausted, whether max_slots cut the scan).
+        A self-loop is returned once.
+        """
+        parts = []
+        if direction in ["out", "both"]:
+            parts.append((self.out_offsets, self.out_neighbors, self.out_edges))
+        if direction in ["in", "both"]:
+            parts.append((self.in_offsets, self.in_neighbors, self.in_edges))
+        allowed = self.edge_type_mask(edge_types) if edge_types is not None else None
+
+        cursors = []
+        for offsets, _, edges in parts:
+            lo, hi = int(offsets[node]), int(offsets[node + 1])
+            if after is not None:
+                lo += bisect.bisect_right(range(lo, hi), after, key=lambda slot: self.edge_ids[edges[slot]])
+            cursors.append([lo, hi])
+
+        found_nbrs, found_edges = [], []
+        found = 0
+        scanned = 0
+        last = after
+        cut = False
+        while found < limit:
+            chunk = max(limit - found, 256)
+            if max_slots is not None:
+                chunk = min(chunk, max_slots - scanned)
+                if chunk <= 0:
+                    cut = self._has_edges_after(parts, node, last)
+                    break
+
+            # The next `chunk` slots in merged edge id order come from the next `chunk` of each part
+            nbrs = np.concatenate([neighbors[lo:min(lo + chunk, hi)] for (_, neighbors, _), (lo, hi) in zip(parts, cursors)])
+            edges = np.concatenate([edge_rows[lo:min(lo + chunk, hi)] for (_, _, edge_rows), (lo, hi) in zip(parts, cursors)])
+            source = np.concatenate([np.full(min(chunk, hi - lo), i) for i, (lo, hi) in enumerate(cursors)])
+            if edges.size == 0:
+                break
+            order = np.argsort(self.edge_ids[edges], kind="stable")[:chunk]
+            nbrs, edges, source = nbrs[order], edges[order], source[order]
+            for i in range(len(cursors)):
+                cursors[i][0] += int((source == i).sum())
+            scanned += len(edges)
+
+            eids = self.edge_ids[edges]
+            keep = np.append(True, eids[1:] != eids[:-1])
+            if last is not None:
+                keep &= eids > last
+            if allowed is not None:
+                keep &= allowed[self.edge_type_codes[edges]]
+            if accept is not None:
+                keep &= accept(nbrs)
+            hits = np.flatnonzero(keep)[:limit - found]
+            found_nbrs.append(nbrs[hits])
+            found_edges.append(edges[hits])
+            found += len(hits)
+            if found == limit:
+                # Stop right after the last edge returned; slots beyond it are rescanned next page
+                last = int(eids[hits[-1]])
+                break
+            last = int(eids[-1])
+
+        remaining = self._has_edges_after(parts, node, last)
+        if not found_edges:
+            empty = np.empty(0, dtype=np.int64)
+            return empty, empty, (last if remaining else None), cut
+        return (
+            np.concatenate(found_nbrs),
+            np.concatenate(found_edges),
+            last if remaining else None,
+            cut,
+        )
+
+    def _has_edges_after(self, parts, node: int, last: Optional[int]) -> bool:
+        """
+        Whether any slice in `parts` holds an edge id above `last`; slices are
+        sorted by edge id, so only their last slot needs checking.
+        """
+        for offsets, _, edge_rows in parts:
+            lo, hi = int(offsets[node]), int(offsets[node + 1])
+            if hi > lo and (last is None or int(self.edge_ids[edge_rows[hi - 1]]) > last):
+                return True
+        return False
+
+    def shortest_path(
+        self,
+        source: int,
+        target: int,
+        max_depth: int,
+        direction: str = "both",
+        edge_types: Optional[List[str]] = None,
+    ) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Shortest path between dense positions `source` and `target` by
+        bidirectional breadth-first search, following `direction` from the
+        source side (and the reverse from the target side), optionally only
+        over edges whose type is in `edge_types`.
+
+        Returns (node positions from source to target, edge rows along the
+        path), or None if no path of at most `max_depth` hops exists.
+        """
+        if source == target:
+            return np.array([source], dtype=np.int64), np.empty(0, dtype=np.int64)
+
+        allowed = self.edge_type_mask(edge_types) if edge_types is not None else None
+
+        # Per side: hop distance (-1 = unseen) and the (node, edge) it was reached through
+        sides = []
+        for root, side_direction in [(source, direction), (target, _REVERSE[direction])]:
+            dist = np.full(self.num_nodes, -1, dtype=np.int64)
+            dist[root] = 0
+            sides.append({
+                "dist": dist,
+                "parent": np.full(self.num_nodes, -1, dtype=np.int64),
+                "via": np.full(self.num_nodes, -1, dtype=np.int64),
+                "frontier": np.array([root], dtype=np.int64),
+                "depth": 0,
+                "direction": side_direction,
+            })
+        forward, backward = sides
+
+        while forward["depth"] + backward["depth"] < max_depth:
+            if forward["frontier"].size == 0 or backward["frontier"].size == 0:
+                return None
+
+            # Grow the cheaper side: fewer edge slots to scan
+            costs = [self._frontier_cost(side["frontier"], side["direction"]) for side in sides]
+            this, other = (forward, backward) if costs[0] <= costs[1] else (backward, forward)
+
+            origins, nbrs, eids = self._step(this["frontier"], this["direction"])
+            if allowed is not None:
+                keep = allowed[self.edge_type_codes[eids]]
+                origins, nbrs, eids = origins[keep], nbrs[keep], eids[keep]
+
+            fresh = this["dist"][nbrs] < 0
+            origins, nbrs, eids = origins[fresh], nbrs[fresh], eids[fresh]
+            nbrs, first = np.unique(nbrs, return_index=True)
+            origins, eids = origins[first], eids[first]
+
+            this["depth"] += 1
+            this["dist"][nbrs] = this["depth"]
+            this["parent"][nbrs] = origins
+            this["via"][nbrs] = eids
+            this["frontier"] = nbrs
+
+            met = nbrs[other["dist"][nbrs] >= 0]
+            if met.size:
+                # Closest meeting point on the other side, lowest position on ties
+                meet = met[np.lexsort((met, other["dist"][met]))[0]]
+                return self._join_paths(forward, backward, meet)
+
+        return None
+
+    def _frontier_cost(self, frontier: np.ndarray, direction: str) -> int:
+        cost = 0
+        if direction in ["out", "both"]:
+            cost += int((self.out_offsets[frontier + 1] - self.out_offsets[frontier]).sum())
+        if direction in ["in", "both"]:
+            cost += int((self.in_offsets[frontier + 1] - self.in_offsets[frontier]).sum())
+        return cost
+
+    @staticmethod
+    def _join_paths(forward: dict, backward: dict, meet: int) -> Tuple[np.ndarray, np.ndarray]:
+        nodes = [meet]
+        edges = []
+        node = meet
+        while forward["parent"][node] >= 0:
+            edges.append(forward["via"][node])
+            node = forward["parent"][node]
+            nodes.append(node)
+        nodes.reverse()
+        edges.reverse()
+
+        node = meet
+        while backward["parent"][node] >= 0:
+            edges.append(backward["via"][node])
+            node = backward["parent"][node]
+            nodes.append(node)
+        return np.array(nodes, dtype=np.int64), np.array(edges, dtype=np.int64)
+
+
+def _has_saved_index(conn: duckdb.DuckDBPyConnection) -> bool:
+    row = conn.execute(
+        "SELECT count(*) FROM duckdb_tables() WHERE schema_name = ? AND table_name = 'adjacency_edges'",
+        [INDEX_SCHEMA]
+    ).fetchone()
+    return row[0] > 0
+
+
+def _lookup(sorted_ids: np.ndarray, values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Map raw ids to dense positions. Returns (positions, found mask).
+    """
+    # NULL ids come back masked from fetchnumpy()
+    found_null = np.ma.getmaskarray(values)
+    values = np.ma.filled(values, 0).astype(np.int64)
+
+    if len(sorted_ids) == 0:
+        return np.zeros(len(values), dtype=np.int64), np.zeros(len(values), dtype=bool)
+
+    pos = np.searchsorted(sorted_ids, values)
+    pos = np.minimum(pos, len(sorted_ids) - 1)
+    ok = (sorted_ids[pos] == values) & ~found_null
+    return pos.astype(np.int64), ok
+
+
+def _build_csr(
+    keys: np.ndarray, values: np.ndarray, edge_ids: np.ndarray, n: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Group `values` by `keys` into CSR (offsets, values, edge rows), each
+    group ordered by edge id.
+    """
+    order = np.lexsort((edge_ids, keys))
+    offsets = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(keys, minlength=n), out=offsets[1:])
+    return offsets, values[order].astype(np.int64), order.astype(np.int64)
+
+
+def _csr_slice(
+    offsets: np.ndarray,
+    neighbors: np.ndarray,
+    edges: np.ndarray,
+    rows: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Concatenate the CSR slices of `rows` without a Python-level loop.
+    Returns (originating row, neighbor, edge row) per slot.
+    """
+    starts = offsets[rows]
+    lengths = offsets[rows + 1] - starts
+    total = int(lengths.sum())
+    if total == 0:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty, empty
+    # Position i of the output maps to starts[row] + (i - first output slot of row)
+    shifts = np.repeat(starts - (np.cumsum(lengths) - lengths), lengths)
+    slots = np.arange(total, dtype=np.int64) + shifts
+    return np.repeat(rows, lengths), neighbors[slots], edges[slots]
+
+
+def _csr_slice_limited(
+    offsets: np.ndarray,
+    neighbors: np.ndarray,
+    edges: np.ndarray,
+    rows: np.ndarray,
+    limit: int,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, bool]:
+    """
+    The first `limit` slots of `_csr_slice(offsets, neighbors, edges, rows)`.
+    Rows that fit entirely are sliced as usual; the row crossing the limit
+    contributes a prefix view of its slice. Also returns whether slots were cut.
+    """
+    starts = offsets[rows]
+    ends = np.cumsum(offsets[rows + 1] - starts)
+    whole = int(np.searchsorted(ends, limit, side="right"))
+    origin, nbr, edge = _csr_slice(offsets, neighbors, edges, rows[:whole])
+    if whole == len(rows):
+        return origin, nbr, edge, False
+
+    used = int(ends[whole - 1]) if whole else 0
+    lo = int(starts[whole])
+    hi = lo + (limit - used)
+    return (
+        np.append(origin, np.full(hi - lo, rows[whole], dtype=np.int64)),
+        np.append(nbr, neighbors[lo:hi]),
+        np.append(edge, edges[lo:hi]),
+        True,
+    )
@@ -1,34 +1,402 @@
+import argparse
 import duckdb
+import glob
+import hashlib
+import json
 import os
+import struct
+import time
+import numpy as np
+from src import analytics, metrics
+from src.analytics import GraphAnalytics
+from src.graph import AdjacencyIndex, INDEX_SCHEMA
+from src.pgq import create_property_graph, load_extension
+
+# Supported values for the LOAD_MODE environment variable
+LOAD_MODES = ["view", "materialized", "materialized+indexed"]
+
+# Bump when the layout of the persistent database changes
+DB_FORMAT_VERSION = 2
+
+# Copy of the edges clustered by target_id, written by `python -m src.loader build`
+EDGES_BY_TARGET = "edges_by_target"
+
+# Defaults for `python -m src.loader build`: smaller row groups than DuckDB's
+# 122880 make min/max statistics selective enough for point lookups
+BUILD_ROW_GROUP_SIZE = 16384
+BUILD_COMPRESSION = "zstd"
+
+def data_paths() -> dict:
+    """
+    Source Parquet input per table, resolved from DATA_DIR.
+
+    Either a single `<table>.parquet` file or a `<table>/` directory of
+    (possibly Hive-partitioned, e.g. `node_type=officer/part-0.parquet`)
+    files. NODES_PATH / EDGES_PATH override the location and may be globs.
+    """
+    data_dir = os.environ.get("DATA_DIR", "data")
+    paths = {}
+    for table in ["nodes", "edges"]:
+        path = os.environ.get(f"{table.upper()}_PATH")
+        if not path:
+            path = os.path.join(data_dir, f"{table}.parquet")
+            directory = os.path.join(data_dir, table)
+            if not os.path.exists(path) and os.path.isdir(directory):
+                path = os.path.join(directory, "**", "*.parquet")
+        elif os.path.isdir(path):
+            path = os.path.join(path, "**", "*.parquet")
+        paths[table] = path
+
+    by_target = os.path.join(data_dir, f"{EDGES_BY_TARGET}.parquet")
+    if os.path.isfile(by_target):
+        paths[EDGES_BY_TARGET] = by_target
+    return paths
+
+def is_multi_file(path: str) -> bool:
+    return glob.has_magic(path)
+
+def input_files(path: str) -> list:
+    """
+    Parquet files behind one input (a single file or a glob), sorted.
+    """
+    if not is_multi_file(path):
+        return [path] if os.path.isfile(path) else []
+    return sorted(glob.glob(path, recursive=True))
+
+def parquet_source(path: str) -> str:
+    """
+    Table expression reading one input. Multi-file inputs take partition
+    columns from `key=value` directories, so filters on them (node_type,
+    edge_type) skip whole files.
+    """
+    if is_multi_file(path):
+        return f"read_parquet('{path}', hive_partitioning = true, union_by_name = true)"
+    return f"'{path}'"
 
 def load_data() -> duckdb.DuckDBPyConnection:
-    conn = duckdb.connect(":memory:")
-    
     # Path resolution
-    data_dir = os.environ.get("DATA_DIR", "data")
-    
-    nodes_path = os.path.join(data_dir, "nodes.parquet")
-    edges_path = os.path.join(data_dir, "edges.parquet")
-    
+    load_mode = os.environ.get("LOAD_MODE", "view")
+    db_path = os.environ.get("DB_PATH")
+    property_graph = os.environ.get("PROPERTY_GRAPH", "0") == "1"
+
+    paths = data_paths()
+    nodes_path = paths["nodes"]
+    edges_path = paths["edges"]
+
     # Verify existence
-    if not os.path.exists(nodes_path):
+    if not input_files(nodes_path):
         raise FileNotFoundError(f"nodes.parquet not found at {nodes_path}")
-    if not os.path.exists(edges_path):
+    if not input_files(edges_path):
         raise FileNotFoundError(f"edges.parquet not found at {edges_path}")
+    if load_mode not in LOAD_MODES:
+        raise ValueError(f"Invalid LOAD_MODE '{load_mode}'. Must be one of {LOAD_MODES}")
+
+    if property_graph and load_mode == "view":
+        # duckpgq vertex/edge tables must be base tables, not Parquet views.
+        print("PROPERTY_GRAPH is set: promoting LOAD_MODE=view to materialized.")
+        load_mode = "materialized"
 
-    print(f"Mounting nodes from {nodes_path} as VIEW...")
-    conn.execute(f"CREATE OR REPLACE VIEW nodes AS SELECT * FROM '{nodes_path}'")
-    
-    print(f"Mounting edges from {edges_path} as VIEW...")
-    conn.execute(f"CREATE OR REPLACE VIEW edges AS SELECT * FROM '{edges_path}'")
-    
-    # Indexes generally cannot be created on Views backed by Parquet files in DuckDB
-    # We rely on Parquet's internal statistics and DuckDB's pushdown optimization.
-
-    
-    print("Data loaded successfully.")
+    if db_path:
+        with metrics.phase("persistent_db"):
+            conn = _open_persistent(db_path, nodes_path, edges_path, load_mode, property_graph)
+        apply_settings(conn)
+        return conn
+
+    conn = duckdb.connect(":memory:")
+    apply_settings(conn)
+    with metrics.phase("tables"):
+        _create_tables(conn, nodes_path, edges_path, load_mode, paths.get(EDGES_BY_TARGET))
+    if property_graph:
+        with metrics.phase("property_graph"):
+            create_property_graph(conn)
     return conn
 
-if __name__ == "__main__":
-    load_data()
+def apply_settings(conn: duckdb.DuckDBPyConnection):
+    """
+    Engine-wide resource caps: DUCKDB_MEMORY_LIMIT (e.g. 4GB) and
+    DUCKDB_THREADS. Settings apply to the whole database, so every pooled
+    cursor inherits them; a query past the memory limit spills or fails
+    instead of growing the process.
+    """
+    memory_limit = os.environ.get("DUCKDB_MEMORY_LIMIT")
+    if memory_limit:
+        conn.execute("SET memory_limit = ?", [memory_limit])
+    threads = int(os.environ.get("DUCKDB_THREADS", "0"))
+    if threads > 0:
+        conn.execute("SET threads = ?", [threads])
+
+def _create_tables(
+    conn: duckdb.DuckDBPyConnection,
+    nodes_path: str,
+    edges_path: str,
+    load_mode: str,
+    edges_by_target_path: str = None,
+):
+    started = time.perf_counter()
+
+    if load_mode == "view":
+        print(f"Mounting nodes from {nodes_path} as VIEW...")
+        conn.execute(f"CREATE OR REPLACE VIEW nodes AS SELECT * FROM {parquet_source(nodes_path)}")
+
+        print(f"Mounting edges from {edges_path} as VIEW...")
+        conn.execute(f"CREATE OR REPLACE VIEW edges AS SELECT * FROM {parquet_source(edges_path)}")
+
+        if edges_by_target_path:
+            # Same edges clustered by target_id, for lookups that filter on it
+            print(f"Mounting {EDGES_BY_TARGET} from {edges_by_target_path} as VIEW...")
+            conn.execute(f"CREATE OR REPLACE VIEW {EDGES_BY_TARGET} AS SELECT * FROM {parquet_source(edges_by_target_path)}")
+
+        # Indexes generally cannot be created on Views backed by Parquet files in DuckDB
+        # We rely on Parquet's internal statistics and DuckDB's pushdown optimization.
+    else:
+        # Copy into DuckDB native storage so lookups stop re-reading Parquet row groups.
+        print(f"Materializing nodes from {nodes_path} as TABLE...")
+        conn.execute(f"CREATE OR REPLACE TABLE nodes AS SELECT * FROM {parquet_source(nodes_path)}")
+
+        print(f"Materializing edges from {edges_path} as TABLE...")
+        conn.execute(f"CREATE OR REPLACE TABLE edges AS SELECT * FROM {parquet_source(edges_path)}")
+
+        if load_mode == "materialized+indexed":
+            print("Building ART indexes on nodes.id, edges.source_id, edges.target_id...")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_nodes_id ON nodes (id)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_edges_source_id ON edges (source_id)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_edges_target_id ON edges (target_id)")
+
+    n_count = conn.execute("SELECT count(*) FROM nodes").fetchone()[0]
+    e_count = conn.execute("SELECT count(*) FROM edges").fetchone()[0]
+    elapsed = time.perf_counter() - started
 
+    print(f"Data loaded successfully (mode={load_mode}): {n_count} nodes, {e_count} edges in {elapsed:.3f}s.")
+
+def _open_persistent(
+    db_path: str,
+    nodes_path: str,
+    edges_path: str,
+    load_mode: str,
+    property_graph: bool = False,
+) -> duckdb.DuckDBPyConnection:
+    """
+    Attach a prebuilt .duckdb file if its fingerprint matches the current
+    Parquet inputs, otherwise rebuild it. The file is opened read-only so
+    several workers can share it; a property graph is therefore defined at
+    build time and only the extension is loaded on attach.
+    """
+    if load_mode == "view":
+        # Views would only persist the Parquet paths, not the data.
+        print("DB_PATH is set: promoting LOAD_MODE=view to materialized.")
+        load_mode = "materialized"
+
+    fingerprint = source_fingerprint(nodes_path, edges_path, load_mode, property_graph)
+
+    if os.path.exists(db_path):
+        # DuckDB shares one database instance per file path within a process,
+        # so open the file DB_PATH currently points at, not the link itself.
+        conn = duckdb.connect(os.path.realpath(db_path), read_only=True)
+        if _stored_fingerprint(conn) == fingerprint:
+            print(f"Attached existing database {db_path} (fingerprint match).")
+            if property_graph:
+                load_extension(conn)
+            return conn
+        conn.close()
+        print(f"Database {db_path} is stale, rebuilding...")
+    else:
+        print(f"Database {db_path} not found, building...")
+
+    started = time.perf_counter()
+
+    # Every build goes to its own file and DB_PATH is switched over as a
+    # symlink. A reload in a running process then opens a new path (the
+    # previous build may still be serving requests), and a crash never leaves
+    # a half-written file that looks valid.
+    build_path = f"{db_path}.{hashlib.sha256(fingerprint.encode()).hexdigest()[:12]}"
+    tmp_path = f"{build_path}.tmp"
+    for path in [tmp_path, f"{tmp_path}.wal"]:
+        if os.path.exists(path):
+            os.remove(path)
+
+    conn = duckdb.connect(tmp_path)
+    _create_tables(conn, nodes_path, edges_path, load_mode)
+    graph = AdjacencyIndex.from_connection(conn)
+    graph.save(conn)
+    if analytics.enabled():
+        GraphAnalytics.from_graph(graph, analytics.damping()).save(conn, analytics.damping())
+    if property_graph:
+        create_property_graph(conn)
+    conn.execute(f"CREATE SCHEMA IF NOT EXISTS {INDEX_SCHEMA}")
+    conn.execute(f"CREATE OR REPLACE TABLE {INDEX_SCHEMA}.meta (key VARCHAR, value VARCHAR)")
+    conn.execute(f"INSERT INTO {INDEX_SCHEMA}.meta VALUES ('fingerprint', ?)", [fingerprint])
+    conn.execute("CHECKPOINT")
+    conn.close()
+    os.replace(tmp_path, build_path)
+
+    previous = os.path.realpath(db_path) if os.path.islink(db_path) else None
+    link_path = f"{db_path}.link"
+    if os.path.lexists(link_path):
+        os.remove(link_path)
+    os.symlink(os.path.basename(build_path), link_path)
+    os.replace(link_path, db_path)
+    if previous and previous != os.path.realpath(build_path) and os.path.exists(previous):
+        # Processes still attached keep reading their open file handle
+        os.remove(previous)
+
+    print(f"Database {db_path} built in {time.perf_counter() - started:.3f}s.")
+    conn = duckdb.connect(os.path.realpath(db_path), read_only=True)
+    if property_graph:
+        load_extension(conn)
+    return conn
+
+def _stored_fingerprint(conn: duckdb.DuckDBPyConnection):
+    try:
+        row = conn.execute(f"SELECT value FROM {INDEX_SCHEMA}.meta WHERE key = 'fingerprint'").fetchone()
+    except duckdb.CatalogException:
+        return None
+    return row[0] if row else None
+
+def source_fingerprint(nodes_path: str, edges_path: str, load_mode: str, property_graph: bool = False) -> str:
+    """
+    Identify a dataset version by the size, mtime and Parquet footer hash of
+    its input files, plus the settings that shape the persistent database.
+    """
+    return json.dumps({
+        "format_version": DB_FORMAT_VERSION,
+        "load_mode": load_mode,
+        "property_graph": property_graph,
+        "nodes": _file_fingerprint(nodes_path),
+        "edges": _file_fingerprint(edges_path),
+    }, sort_keys=True)
+
+def _file_fingerprint(path: str):
+    files = input_files(path)
+    if not files:
+        raise FileNotFoundError(f"No Parquet files at {path}")
+    if not is_multi_file(path):
+        return _single_file_fingerprint(files[0])
+    # Adding, removing or rewriting any part changes the fingerprint
+    return {f: _single_file_fingerprint(f) for f in files}
+
+def _single_file_fingerprint(path: str) -> dict:
+    stat = os.stat(path)
+    return {
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "footer_sha256": _parquet_footer_hash(path),
+    }
+
+def _parquet_footer_hash(path: str) -> str:
+    # Parquet ends with <footer><4-byte little-endian footer length>"PAR1".
+    # The footer holds schema, row-group offsets and statistics, so it changes
+    # whenever the content does without having to hash the whole file.
+    with open(path, "rb") as f:
+        f.seek(-8, os.SEEK_END)
+        footer_len, magic = struct.unpack("<I4s", f.read(8))
+        if magic != b"PAR1":
+            raise ValueError(f"{path} is not a Parquet file")
+        f.seek(-8 - footer_len, os.SEEK_END)
+        return hashlib.sha256(f.read(footer_len)).hexdigest()
+
+def build_optimized(
+    out_dir: str,
+    row_group_size: int = BUILD_ROW_GROUP_SIZE,
+    compression: str = BUILD_COMPRESSION,
+    partition_nodes: bool = False,
+    sample: int = 1000,
+):
+    """
+    Rewrite the current inputs into Parquet clustered for row-group skipping:
+    nodes sorted by id, edges sorted by source_id, and a second edge copy
+    sorted by target_id. Point DATA_DIR at `out_dir` to serve from it.
+    Prints how many row groups a point lookup can skip before and after.
+    """
+    paths = data_paths()
+    for table in ["nodes", "edges"]:
+        if not input_files(paths[table]):
+            raise FileNotFoundError(f"{table} input not found at {paths[table]}")
+    if os.path.realpath(out_dir) == os.path.realpath(os.environ.get("DATA_DIR", "data")):
+        raise ValueError("Output directory must differ from DATA_DIR")
+    os.makedirs(out_dir, exist_ok=True)
+    started = time.perf_counter()
+
+    outputs = {
+        "nodes": os.path.join(out_dir, "nodes" if partition_nodes else "nodes.parquet"),
+        "edges": os.path.join(out_dir, "edges.parquet"),
+        EDGES_BY_TARGET: os.path.join(out_dir, f"{EDGES_BY_TARGET}.parquet"),
+    }
+
+    conn = duckdb.connect(":memory:")
+    options = f"FORMAT PARQUET, COMPRESSION {compression}, ROW_GROUP_SIZE {int(row_group_size)}"
+    for table, source, key, target in [
+        ("nodes", paths["nodes"], "id", outputs["nodes"]),
+        ("edges", paths["edges"], "source_id", outputs["edges"]),
+        (EDGES_BY_TARGET, paths["edges"], "target_id", outputs[EDGES_BY_TARGET]),
+    ]:
+        print(f"Writing {target} sorted by {key}...")
+        extra = ", PARTITION_BY (node_type), OVERWRITE_OR_IGNORE" if table == "nodes" and partition_nodes else ""
+        conn.execute(f"COPY (SELECT * FROM {parquet_source(source)} ORDER BY {key}) TO '{target}' ({options}{extra})")
+    print(f"Optimized inputs written to {out_dir} in {time.perf_counter() - started:.3f}s.")
+
+    if partition_nodes:
+        outputs["nodes"] = os.path.join(outputs["nodes"], "**", "*.parquet")
+
+    print(f"Row groups skipped per point lookup ({sample} sampled keys):")
+    for label, before, after, column in [
+        ("nodes.id", paths["nodes"], outputs["nodes"], "id"),
+        ("edges.source_id", paths["edges"], outputs["edges"], "source_id"),
+        ("edges.target_id", paths["edges"], outputs[EDGES_BY_TARGET], "target_id"),
+    ]:
+        keys = conn.execute(
+            f"SELECT {column} FROM {parquet_source(before)} WHERE {column} IS NOT NULL "
+            f"USING SAMPLE reservoir({int(sample)} ROWS) REPEATABLE (42)"
+        ).fetchnumpy()[column]
+        old = row_group_skips(conn, before, column, keys)
+        new = row_group_skips(conn, after, column, keys)
+        print(
+            f"  {label:<16} before: {old['skipped']:.1f} of {old['row_groups']} ({old['ratio']:.1%})"
+            f"   after: {new['skipped']:.1f} of {new['row_groups']} ({new['ratio']:.1%})"
+        )
+    conn.close()
+
+def row_group_skips(conn: duckdb.DuckDBPyConnection, path: str, column: str, keys) -> dict:
+    """
+    Average number of row groups whose min/max statistics for `column`
+    exclude a lookup key, over `keys`. Row groups without statistics always
+    have to be read.
+    """
+    stats = conn.execute(
+        f"""
+        SELECT TRY_CAST(stats_min_value AS BIGINT) AS lo, TRY_CAST(stats_max_value AS BIGINT) AS hi
+        FROM parquet_metadata(?)
+        WHERE path_in_schema = ?
+        """,
+        [path, column]
+    ).fetchnumpy()
+    total = len(stats["lo"])
+    if total == 0 or len(keys) == 0:
+        return {"row_groups": total, "skipped": 0.0, "ratio": 0.0}
+
+    lo = np.ma.filled(np.ma.asarray(stats["lo"], dtype=np.float64), -np.inf)
+    hi = np.ma.filled(np.ma.asarray(stats["hi"], dtype=np.float64), np.inf)
+    # A key must read every row group whose [lo, hi] range contains it
+    keys = np.sort(np.asarray(keys, dtype=np.float64))
+    read = (np.searchsorted(keys, hi, side="right") - np.searchsorted(keys, lo, side="left")).sum()
+    skipped = total - read / len(keys)
+    return {"row_groups": total, "skipped": float(skipped), "ratio": float(skipped / total)}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m src.loader")
+    commands = parser.add_subparsers(dest="command")
+    build = commands.add_parser("build", help="Rewrite the inputs into Parquet clustered for row-group skipping")
+    build.add_argument("--out", default=None, help="Output directory (default: <DATA_DIR>/optimized)")
+    build.add_argument("--row-group-size", type=int, default=BUILD_ROW_GROUP_SIZE)
+    build.add_argument("--compression", default=BUILD_COMPRESSION)
+    build.add_argument("--partition-nodes", action="store_true", help="Write nodes/ Hive-partitioned by node_type")
+    build.add_argument("--sample", type=int, default=1000, help="Keys sampled for the skip report")
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        out_dir = args.out or os.path.join(os.environ.get("DATA_DIR", "data"), "optimized")
+        build_optimized(out_dir, args.row_group_size, args.compression, args.partition_nodes, args.sample)
+    else:
+        load_data()
+
+if __name__ == "__main__":
+    main()
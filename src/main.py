@@ -1,28 +1,40 @@
 import contextlib
-from fastapi import FastAPI
-from src.loader import load_data
+import os
+import threading
+from fastapi import FastAPI, Response
 from src.api import router as api_router
-from src import deps
+from src import deps, metrics
 
 @contextlib.asynccontextmanager
 async def lifespan(app: FastAPI):
     print("Startup: Loading Data...")
-    # Initialize the singleton connection
-    # In simpler model, load_data returns connection, we store it in deps? 
-    # Actually deps.py has lazy loading. 
-    # But for startup verification:
-    
-    # We can force load here. 
-    # But deps.py handles singleton `get_db`.
-    # Let's ensure it's loaded.
-    deps.get_db()
+    # Load the dataset up front (connection, pool, adjacency, degrees,
+    # search index, catalog) so the first request isn't a cold build.
+    deps.get_current_dataset()
+    deps.get_executor()
+
+    # Optional file watcher on DATA_DIR for nightly snapshot refreshes
+    stop_watching = threading.Event()
+    interval = float(os.environ.get("RELOAD_POLL_SECONDS", "0"))
+    if interval > 0:
+        threading.Thread(
+            target=deps.watch_data_dir, args=(interval, stop_watching), daemon=True, name="data-dir-watcher"
+        ).start()
     
     yield
     print("Shutdown: Closing connection...")
-    if deps._db_connection:
-        deps._db_connection.close()
+    stop_watching.set()
+    deps.close_executor()
+    deps.close_dataset()
 
 app = FastAPI(title="Yata Graph API", description="Parquet-backed Graph API", version="0.1.0", lifespan=lifespan)
 
 app.include_router(api_router, prefix="/api/v1")
 
+@app.get("/metrics", include_in_schema=False)
+async def get_metrics():
+    """
+    Prometheus scrape endpoint: per-route request, query, conversion and
+    serialization histograms plus startup phase durations.
+    """
+    return Response(metrics.render(), media_type=metrics.CONTENT_TYPE)
@@ -0,0 +1,242 @@
+import bisect
+import contextlib
+import contextvars
+import functools
+import inspect
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+from fastapi import HTTPException
+from fastapi.exceptions import RequestValidationError
+from fastapi.routing import APIRoute
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Latency buckets (seconds), from cached point lookups up to the heavy-lane timeout
+SECONDS_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+ROWS_BUCKETS = (0, 1, 10, 100, 1000, 10000, 100000, 1000000)
+
+# Route template of the request being handled. Executor lanes run with a copy
+# of the request's context, so query timings below the endpoint find it too.
+current_route: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("current_route", default=None)
+# Per-request slot the endpoint wrapper stamps with the time it returned
+# ("returned"), and where results encoded by the endpoint itself note that
+# serialization is already recorded ("serialized")
+_endpoint_timing: contextvars.ContextVar[Optional[dict]] = contextvars.ContextVar("endpoint_timing", default=None)
+
+
+class Histogram:
+    """
+    Prometheus histogram with a fixed label set. observe() is one bisect and
+    a few increments under a lock, cheap enough for the request path.
+    """
+
+    def __init__(self, name: str, help: str, buckets: Tuple[float, ...], labels: Tuple[str, ...]):
+        self.name = name
+        self.help = help
+        self.buckets = tuple(buckets)
+        self.labels = tuple(labels)
+        self._lock = threading.Lock()
+        # label values -> [per-bucket counts (+Inf last), sum]
+        self._series: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, value: float, *label_values: str):
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][bisect.bisect_left(self.buckets, value)] += 1
+            series[1] += value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            snapshot = [(key, list(counts), total) for key, (counts, total) in self._series.items()]
+        for key, counts, total in sorted(snapshot):
+            labels = _labels(self.labels, key)
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(float(bound))
+                lines.append(f'{self.name}_bucket{{{labels}{"," if labels else ""}le="{le}"}} {cumulative}')
+            lines.append(f"{self.name}_sum{{{labels}}} {total!r}")
+            lines.append(f"{self.name}_count{{{labels}}} {cumulative}")
+        return lines
+
+
+class Gauge:
+    """
+    Prometheus gauge with a fixed label set; each series holds its last value.
+    """
+
+    def __init__(self, name: str, help: str, labels: Tuple[str, ...]):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self._lock = threading.Lock()
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def set(self, value: float, *label_values: str):
+        with self._lock:
+            self._values[label_values] = value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} gauge"]
+        with self._lock:
+            snapshot = sorted(self._values.items())
+        for key, value in snapshot:
+            lines.append(f"{self.name}{{{_labels(self.labels, key)}}} {value!r}")
+        return lines
+
+
+def _labels(names: Tuple[str, ...], values: Tuple[str, ...]) -> str:
+    def escape(value: str) -> str:
+        return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+    return ",".join(f'{name}="{escape(value)}"' for name, value in zip(names, values))
+
+
+REQUEST_SECONDS = Histogram(
+    "yata_request_duration_seconds", "Time from routing to response headers, per route.",
+    SECONDS_BUCKETS, ("route", "method", "status"),
+)
+QUERY_SECONDS = Histogram(
+    "yata_query_duration_seconds", "DuckDB execution time of each query until its result is ready to fetch, per route.",
+    SECONDS_BUCKETS, ("route",),
+)
+QUERY_ROWS = Histogram(
+    "yata_query_rows", "Rows returned by each DuckDB query, per route.",
+    ROWS_BUCKETS, ("route",),
+)
+CONVERSION_SECONDS = Histogram(
+    "yata_conversion_duration_seconds", "Time fetching query results (DataFrame, numpy columns) and turning them into records, per route.",
+    SECONDS_BUCKETS, ("route",),
+)
+SERIALIZATION_SECONDS = Histogram(
+    "yata_serialization_duration_seconds", "Response model validation and JSON rendering after the endpoint returned, or direct JSON encoding by the endpoint (FAST_JSON), per route.",
+    SECONDS_BUCKETS, ("route",),
+)
+STARTUP_PHASE_SECONDS = Gauge(
+    "yata_startup_phase_seconds", "Duration of each phase of the most recent dataset load.",
+    ("phase",),
+)
+
+METRICS = [REQUEST_SECONDS, QUERY_SECONDS, QUERY_ROWS, CONVERSION_SECONDS, SERIALIZATION_SECONDS, STARTUP_PHASE_SECONDS]
+
+
+def render() -> str:
+    """
+    All metrics in the Prometheus text exposition format.
+    """
+    return "\n".join(line for metric in METRICS for line in metric.render()) + "\n"
+
+
+def observe(histogram: Histogram, value: float):
+    """
+    Record `value` for the current route; a no-op outside a request.
+    """
+    route = current_route.get()
+    if route is not None:
+        histogram.observe(value, route)
+
+
+@contextlib.contextmanager
+def timed(histogram: Histogram):
+    """
+    Record the duration of the block for the current route.
+    """
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(histogram, time.perf_counter() - started)
+
+
+def serialized(seconds: float):
+    """
+    Record a response body the endpoint encoded itself, instead of the time
+    from its return to the response.
+    """
+    observe(SERIALIZATION_SECONDS, seconds)
+    timing = _endpoint_timing.get()
+    if timing is not None:
+        timing["serialized"] = True
+
+
+@contextlib.contextmanager
+def phase(name: str):
+    """
+    Record the duration of a startup phase.
+    """
+    started = time.perf_counter()
+    yield
+    STARTUP_PHASE_SECONDS.set(time.perf_counter() - started, name)
+
+
+class InstrumentedRoute(APIRoute):
+    """
+    APIRoute that records request latency per route template and the time
+    spent serializing after the endpoint returned, and exposes the route to
+    metrics recorded further down (queries, conversions).
+    """
+
+    def __init__(self, path: str, endpoint: Callable, **kwargs):
+        super().__init__(path, _stamp_return(endpoint), **kwargs)
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+
+        async def instrumented(request):
+            route = self._template(request)
+            timing = {}
+            route_token = current_route.set(route)
+            timing_token = _endpoint_timing.set(timing)
+            started = time.perf_counter()
+            status = 500
+            try:
+                response = await handler(request)
+                status = response.status_code
+                return response
+            except HTTPException as e:
+                status = e.status_code
+                raise
+            except RequestValidationError:
+                status = 422
+                raise
+            finally:
+                finished = time.perf_counter()
+                if "returned" in timing and not timing.get("serialized") and status < 500:
+                    SERIALIZATION_SECONDS.observe(finished - timing["returned"], route)
+                REQUEST_SECONDS.observe(finished - started, route, request.method, str(status))
+                _endpoint_timing.reset(timing_token)
+                current_route.reset(route_token)
+
+        return instrumented
+
+    def _template(self, request) -> str:
+        # Routes of an included router only know their own path, not the prefix
+        suffix = self.path_format.format(**request.path_params)
+        path = request.scope.get("path", "")
+        prefix = path[:len(path) - len(suffix)] if path.endswith(suffix) else ""
+        return prefix + self.path
+
+
+def _stamp_return(endpoint: Callable) -> Callable:
+    # functools.wraps keeps the signature FastAPI reads dependencies from
+    def stamp():
+        timing = _endpoint_timing.get()
+        if timing is not None:
+            timing["returned"] = time.perf_counter()
+
+    if inspect.iscoroutinefunction(endpoint):
+        @functools.wraps(endpoint)
+        async def stamped(*args, **kwargs):
+            result = await endpoint(*args, **kwargs)
+            stamp()
+            return result
+    else:
+        @functools.wraps(endpoint)
+        def stamped(*args, **kwargs):
+            result = endpoint(*args, **kwargs)
+            stamp()
+            return result
+    return stamped
@@ -0,0 +1,203 @@
+import re
+import duckdb
+from typing import Any, Dict, List, Optional, Tuple
+from src.catalog import Catalog
+
+# Name of the SQL/PGQ property graph defined over nodes/edges
+PROPERTY_GRAPH_NAME = "yata_graph"
+
+# Upper bound for variable-length quantifiers ({m,n}) in MATCH patterns
+MAX_MATCH_HOPS = 5
+
+# Upper bound for rows returned by one MATCH query
+MAX_MATCH_ROWS = 1000
+
+# Path functions allowed in COLUMNS for path variables (p = ANY SHORTEST ...)
+PATH_FUNCTIONS = ["path_length", "vertices", "edges"]
+
+# Label of each table inside the property graph
+LABELS = {"nodes": "nodes", "edges": "edges"}
+
+_TOKEN = re.compile(r"\s+|->|<-|[A-Za-z_][A-Za-z0-9_]*|\d+|[()\[\]{}:,=\-]")
+_COLUMN = re.compile(r"^([A-Za-z_][A-Za-z0-9_]*)\.([A-Za-z_][A-Za-z0-9_]*)$")
+_FUNCTION = re.compile(r"^([a-z_]+)\(([A-Za-z_][A-Za-z0-9_]*)\)$")
+
+
+class PatternError(ValueError):
+    """
+    A MATCH request that is malformed or outside the allowed bounds.
+    """
+
+
+def create_property_graph(conn: duckdb.DuckDBPyConnection):
+    """
+    Load the duckpgq extension and define the property graph over the
+    `nodes` and `edges` tables. The Dockerfile pre-installs the extension;
+    elsewhere it is installed from the community repository on first use.
+    """
+    load_extension(conn)
+    print(f"Creating property graph {PROPERTY_GRAPH_NAME} over nodes/edges...")
+    conn.execute(f"""
+        CREATE OR REPLACE PROPERTY GRAPH {PROPERTY_GRAPH_NAME}
+        VERTEX TABLES (nodes LABEL {LABELS['nodes']})
+        EDGE TABLES (
+            edges SOURCE KEY (source_id) REFERENCES nodes (id)
+                  DESTINATION KEY (target_id) REFERENCES nodes (id)
+                  LABEL {LABELS['edges']}
+        )
+    """)
+
+def load_extension(conn: duckdb.DuckDBPyConnection):
+    try:
+        conn.execute("LOAD duckpgq")
+    except duckdb.Error:
+        conn.execute("INSTALL duckpgq FROM community")
+        conn.execute("LOAD duckpgq")
+
+
+class MatchQuery:
+    """
+    Compiles bounded SQL/PGQ MATCH requests into GRAPH_TABLE queries.
+
+    Patterns are accepted only as a restricted token stream: variables,
+    labels, edge arrows, bounded {m,n} quantifiers and ANY SHORTEST. There
+    are no literals in the pattern itself; filters are equality conditions
+    passed as query parameters, and COLUMNS entries are checked against the
+    catalog, so request text never reaches the SQL parser unchecked.
+    """
+
+    def __init__(self, catalog: Catalog, name: str = PROPERTY_GRAPH_NAME):
+        self.name = name
+        self.node_columns = catalog.column_names("nodes")
+        self.edge_columns = catalog.column_names("edges")
+
+    def compile(
+        self,
+        pattern: str,
+        columns: Optional[List[str]] = None,
+        where: Optional[Dict[str, Any]] = None,
+        limit: int = 100,
+    ) -> Tuple[str, List[Any], List[str]]:
+        """
+        Returns (sql, params, output column names).
+        """
+        node_vars, edge_vars, path_vars = _parse_pattern(pattern)
+        if not 1 <= limit <= MAX_MATCH_ROWS:
+            raise PatternError(f"limit must be between 1 and {MAX_MATCH_ROWS}")
+
+        conditions = []
+        params = []
+        for ref, value in (where or {}).items():
+            conditions.append(f"{self._column(ref, node_vars, edge_vars)} = ?")
+            params.append(value)
+
+        if not columns:
+            columns = [f"{var}.id" for var in node_vars + edge_vars]
+            columns += [f"path_length({var})" for var in path_vars]
+        if not columns:
+            raise PatternError("Pattern has no variables to return")
+
+        select = []
+        for spec in columns:
+            function = _FUNCTION.match(spec)
+            if function:
+                name, var = function.groups()
+                if name not in PATH_FUNCTIONS or var not in path_vars:
+                    raise PatternError(f"Invalid column: {spec}")
+                expr = f"{name}({var})"
+            else:
+                expr = self._column(spec, node_vars, edge_vars)
+            select.append(f'{expr} AS "{spec}"')
+
+        where_clause = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        sql = (
+            f"SELECT * FROM GRAPH_TABLE ({self.name} "
+            f"MATCH {pattern} {where_clause} "
+            f"COLUMNS ({', '.join(select)})) LIMIT ?"
+        )
+        params.append(limit)
+        return sql, params, list(columns)
+
+    def _column(self, ref: str, node_vars: List[str], edge_vars: List[str]) -> str:
+        match = _COLUMN.match(ref)
+        if not match:
+            raise PatternError(f"Invalid column reference: {ref}")
+        var, column = match.groups()
+        if var in node_vars:
+            valid = self.node_columns
+        elif var in edge_vars:
+            valid = self.edge_columns
+        else:
+            raise PatternError(f"Unknown variable in {ref}")
+        if column not in valid:
+            raise PatternError(f"Invalid column: {ref}")
+        return f"{var}.{column}"
+
+
+def _parse_pattern(pattern: str) -> Tuple[List[str], List[str], List[str]]:
+    """
+    Validate a MATCH pattern and return its (node, edge, path) variables.
+    """
+    tokens = []
+    pos = 0
+    while pos < len(pattern):
+        match = _TOKEN.match(pattern, pos)
+        if not match:
+            raise PatternError(f"Unexpected character {pattern[pos]!r} in pattern")
+        if not match.group().isspace():
+            tokens.append(match.group())
+        pos = match.end()
+    if not tokens:
+        raise PatternError("Empty pattern")
+
+    node_vars, edge_vars, path_vars = [], [], []
+    depth = {"(": 0, "[": 0}
+    closing = {")": "(", "]": "["}
+    i = 0
+    while i < len(tokens):
+        token = tokens[i]
+        prev = tokens[i - 1] if i else None
+        nxt = tokens[i + 1] if i + 1 < len(tokens) else None
+
+        if token in depth:
+            depth[token] += 1
+        elif token in closing:
+            depth[closing[token]] -= 1
+            if depth[closing[token]] < 0:
+                raise PatternError("Unbalanced brackets in pattern")
+        elif token == "{":
+            # Bounded quantifier: {n} or {m,n}, n <= MAX_MATCH_HOPS
+            end = tokens.index("}", i) if "}" in tokens[i:] else -1
+            body = tokens[i + 1:end] if end > 0 else []
+            if not (body and all(t.isdigit() or t == "," for t in body)) or body[-1] == "," or body.count(",") > 1:
+                raise PatternError("Quantifiers must be bounded, e.g. {1,3}")
+            if int(body[-1]) > MAX_MATCH_HOPS:
+                raise PatternError(f"Quantifier upper bound exceeds {MAX_MATCH_HOPS}")
+            i = end + 1
+            continue
+        elif token.upper() in ["ANY", "SHORTEST"]:
+            pass
+        elif token.isidentifier():
+            if prev == ":":
+                if token not in LABELS.values():
+                    raise PatternError(f"Unknown label: {token}")
+            elif prev == "(":
+                node_vars.append(token)
+            elif prev == "[":
+                edge_vars.append(token)
+            elif nxt == "=" and prev in [None, ","]:
+                path_vars.append(token)
+            else:
+                raise PatternError(f"Unexpected identifier {token!r} in pattern")
+        elif token.isdigit():
+            # Digits only appear inside quantifiers
+            raise PatternError(f"Unexpected number {token!r} in pattern")
+        i += 1
+
+    if any(depth.values()):
+        raise PatternError("Unbalanced brackets in pattern")
+    # A node variable may repeat (cycles), but a name can only have one kind
+    node_vars, edge_vars, path_vars = [list(dict.fromkeys(v)) for v in [node_vars, edge_vars, path_vars]]
+    if len(node_vars + edge_vars + path_vars) != len(set(node_vars + edge_vars + path_vars)):
+        raise PatternError("A variable cannot name both a node, an edge or a path")
+    return node_vars, edge_vars, path_vars
@@ -0,0 +1,110 @@
+import contextlib
+import queue
+import threading
+import time
+import duckdb
+from typing import Optional
+
+
+class PoolTimeout(Exception):
+    """
+    Raised when no cursor becomes available within the acquire timeout.
+    """
+
+
+class CursorPool:
+    """
+    Bounded pool of DuckDB cursors sharing one database.
+
+    `conn.cursor()` returns an independent connection to the same database,
+    so each checked-out cursor can run a query concurrently with the others
+    without sharing result state. Requests check a cursor out for their
+    lifetime and hand it back afterwards.
+    """
+
+    def __init__(self, conn: duckdb.DuckDBPyConnection, size: int = 8, timeout: Optional[float] = 30.0):
+        if size < 1:
+            raise ValueError("Pool size must be at least 1")
+
+        self.size = size
+        self.timeout = timeout
+        # LIFO keeps recently used (warm) cursors in rotation
+        self._idle = queue.LifoQueue(maxsize=size)
+        for _ in range(size):
+            self._idle.put(conn.cursor())
+
+        self._lock = threading.Lock()
+        self._in_use = 0
+        self._peak_in_use = 0
+        self._acquired = 0
+        self._waited = 0
+        self._timeouts = 0
+        self._wait_seconds_total = 0.0
+        self._wait_seconds_max = 0.0
+
+    @contextlib.contextmanager
+    def acquire(self, timeout: Optional[float] = None):
+        """
+        Check a cursor out of the pool, blocking up to `timeout` seconds
+        (defaults to the pool timeout) when every cursor is busy.
+        """
+        timeout = self.timeout if timeout is None else timeout
+        started = time.perf_counter()
+
+        waited = False
+        try:
+            cursor = self._idle.get_nowait()
+        except queue.Empty:
+            waited = True
+            try:
+                cursor = self._idle.get(timeout=timeout)
+            except queue.Empty:
+                with self._lock:
+                    self._waited += 1
+                    self._timeouts += 1
+                raise PoolTimeout(f"No database cursor available within {timeout}s")
+
+        wait = time.perf_counter() - started
+        with self._lock:
+            self._acquired += 1
+            self._in_use += 1
+            self._peak_in_use = max(self._peak_in_use, self._in_use)
+            if waited:
+                self._waited += 1
+            self._wait_seconds_total += wait
+            self._wait_seconds_max = max(self._wait_seconds_max, wait)
+
+        try:
+            yield cursor
+        finally:
+            with self._lock:
+                self._in_use -= 1
+            self._idle.put(cursor)
+
+    def stats(self) -> dict:
+        """
+        Snapshot of pool size, utilisation, wait time and saturation counters.
+        `saturated` counts acquisitions that found no idle cursor.
+        """
+        with self._lock:
+            return {
+                "size": self.size,
+                "in_use": self._in_use,
+                "peak_in_use": self._peak_in_use,
+                "acquired": self._acquired,
+                "saturated": self._waited,
+                "timeouts": self._timeouts,
+                "wait_seconds_total": self._wait_seconds_total,
+                "wait_seconds_max": self._wait_seconds_max,
+                "wait_seconds_avg": self._wait_seconds_total / self._acquired if self._acquired else 0.0,
+            }
+
+    def close(self):
+        """
+        Close idle cursors. Cursors still checked out are closed with the parent connection.
+        """
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
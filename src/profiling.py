@@ -0,0 +1,178 @@
+import contextlib
+import contextvars
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional
+import duckdb
+from src import metrics
+
+# Operator fields kept from DuckDB's JSON profile (names differ across DuckDB versions)
+OPERATOR_FIELDS = [
+    "operator_name", "operator_type", "operator_timing", "operator_cardinality", "operator_rows_scanned",
+    "name", "timing", "cardinality", "extra_info",
+]
+QUERY_FIELDS = ["latency", "rows_returned", "cumulative_rows_scanned", "cumulative_cardinality", "total_bytes_read", "cpu_time"]
+# Longest SQL text kept in profiles and slow-query log entries
+MAX_SQL_CHARS = 2000
+
+# Profile of the request being handled, if it asked for one
+current_profile: contextvars.ContextVar[Optional["Profile"]] = contextvars.ContextVar("current_profile", default=None)
+
+_log_lock = threading.Lock()
+
+
+class Profile:
+    """
+    Profiling output of one request: the DuckDB operator tree of each query
+    it ran plus where the Python side spent its time.
+    """
+
+    def __init__(self):
+        self.queries: List[Dict[str, Any]] = []
+        self.phases: Dict[str, float] = {}
+        self.started = time.perf_counter()
+        self._pending = None
+
+    def add_phase(self, name: str, seconds: float):
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def executed(self, conn: duckdb.DuckDBPyConnection, sql: str, seconds: float):
+        """
+        Note a query whose plan is read once its result has been fetched;
+        DuckDB finalizes the profile (latency, root cardinality) only then.
+        """
+        self.flush()
+        self._pending = (conn, sql, seconds)
+
+    def flush(self):
+        if self._pending is None:
+            return
+        conn, sql, seconds = self._pending
+        self._pending = None
+        try:
+            plan = _compact(json.loads(conn.get_profiling_information(format="json")), QUERY_FIELDS)
+        except (duckdb.Error, ValueError) as e:
+            plan = {"error": str(e)}
+        self.queries.append({"sql": sql[:MAX_SQL_CHARS], "seconds": seconds, "plan": plan})
+
+    def to_dict(self) -> dict:
+        self.flush()
+        return {
+            "total_seconds": time.perf_counter() - self.started,
+            "phases": dict(self.phases),
+            "queries": self.queries,
+        }
+
+
+def _compact(node: dict, fields: List[str]) -> dict:
+    out = {key: node[key] for key in fields if key in node}
+    children = node.get("children") or []
+    if children:
+        out["children"] = [_compact(child, OPERATOR_FIELDS) for child in children]
+    return out
+
+
+def enabled() -> bool:
+    """
+    Whether requests may ask for profiles (QUERY_PROFILING=1). Profiles expose
+    SQL and plan details, so this is off by default.
+    """
+    return os.environ.get("QUERY_PROFILING", "0") == "1"
+
+
+@contextlib.contextmanager
+def profiled(conn: duckdb.DuckDBPyConnection):
+    """
+    Profile every query run on `conn` (a pooled cursor; the setting is
+    per cursor) within the block. Yields the Profile being filled.
+    """
+    profile = Profile()
+    token = current_profile.set(profile)
+    conn.execute("SET enable_profiling = 'no_output'")
+    try:
+        yield profile
+    finally:
+        profile.flush()
+        conn.execute("RESET enable_profiling")
+        current_profile.reset(token)
+
+
+@contextlib.contextmanager
+def phase(name: str):
+    """
+    Attribute the block's duration to `name` in the active profile, if any.
+    """
+    profile = current_profile.get()
+    if profile is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile.add_phase(name, time.perf_counter() - started)
+
+
+def execute(conn: duckdb.DuckDBPyConnection, sql: str, params=None) -> duckdb.DuckDBPyConnection:
+    """
+    conn.execute() with instrumentation: execution time goes to the query
+    histogram and the active profile (with the operator tree), and queries
+    slower than SLOW_QUERY_SECONDS are written to the slow-query log.
+    """
+    profile = current_profile.get()
+    if profile is not None:
+        # The previous query on this cursor has been consumed by now
+        profile.flush()
+    started = time.perf_counter()
+    try:
+        return conn.execute(sql, params) if params is not None else conn.execute(sql)
+    finally:
+        seconds = time.perf_counter() - started
+        metrics.observe(metrics.QUERY_SECONDS, seconds)
+        if profile is not None:
+            profile.add_phase("query", seconds)
+            profile.executed(conn, sql, seconds)
+        threshold = float(os.environ.get("SLOW_QUERY_SECONDS", "1"))
+        if 0 < threshold <= seconds:
+            log_slow_query(sql, params, seconds)
+
+
+def flush():
+    """
+    Read the plan of the last query into the active profile now, once its
+    result is consumed and before other statements run on the cursor.
+    """
+    profile = current_profile.get()
+    if profile is not None:
+        profile.flush()
+
+
+def log_slow_query(sql: str, params, seconds: float):
+    """
+    One JSON line per slow query, appended to SLOW_QUERY_LOG or printed.
+    """
+    entry = json.dumps({
+        "event": "slow_query",
+        "ts": time.time(),
+        "route": metrics.current_route.get(),
+        "seconds": round(seconds, 6),
+        "sql": " ".join(sql.split())[:MAX_SQL_CHARS],
+        "params": len(params) if params is not None else 0,
+    })
+    path = os.environ.get("SLOW_QUERY_LOG")
+    if not path:
+        print(entry)
+        return
+    with _log_lock, open(path, "a") as f:
+        f.write(entry + "\n")
+
+
+@contextlib.contextmanager
+def conversion():
+    """
+    Time a result-to-records conversion for metrics and the active profile.
+    """
+    with metrics.timed(metrics.CONVERSION_SECONDS), phase("conversion"):
+        yield
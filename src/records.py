@@ -0,0 +1,165 @@
+import duckdb
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, List, Optional
+from src import metrics, profiling
+from src.analytics import GraphAnalytics
+from src.graph import AdjacencyIndex
+
+# Columns of the nodes table promoted to top-level Node fields
+NODE_FIELDS = ["id", "node_type", "display_name"]
+
+
+def column_to_list(values: np.ndarray) -> List[Any]:
+    """
+    Convert one fetchnumpy() column to a list of Python values.
+    NULLs (masked slots) and float NaN become None.
+    """
+    mask = np.ma.getmaskarray(values)
+    data = np.ma.getdata(values)
+
+    if data.dtype.kind in "mM":
+        # datetime64/timedelta64 .tolist() yields raw integers at ns precision
+        data = data.astype(f"{data.dtype.str[1:2]}8[us]").astype(object)
+    elif data.dtype.kind == "f":
+        mask = mask | np.isnan(data)
+
+    out = data.tolist()
+    if mask.any():
+        for i in np.flatnonzero(mask).tolist():
+            out[i] = None
+    return out
+
+
+def columns_to_records(columns: Dict[str, np.ndarray]) -> List[Dict[str, Any]]:
+    """
+    Turn a dict of equal-length columns into row dicts, one column conversion at a time.
+    """
+    names = list(columns)
+    lists = [column_to_list(columns[name]) for name in names]
+    return [dict(zip(names, row)) for row in zip(*lists)]
+
+
+def fetch_by_ids(
+    conn: duckdb.DuckDBPyConnection,
+    table: str,
+    ids: np.ndarray,
+    filters: Optional[Dict[str, Any]] = None,
+) -> Dict[str, np.ndarray]:
+    """
+    Fetch the rows of `table` whose id is in `ids` as columns, reordered to
+    follow `ids`. Ids missing from the table are skipped; on duplicate ids
+    the first row wins. `filters` adds column equality conditions, which on
+    Hive-partitioned inputs (node_type=..., edge_type=...) prune whole files.
+
+    The ids are registered as a temporary relation on `conn` rather than bound
+    as a LIST parameter (binding 100k values costs more than the join), so
+    `conn` must not be shared with another thread for the duration of the
+    call; pooled request cursors satisfy this.
+    """
+    ids = np.asarray(ids, dtype=np.int64)
+    filters = {col: val for col, val in (filters or {}).items() if val is not None}
+    where = " AND ".join(f't."{col}" = ?' for col in filters)
+
+    conn.register("_requested_ids", pd.DataFrame({"id": ids}))
+    try:
+        result = profiling.execute(
+            conn,
+            f"SELECT t.* FROM {table} t SEMI JOIN _requested_ids r ON t.id = r.id"
+            + (f" WHERE {where}" if where else ""),
+            list(filters.values())
+        )
+        with profiling.conversion():
+            columns = result.fetchnumpy()
+        profiling.flush()
+    finally:
+        conn.unregister("_requested_ids")
+    metrics.observe(metrics.QUERY_ROWS, len(columns["id"]))
+
+    found = np.ma.getdata(columns["id"]).astype(np.int64)
+    if found.size == 0:
+        return {name: values[:0] for name, values in columns.items()}
+
+    uniq, first = np.unique(found, return_index=True)
+    pos = np.minimum(np.searchsorted(uniq, ids), len(uniq) - 1)
+    rows = first[pos[uniq[pos] == ids]]
+    return {name: values[rows] for name, values in columns.items()}
+
+
+def row_records(conn: duckdb.DuckDBPyConnection, table: str, ids: np.ndarray) -> List[Dict[str, Any]]:
+    """
+    Flat row dicts (as returned by /search) for `ids`, in the order of `ids`.
+    """
+    if len(ids) == 0:
+        return []
+    columns = fetch_by_ids(conn, table, ids)
+    with profiling.conversion():
+        return columns_to_records(columns)
+
+
+def node_records(
+    conn: duckdb.DuckDBPyConnection,
+    ids: np.ndarray,
+    node_type: Optional[str] = None,
+    analytics: Optional[GraphAnalytics] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Fetch Node-shaped dicts for `ids` in one query, returned in the order of `ids`.
+    Ids missing from the nodes table (or not of `node_type`, if given) are skipped.
+    With `analytics`, the nodes carry their pagerank / component fields.
+    """
+    if len(ids) == 0:
+        return []
+
+    columns = fetch_by_ids(conn, "nodes", ids, {"node_type": node_type})
+    with profiling.conversion():
+        return _node_dicts(columns, analytics)
+
+
+def _node_dicts(columns: Dict[str, np.ndarray], analytics: Optional[GraphAnalytics] = None) -> List[Dict[str, Any]]:
+    prop_names = [name for name in columns if name not in NODE_FIELDS]
+    node_ids = column_to_list(columns["id"])
+    node_types = column_to_list(columns["node_type"])
+    display_names = column_to_list(columns["display_name"])
+    props = [column_to_list(columns[name]) for name in prop_names]
+    if props:
+        properties = [dict(zip(prop_names, values)) for values in zip(*props)]
+    else:
+        properties = [{} for _ in node_ids]
+
+    if analytics is not None:
+        scores = analytics.fields(np.ma.getdata(columns["id"]))
+    else:
+        scores = dict.fromkeys(["pagerank", "component", "component_size"], [None] * len(node_ids))
+
+    # Every Node field is present, so results can be encoded without model validation
+    return [
+        {
+            "id": nid, "node_type": ntype, "display_name": name, "properties": prop,
+            "pagerank": rank, "component": component, "component_size": size,
+        }
+        for nid, ntype, name, prop, rank, component, size in zip(
+            node_ids, node_types, display_names, properties,
+            scores["pagerank"], scores["component"], scores["component_size"],
+        )
+    ]
+
+
+def edge_records(graph: AdjacencyIndex, edge_rows: np.ndarray) -> List[Dict[str, Any]]:
+    """
+    Edge-shaped dicts for rows of the adjacency index, gathered with array ops.
+    """
+    with profiling.conversion():
+        return _edge_dicts(graph, edge_rows)
+
+
+def _edge_dicts(graph: AdjacencyIndex, edge_rows: np.ndarray) -> List[Dict[str, Any]]:
+    return [
+        {"id": eid, "type": etype, "source": src, "target": tgt}
+        for eid, etype, src, tgt in zip(
+            graph.edge_ids[edge_rows].tolist(),
+            graph.edge_type_labels[graph.edge_type_codes[edge_rows]].tolist(),
+            graph.node_ids[graph.edge_src[edge_rows]].tolist(),
+            graph.node_ids[graph.edge_tgt[edge_rows]].tolist(),
+        )
+    ]
@@ -6,6 +6,9 @@ class Node(BaseModel):
     node_type: str = Field(..., description="Type of the node (e.g., officer, address)")
     display_name: Optional[str] = Field(None, description="Display name of the node")
     properties: Dict[str, Any] = Field(default_factory=dict, description="Additional properties of the node")
+    pagerank: Optional[float] = Field(None, description="PageRank score over directed edges (null when GRAPH_ANALYTICS=0)")
+    component: Optional[int] = Field(None, description="Weakly connected component, named by its smallest node id")
+    component_size: Optional[int] = Field(None, description="Number of nodes in the weakly connected component")
 
 class Edge(BaseModel):
     id: int = Field(..., description="Unique identifier for the edge")
@@ -16,6 +19,54 @@ class Edge(BaseModel):
 class NeighborsResponse(BaseModel):
     nodes: List[Node] = Field(..., description="List of neighbor nodes")
     edges: List[Edge] = Field(..., description="List of edges connecting the requested node and neighbors")
+    truncated: bool = Field(False, description="Whether a budget cut the result short")
+    next_cursor: Optional[str] = Field(None, description="Pass as `cursor` to fetch the next page")
+
+class PathResponse(BaseModel):
+    found: bool = Field(..., description="Whether a path within max_depth exists")
+    length: Optional[int] = Field(None, description="Number of hops in the path")
+    nodes: List[Node] = Field(..., description="Nodes along the path, from source to target")
+    edges: List[Edge] = Field(..., description="Edges along the path, in order")
+
+class MatchRequest(BaseModel):
+    pattern: str = Field(..., description="SQL/PGQ MATCH pattern, e.g. (a:nodes)-[e:edges]->{1,3}(b:nodes)")
+    where: Dict[str, Any] = Field(default_factory=dict, description="Equality filters keyed by variable.column")
+    columns: List[str] = Field(default_factory=list, description="Output columns: variable.column or path_length/vertices/edges(path variable)")
+    limit: int = Field(100, description="Maximum rows to return")
+
+class MatchResponse(BaseModel):
+    count: int = Field(..., description="Number of rows returned")
+    columns: List[str] = Field(..., description="Output column names")
+    results: List[Dict[str, Any]] = Field(..., description="Matched rows")
+
+class BatchGetRequest(BaseModel):
+    ids: List[int] = Field(..., max_length=5000, description="Node IDs to fetch")
+
+class BatchGetResponse(BaseModel):
+    count: int = Field(..., description="Number of requested nodes that were found")
+    data: Dict[int, Optional[Node]] = Field(..., description="Node per requested ID (null if not found)")
+
+class BatchNeighborsRequest(BaseModel):
+    ids: List[int] = Field(..., max_length=5000, description="Node IDs to expand")
+    depth: int = Field(1, ge=1, le=5, description="Number of hops")
+    direction: str = Field("both", description="Traversal direction: out, in or both")
+    max_fanout: Optional[int] = Field(None, ge=1, description="Max newly discovered nodes per hop")
+
+class BatchNeighborsResponse(BaseModel):
+    results: Dict[int, NeighborsResponse] = Field(..., description="Neighborhood per requested ID")
+
+class SubgraphRequest(BaseModel):
+    ids: List[int] = Field(..., max_length=5000, description="Seed node IDs")
+    depth: int = Field(0, ge=0, le=5, description="Hops to expand from the seeds (0: the subgraph induced by the seeds)")
+    direction: str = Field("both", description="Traversal direction: out, in or both")
+    node_types: Optional[List[str]] = Field(None, description="Only include nodes of these types (traversal passes through others)")
+    edge_types: Optional[List[str]] = Field(None, description="Only traverse and return edges of these types")
+    max_nodes: Optional[int] = Field(None, ge=1, description="Max nodes returned, seeds first then by hop; capped by the subgraph budget")
+
+class SubgraphResponse(BaseModel):
+    nodes: List[Node] = Field(..., description="Nodes of the subgraph, seeds first then in discovery order")
+    edges: List[Edge] = Field(..., description="Every edge between two returned nodes, in edge id order")
+    truncated: bool = Field(False, description="Whether a budget or max_nodes cut the subgraph short")
 
 class NodeResponse(BaseModel):
     count: int = Field(..., description="Number of nodes found (0 or 1)")
@@ -28,10 +79,24 @@ class NeighborsCountResponse(BaseModel):
     count: int = Field(..., description="Total count of neighbors")
     details: Dict[str, int] = Field(..., description="Breakdown of neighbor counts by node type")
 
+class NodeDegree(BaseModel):
+    node: Node = Field(..., description="Node details")
+    degree: int = Field(..., description="Number of edges in the requested direction")
+    in_degree: int = Field(..., description="Number of incoming edges")
+    out_degree: int = Field(..., description="Number of outgoing edges")
+
+class TopDegreeResponse(BaseModel):
+    count: int = Field(..., description="Number of nodes returned")
+    results: List[NodeDegree] = Field(..., description="Nodes ordered by degree, highest first")
+
 class ColumnInfo(BaseModel):
     name: str = Field(..., description="Column name")
     type: str = Field(..., description="Column data type")
     nullable: bool = Field(..., description="Whether the column can be NULL")
+    min: Optional[str] = Field(None, description="Smallest value per Parquet statistics")
+    max: Optional[str] = Field(None, description="Largest value per Parquet statistics")
+    null_count: Optional[int] = Field(None, description="Number of NULLs per Parquet statistics")
+    distinct_estimate: Optional[int] = Field(None, description="Approximate number of distinct values")
 
 class SchemaResponse(BaseModel):
     nodes: List[ColumnInfo] = Field(..., description="Schema definition for nodes table")
@@ -39,6 +104,57 @@ class SchemaResponse(BaseModel):
 
 class SearchResponse(BaseModel):
     count: int = Field(..., description="Number of results found")
+    total: Optional[int] = Field(None, description="Total number of matches across all pages, when known (indexed fuzzy search)")
     results: List[Dict[str, Any]] = Field(..., description="List of search results (nodes or edges)")
+    truncated: bool = Field(False, description="Whether a budget cut the search short")
+    next_cursor: Optional[str] = Field(None, description="Pass as `cursor` to fetch the next page")
+
+class PoolStats(BaseModel):
+    size: int = Field(..., description="Number of cursors in the pool")
+    in_use: int = Field(..., description="Cursors currently checked out")
+    peak_in_use: int = Field(..., description="Highest number of cursors checked out at once")
+    acquired: int = Field(..., description="Total successful checkouts")
+    saturated: int = Field(..., description="Checkouts that had to wait for a free cursor")
+    timeouts: int = Field(..., description="Checkouts that gave up waiting")
+    wait_seconds_total: float = Field(..., description="Total time spent waiting for a cursor")
+    wait_seconds_max: float = Field(..., description="Longest single wait for a cursor")
+    wait_seconds_avg: float = Field(..., description="Average wait per checkout")
+
+class CacheStats(BaseModel):
+    entries: int = Field(..., description="Entries currently cached")
+    bytes: int = Field(..., description="Approximate size of cached entries (JSON bytes)")
+    max_entries: int = Field(..., description="Entry limit")
+    max_bytes: int = Field(..., description="Byte budget")
+    hits: int = Field(..., description="Lookups answered from the cache")
+    misses: int = Field(..., description="Lookups that had to query the engine")
+    hit_ratio: float = Field(..., description="hits / (hits + misses)")
+    evictions: int = Field(..., description="Entries evicted to stay within bounds")
+    rejected: int = Field(..., description="Results too large to cache")
+
+class DatasetStats(BaseModel):
+    version: str = Field(..., description="Fingerprint of the input files being served")
+    loaded_at: float = Field(..., description="Unix time the dataset finished loading")
+    active_requests: int = Field(..., description="Requests currently pinned to this dataset")
+    reloads: int = Field(..., description="Completed reloads since startup")
+    reloading: bool = Field(..., description="Whether a replacement dataset is being built")
+
+class LaneStats(BaseModel):
+    workers: int = Field(..., description="Threads serving this lane")
+    timeout_seconds: Optional[float] = Field(None, description="Per-call timeout (null = none)")
+    queued: int = Field(..., description="Calls waiting for a lane thread")
+    submitted: int = Field(..., description="Calls submitted to the lane")
+    running: int = Field(..., description="Calls currently running")
+    completed: int = Field(..., description="Calls finished, including failures")
+    dropped: int = Field(..., description="Calls that timed out before starting")
+    timeouts: int = Field(..., description="Calls that exceeded the timeout")
+    queue_seconds_max: float = Field(..., description="Longest wait for a lane thread")
 
+class StatsResponse(BaseModel):
+    pool: PoolStats = Field(..., description="Database cursor pool metrics")
+    cache: CacheStats = Field(..., description="Hot-node result cache metrics")
+    dataset: DatasetStats = Field(..., description="Dataset version and reload state")
+    executor: Dict[str, LaneStats] = Field(..., description="Query executor metrics per lane ('point', 'heavy')")
 
+class ReloadResponse(BaseModel):
+    status: str = Field(..., description="'reloaded' or 'started'")
+    version: Optional[str] = Field(None, description="Version of the dataset now serving (when reloaded)")
@@ -0,0 +1,245 @@
+import time
+import duckdb
+import numpy as np
+from typing import Dict, List, Optional, Tuple
+
+# Queries shorter than this cannot be answered from trigram postings
+MIN_QUERY_BYTES = 3
+
+# Above this many candidate rows, substring confirmation scans the whole buffer
+VERIFY_PER_ROW_LIMIT = 4096
+
+# Bit layout of the (trigram, row) sort key: 24-bit trigram above a 39-bit row
+_ROW_BITS = 39
+_ROW_MASK = (1 << _ROW_BITS) - 1
+
+
+class TrigramIndex:
+    """
+    Case-insensitive substring index over one VARCHAR column.
+
+    Every lower-cased value is stored once in a single UTF-8 byte buffer.
+    Postings map each byte trigram to the sorted rows containing it, in CSR
+    form, so a `col ILIKE '%value%'` probe is an intersection of a few
+    posting lists instead of a scan over the whole table. Working on UTF-8
+    bytes keeps the index exact for non-ASCII text: a byte-level substring
+    match is a character-level one.
+    """
+
+    def __init__(
+        self,
+        column: str,
+        ids: np.ndarray,
+        buffer: bytes,
+        starts: np.ndarray,
+        lengths: np.ndarray,
+        trigrams: np.ndarray,
+        offsets: np.ndarray,
+        postings: np.ndarray,
+    ):
+        self.column = column
+        # Row -> node id, plus the row's slice of the text buffer
+        self.ids = ids
+        self.buffer = buffer
+        self.bytes = np.frombuffer(buffer, dtype=np.uint8)
+        self.starts = starts
+        self.lengths = lengths
+        # Sorted distinct trigrams and their posting lists (rows, ascending)
+        self.trigrams = trigrams
+        self.offsets = offsets
+        self.postings = postings
+
+    @classmethod
+    def build(cls, conn: duckdb.DuckDBPyConnection, column: str, table: str = "nodes") -> "TrigramIndex":
+        cols = conn.execute(
+            f'SELECT id, lower("{column}") AS text, strlen(lower("{column}")) AS nbytes '
+            f'FROM {table} WHERE "{column}" IS NOT NULL AND id IS NOT NULL'
+        ).fetchnumpy()
+        ids = np.asarray(cols["id"], dtype=np.int64)
+        lengths = np.asarray(cols["nbytes"], dtype=np.int64)
+
+        # One NUL separator after every value keeps trigrams from spanning rows
+        buffer = "\x00".join(cols["text"].tolist()).encode() + b"\x00"
+        starts = np.zeros(len(ids), dtype=np.int64)
+        if len(ids):
+            np.cumsum(lengths[:-1] + 1, out=starts[1:])
+
+        data = np.frombuffer(buffer, dtype=np.uint8).astype(np.int64)
+        if len(data) >= MIN_QUERY_BYTES and len(ids):
+            codes = (data[:-2] << 16) | (data[1:-1] << 8) | data[2:]
+            rows = np.repeat(np.arange(len(ids), dtype=np.int64), lengths + 1)[:len(codes)]
+            # Keep trigrams that end inside their own row
+            valid = np.arange(len(codes), dtype=np.int64) + MIN_QUERY_BYTES <= starts[rows] + lengths[rows]
+            keys = np.sort((codes[valid] << _ROW_BITS) | rows[valid])
+            if len(keys):
+                keys = keys[np.append(True, keys[1:] != keys[:-1])]
+        else:
+            keys = np.empty(0, dtype=np.int64)
+
+        # Keys are sorted, so each trigram's postings are one contiguous run
+        key_trigrams = keys >> _ROW_BITS
+        first = np.flatnonzero(np.append(True, key_trigrams[1:] != key_trigrams[:-1])) if len(keys) else keys
+        trigrams = key_trigrams[first]
+        offsets = np.append(first, len(keys)).astype(np.int64)
+
+        return cls(
+            column=column,
+            ids=ids,
+            buffer=buffer,
+            starts=starts,
+            lengths=lengths,
+            trigrams=trigrams,
+            offsets=offsets,
+            postings=keys & _ROW_MASK,
+        )
+
+    def search(self, value: str) -> Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """
+        Rows whose value contains `value` (case-insensitive).
+
+        Returns (rows, tier, length) where tier is 2 for an exact match, 1 for
+        a prefix match and 0 otherwise, or None if `value` is too short to be
+        answered from the index.
+        """
+        needle = value.lower().encode()
+        if len(needle) < MIN_QUERY_BYTES:
+            return None
+        if b"\x00" in needle:
+            # NUL is the row separator and never part of a value
+            return _empty_match()
+
+        data = np.frombuffer(needle, dtype=np.uint8).astype(np.int64)
+        codes = np.unique((data[:-2] << 16) | (data[1:-1] << 8) | data[2:])
+
+        # Intersect posting lists, shortest first
+        lists = []
+        for code in codes.tolist():
+            pos = int(np.searchsorted(self.trigrams, code))
+            if pos == len(self.trigrams) or self.trigrams[pos] != code:
+                return _empty_match()
+            lists.append(self.postings[self.offsets[pos]:self.offsets[pos + 1]])
+        lists.sort(key=len)
+        rows = lists[0]
+        for other in lists[1:]:
+            if len(rows) <= VERIFY_PER_ROW_LIMIT // 16:
+                # Few enough candidates that confirming directly beats more intersections
+                break
+            rows = _intersect_sorted(rows, other, len(self.ids))
+            if rows.size == 0:
+                return _empty_match()
+
+        if len(needle) > MIN_QUERY_BYTES:
+            # Trigrams can co-occur without forming the substring; confirm
+            rows = self._confirm(rows, needle)
+
+        # Every match is at least len(needle) long, so the prefix bytes are in range
+        lengths = self.lengths[rows]
+        starts = self.starts[rows]
+        prefix = np.ones(len(rows), dtype=bool)
+        for offset, byte in enumerate(needle):
+            prefix &= self.bytes[starts + offset] == byte
+        tier = prefix.astype(np.int64) + (prefix & (lengths == len(needle)))
+        return rows, tier, lengths
+
+
+    def _confirm(self, rows: np.ndarray, needle: bytes) -> np.ndarray:
+        if len(rows) <= VERIFY_PER_ROW_LIMIT:
+            buffer = self.buffer
+            starts = self.starts[rows].tolist()
+            ends = (self.starts[rows] + self.lengths[rows]).tolist()
+            hit = [buffer.find(needle, s, e) != -1 for s, e in zip(starts, ends)]
+            return rows[np.array(hit, dtype=bool)]
+
+        # Many candidates: locate every occurrence with one C-level split of
+        # the buffer and map positions back to rows.
+        parts = self.buffer.split(needle)
+        if len(parts) == 1:
+            return rows[:0]
+        sizes = np.array(list(map(len, parts[:-1])), dtype=np.int64)
+        positions = np.cumsum(sizes + len(needle)) - len(needle)
+        # Positions ascend, so rows come out sorted; drop repeats within a row
+        found = np.searchsorted(self.starts, positions, side="right") - 1
+        found = found[np.append(True, found[1:] != found[:-1])]
+        return _intersect_sorted(rows, found, len(self.ids))
+
+
+class SearchIndex:
+    """
+    Trigram indexes for the VARCHAR columns of `nodes` used by fuzzy /search.
+    """
+
+    def __init__(self, indexes: Dict[str, TrigramIndex]):
+        self.indexes = indexes
+
+    @classmethod
+    def from_connection(cls, conn: duckdb.DuckDBPyConnection, columns: List[str]) -> "SearchIndex":
+        started = time.perf_counter()
+
+        types = dict(conn.execute(
+            "SELECT column_name, column_type FROM (DESCRIBE nodes)"
+        ).fetchall())
+        indexes = {}
+        for column in columns:
+            if types.get(column) != "VARCHAR":
+                print(f"Search index: skipping nodes.{column} (not a VARCHAR column)")
+                continue
+            indexes[column] = TrigramIndex.build(conn, column)
+
+        print(
+            f"Search index built on {list(indexes)} "
+            f"in {time.perf_counter() - started:.3f}s"
+        )
+        return cls(indexes)
+
+    def covers(self, params: Dict[str, str]) -> bool:
+        """
+        Whether every fuzzy condition can be answered from the index.
+        """
+        return bool(params) and all(
+            col in self.indexes and len(val.lower().encode()) >= MIN_QUERY_BYTES
+            for col, val in params.items()
+        )
+
+    def search(self, params: Dict[str, str]) -> np.ndarray:
+        """
+        Node ids matching every `col ILIKE '%val%'` condition, best first:
+        exact matches, then prefix matches, then other substrings; shorter
+        values and lower ids break ties.
+        """
+        ids = None
+        tier = None
+        length = None
+        for col, val in params.items():
+            index = self.indexes[col]
+            rows, col_tier, col_length = index.search(val)
+            col_ids = index.ids[rows]
+            if ids is None:
+                ids, tier, length = col_ids, col_tier, col_length
+                continue
+            ids, left, right = np.intersect1d(ids, col_ids, return_indices=True)
+            tier = tier[left] + col_tier[right]
+            length = length[left] + col_length[right]
+
+        if ids is None or ids.size == 0:
+            return np.empty(0, dtype=np.int64)
+        order = np.lexsort((ids, length, -tier))
+        return ids[order]
+
+
+def _intersect_sorted(rows: np.ndarray, other: np.ndarray, universe: int) -> np.ndarray:
+    """
+    Intersect two sorted, duplicate-free row arrays.
+    """
+    if len(rows) * 32 < universe:
+        # Sparse: binary-search each candidate in the other list
+        pos = np.minimum(np.searchsorted(other, rows), len(other) - 1)
+        return rows[other[pos] == rows]
+    # Dense: bitmap over all rows
+    member = np.zeros(universe, dtype=bool)
+    member[other] = True
+    return rows[member[rows]]
+
+
+def _empty_match() -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    empty = np.empty(0, dtype=np.int64)
+    return empty, empty, empty
@@ -0,0 +1,278 @@
+import io
+import duckdb
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+from typing import Iterable, Iterator, List, Optional
+from xml.sax.saxutils import escape, quoteattr
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+from src import fastjson
+from src.graph import AdjacencyIndex
+from src.records import NODE_FIELDS
+
+# Streaming media types negotiated through the Accept header
+NDJSON = "application/x-ndjson"
+ARROW_STREAM = "application/vnd.apache.arrow.stream"
+STREAM_MEDIA_TYPES = [NDJSON, ARROW_STREAM]
+# Graph exports (/subgraph) can also be streamed as GraphML
+GRAPHML = "application/graphml+xml"
+
+# Rows per record batch pulled from DuckDB / sliced from index arrays
+BATCH_ROWS = 8192
+
+# Edge rows streamed from the adjacency index, matching the Edge schema
+EDGE_SCHEMA = pa.schema([
+    ("id", pa.int64()),
+    ("type", pa.string()),
+    ("source", pa.int64()),
+    ("target", pa.int64()),
+])
+
+
+def negotiate(request: Request, media_types: List[str] = STREAM_MEDIA_TYPES) -> Optional[str]:
+    """
+    Return the streaming media type requested via Accept, or None for plain JSON.
+    The first type of `media_types` listed wins; quality parameters are ignored.
+    """
+    accept = request.headers.get("accept", "")
+    for part in accept.split(","):
+        media_type = part.split(";")[0].strip().lower()
+        if media_type in media_types:
+            return media_type
+    return None
+
+
+def record_batches(result: duckdb.DuckDBPyConnection, rows: int = BATCH_ROWS) -> pa.RecordBatchReader:
+    """
+    Arrow record batch reader over a pending DuckDB result.
+    """
+    if hasattr(result, "to_arrow_reader"):
+        return result.to_arrow_reader(rows)
+    return result.fetch_record_batch(rows)
+
+
+def arrow_table(result: duckdb.DuckDBPyConnection) -> pa.Table:
+    """
+    Fully materialized Arrow table of a pending DuckDB result.
+    """
+    if hasattr(result, "to_arrow_table"):
+        return result.to_arrow_table()
+    return result.fetch_arrow_table()
+
+
+def edge_batches(graph: AdjacencyIndex, edge_rows: np.ndarray, rows: int = BATCH_ROWS) -> Iterator[pa.RecordBatch]:
+    """
+    Edge-shaped record batches (id, type, source, target) sliced from the adjacency index.
+    """
+    for start in range(0, len(edge_rows), rows):
+        chunk = edge_rows[start:start + rows]
+        yield pa.RecordBatch.from_arrays(
+            [
+                pa.array(graph.edge_ids[chunk]),
+                pa.array(graph.edge_type_labels[graph.edge_type_codes[chunk]], type=pa.string()),
+                pa.array(graph.node_ids[graph.edge_src[chunk]]),
+                pa.array(graph.node_ids[graph.edge_tgt[chunk]]),
+            ],
+            schema=EDGE_SCHEMA,
+        )
+
+
+def ndjson_lines(batches: Iterable[pa.RecordBatch], shape=None) -> Iterator[bytes]:
+    """
+    Encode record batches as newline-delimited JSON, one batch per chunk.
+    `shape` optionally maps each flat row dict to the emitted object.
+    """
+    for batch in batches:
+        rows = _nan_to_null(batch).to_pylist()
+        if shape is not None:
+            rows = [shape(row) for row in rows]
+        if rows:
+            yield b"".join(fastjson.dumps(row) + b"\n" for row in rows)
+
+
+def arrow_ipc(batches: Iterable[pa.RecordBatch], schema: pa.Schema) -> Iterator[bytes]:
+    """
+    Encode record batches as one Arrow IPC stream (schema, batches, end-of-stream),
+    yielding the bytes written for each batch as soon as it is encoded.
+    """
+    sink = io.BytesIO()
+
+    def drain() -> bytes:
+        data = sink.getvalue()
+        sink.seek(0)
+        sink.truncate()
+        return data
+
+    with pa.ipc.new_stream(sink, schema) as writer:
+        for batch in batches:
+            writer.write_batch(batch)
+            yield drain()
+    yield drain()
+
+
+def node_row(row: dict) -> dict:
+    """
+    Reshape a flat nodes-table row into the Node schema shape.
+    """
+    return {
+        "kind": "node",
+        "id": row["id"],
+        "node_type": row["node_type"],
+        "display_name": row["display_name"],
+        "properties": {k: v for k, v in row.items() if k not in NODE_FIELDS},
+    }
+
+
+def edge_row(row: dict) -> dict:
+    return {"kind": "edge", **row}
+
+
+def stream_batches(reader: pa.RecordBatchReader, media_type: str) -> StreamingResponse:
+    """
+    Stream record batches as NDJSON rows or an Arrow IPC stream.
+    """
+    if media_type == NDJSON:
+        body = ndjson_lines(reader)
+    else:
+        body = arrow_ipc(reader, reader.schema)
+    return StreamingResponse(body, media_type=media_type)
+
+
+def stream_rows_by_ids(
+    conn: duckdb.DuckDBPyConnection,
+    table: str,
+    ids: np.ndarray,
+    media_type: str,
+) -> StreamingResponse:
+    """
+    Stream the rows of `table` for an already ranked page of ids, in rank order.
+    """
+    conn.register("_requested_ids", pa.table({
+        "id": pa.array(np.asarray(ids, dtype=np.int64)),
+        "rank": pa.array(np.arange(len(ids), dtype=np.int64)),
+    }))
+    try:
+        rows = arrow_table(conn.execute(
+            f"SELECT t.* FROM {table} t JOIN _requested_ids r ON t.id = r.id ORDER BY r.rank"
+        ))
+    finally:
+        conn.unregister("_requested_ids")
+    return stream_batches(rows.to_reader(), media_type)
+
+
+def stream_neighbors(
+    conn: duckdb.DuckDBPyConnection,
+    graph: AdjacencyIndex,
+    node_pos: np.ndarray,
+    edge_rows: np.ndarray,
+    media_type: str,
+) -> StreamingResponse:
+    """
+    Stream a neighborhood: node rows first (straight from DuckDB record
+    batches), then edge rows (sliced from the index arrays).
+
+    NDJSON lines carry a `kind` of "node" or "edge". The Arrow body is two
+    IPC streams back to back, nodes then edges; read it with two successive
+    `pyarrow.ipc.open_stream` calls on the same input.
+    """
+    def body():
+        conn.register("_requested_ids", pa.table({"id": pa.array(graph.node_ids[node_pos])}))
+        try:
+            nodes = record_batches(conn.execute(
+                "SELECT n.* FROM nodes n SEMI JOIN _requested_ids r ON n.id = r.id"
+            ))
+            if media_type == NDJSON:
+                yield from ndjson_lines(nodes, node_row)
+                yield from ndjson_lines(edge_batches(graph, edge_rows), edge_row)
+            else:
+                yield from arrow_ipc(nodes, nodes.schema)
+                yield from arrow_ipc(edge_batches(graph, edge_rows), EDGE_SCHEMA)
+        finally:
+            conn.unregister("_requested_ids")
+
+    return StreamingResponse(body(), media_type=media_type)
+
+
+def stream_graphml(
+    conn: duckdb.DuckDBPyConnection,
+    graph: AdjacencyIndex,
+    node_pos: np.ndarray,
+    edge_rows: np.ndarray,
+) -> StreamingResponse:
+    """
+    Stream a subgraph as a directed GraphML document: one <node> per row of
+    the nodes table (its columns as <data> values, NULLs omitted), then one
+    <edge> per edge row with its type. Keys are declared from the nodes
+    schema before the first row, so rows are written batch by batch.
+    """
+    def body():
+        conn.register("_requested_ids", pa.table({"id": pa.array(graph.node_ids[node_pos])}))
+        try:
+            nodes = record_batches(conn.execute(
+                "SELECT n.* FROM nodes n SEMI JOIN _requested_ids r ON n.id = r.id"
+            ))
+            columns = [field for field in nodes.schema if field.name != "id"]
+            head = [
+                '<?xml version="1.0" encoding="UTF-8"?>',
+                '<graphml xmlns="http://graphml.graphdrawing.org/xmlns">',
+            ]
+            head += [
+                f'<key id="n{i}" for="node" attr.name={quoteattr(field.name)} attr.type="{_graphml_type(field.type)}"/>'
+                for i, field in enumerate(columns)
+            ]
+            head += ['<key id="type" for="edge" attr.name="type" attr.type="string"/>', '<graph edgedefault="directed">']
+            yield ("\n".join(head) + "\n").encode()
+
+            for batch in nodes:
+                rows = _nan_to_null(batch).to_pylist()
+                yield "".join(
+                    f'<node id="{row["id"]}">'
+                    + "".join(
+                        f'<data key="n{i}">{escape(_graphml_value(row[field.name]))}</data>'
+                        for i, field in enumerate(columns) if row[field.name] is not None
+                    )
+                    + "</node>\n"
+                    for row in rows
+                ).encode()
+            for batch in edge_batches(graph, edge_rows):
+                yield "".join(
+                    f'<edge id="{row["id"]}" source="{row["source"]}" target="{row["target"]}">'
+                    + (f'<data key="type">{escape(row["type"])}</data>' if row["type"] is not None else "")
+                    + "</edge>\n"
+                    for row in batch.to_pylist()
+                ).encode()
+            yield b"</graph>\n</graphml>\n"
+        finally:
+            conn.unregister("_requested_ids")
+
+    return StreamingResponse(body(), media_type=GRAPHML)
+
+
+def _graphml_type(arrow_type: pa.DataType) -> str:
+    if pa.types.is_boolean(arrow_type):
+        return "boolean"
+    if pa.types.is_integer(arrow_type):
+        return "long"
+    if pa.types.is_floating(arrow_type):
+        return "double"
+    return "string"
+
+
+def _graphml_value(value) -> str:
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (int, float, str)):
+        return str(value)
+    encoded = fastjson.default(value)
+    return encoded if isinstance(encoded, str) else fastjson.dumps(encoded).decode()
+
+
+def _nan_to_null(batch: pa.RecordBatch) -> pa.RecordBatch:
+    columns = []
+    for column in batch.columns:
+        if pa.types.is_floating(column.type):
+            column = pc.if_else(pc.is_nan(column), pa.scalar(None, column.type), column)
+        columns.append(column)
+    return pa.RecordBatch.from_arrays(columns, names=batch.schema.names)
+
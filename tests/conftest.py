@@ -92,30 +92,25 @@ def api_client(test_data_dir):
     Creates a TestClient with overridden dependencies using test data.
     """
     from src.main import app
-    from src.deps import get_db
+    from src.deps import get_dataset
+    from src.dataset import Dataset
     from fastapi.testclient import TestClient
     
     # Override DATA_DIR
     os.environ["DATA_DIR"] = test_data_dir
     
-    # Reset/Reload singleton if needed (though we create fresh connection in override)
-    # But get_db uses a global singleton variable in deps.py.
-    # We should override the dependency directly.
-    
-    # Using real loader which uses DATA_DIR
-    from src.loader import load_data
-    
-    # Create a fresh connection for this test
-    # Note: load_data() now expects env var DATA_DIR to be set.
-    conn = load_data()
-    
-    def override_get_db():
-        return conn
+    # Every dependency (pool, graph, indexes, catalog, cache) hangs off the
+    # request's dataset, so overriding get_dataset with a fresh one built
+    # from the test data isolates the test from the process-wide singleton.
+    dataset = Dataset.load(pool_size=2)
 
-    app.dependency_overrides[get_db] = override_get_db
+    def override_get_dataset():
+        return dataset
+
+    app.dependency_overrides[get_dataset] = override_get_dataset
     
     client = TestClient(app)
     yield client
     
     app.dependency_overrides = {}
-    conn.close()
+    dataset.close()
@@ -0,0 +1,80 @@
+import os
+from unittest.mock import patch
+import duckdb
+import numpy as np
+from src.analytics import GraphAnalytics, _saved_damping
+from src.graph import AdjacencyIndex
+from src.loader import load_data
+
+def _two_component_graph():
+    conn = duckdb.connect(":memory:")
+    conn.execute("CREATE TABLE nodes AS SELECT range AS id FROM range(1, 8)")
+    # A cycle 1 -> 2 -> 3 -> 1 fed by 4, a separate pair 6 -> 5; 7 is isolated
+    conn.execute("""
+        CREATE TABLE edges AS SELECT * FROM (VALUES
+            (1, 1, 2, 'a'), (2, 2, 3, 'a'), (3, 3, 1, 'a'), (4, 4, 1, 'a'), (5, 6, 5, 'a')
+        ) t(id, source_id, target_id, edge_type)
+    """)
+    return AdjacencyIndex.from_connection(conn)
+
+def test_graph_analytics_components_and_pagerank():
+    graph = _two_component_graph()
+    analytics = GraphAnalytics.from_graph(graph)
+
+    assert analytics.component.tolist() == [1, 1, 1, 1, 5, 5, 7]
+    assert analytics.component_size.tolist() == [4, 4, 4, 4, 2, 2, 1]
+
+    assert np.isclose(analytics.pagerank.sum(), 1.0)
+    # 1 collects rank from both 3 and 4; the source-only nodes rank lowest
+    assert np.argmax(analytics.pagerank) == graph.position_of(1)
+    assert analytics.pagerank[graph.position_of(5)] > analytics.pagerank[graph.position_of(6)]
+
+    assert analytics.order(np.array([7, 6, 1, 99]), "pagerank").tolist()[:2] == [1, 7]
+    assert analytics.order(np.array([7, 6, 1, 99]), "component_size").tolist() == [1, 6, 7, 99]
+    fields = analytics.fields(np.array([5, 99]))
+    assert fields["component"] == [5, None]
+    assert fields["component_size"] == [2, None]
+
+def test_graph_analytics_saved_in_persistent_db(test_data_dir, tmp_path):
+    db_path = str(tmp_path / "graph.duckdb")
+    with patch.dict(os.environ, {"DATA_DIR": test_data_dir, "DB_PATH": db_path}):
+        load_data().close()
+        conn = load_data()
+        assert _saved_damping(conn) == 0.85
+        graph = AdjacencyIndex.from_connection(conn)
+        saved = GraphAnalytics.from_connection(conn, graph)
+        fresh = GraphAnalytics.from_graph(graph)
+        assert np.allclose(saved.pagerank, fresh.pagerank)
+        assert np.array_equal(saved.component, fresh.component)
+        # Another damping factor is computed instead of read back
+        assert not np.allclose(GraphAnalytics.from_connection(conn, graph, 0.5).pagerank, fresh.pagerank)
+        conn.close()
+
+def test_node_analytics_fields(api_client):
+    node = api_client.get("/api/v1/nodes/12000001").json()["data"]
+    # Officer A -> Entity X -> Address 1
+    assert node["component"] == 11000001
+    assert node["component_size"] == 3
+    assert 0 < node["pagerank"] < 1
+
+    neighbors = api_client.get("/api/v1/nodes/11000001/neighbors").json()
+    assert all(n["component"] == 11000001 for n in neighbors["nodes"])
+
+def test_sort_by_analytics(api_client):
+    # Edge id order puts Officer A first; the address collects more rank
+    res = api_client.get("/api/v1/nodes/11000001/neighbors?sort=pagerank").json()
+    assert [n["id"] for n in res["nodes"]] == [14000001, 12000001]
+    page = api_client.get("/api/v1/nodes/11000001/neighbors?sort=pagerank&limit=1").json()
+    assert [n["id"] for n in page["nodes"]] == [14000001]
+    rest = api_client.get(f"/api/v1/nodes/11000001/neighbors?sort=pagerank&limit=1&cursor={page['next_cursor']}").json()
+    assert [n["id"] for n in rest["nodes"]] == [12000001]
+
+    # Every node matches; nodes without incoming edges tie and keep id order
+    res = api_client.get("/api/v1/search?display_name=e&fuzzy=true&sort=pagerank&limit=2").json()
+    assert [r["id"] for r in res["results"]] == [14000001, 11000001]
+    assert res["total"] == 6
+    rest = api_client.get(f"/api/v1/search?display_name=e&fuzzy=true&sort=pagerank&limit=2&cursor={res['next_cursor']}").json()
+    assert [r["id"] for r in rest["results"]] == [11000002, 12000001]
+
+    assert api_client.get("/api/v1/search?display_name=e&fuzzy=true&sort=degree").status_code == 400
+    assert api_client.get("/api/v1/search?table=edges&edge_type=officer_of&sort=pagerank").status_code == 400
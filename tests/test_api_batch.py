@@ -0,0 +1,34 @@
+import pytest
+
+# api_client is injected from conftest.py
+
+def test_batch_get_nodes(api_client):
+    response = api_client.post("/api/v1/nodes:batchGet", json={"ids": [11000001, 99999999, 12000001, 11000001]})
+    assert response.status_code == 200
+    res = response.json()
+    assert res["count"] == 2
+    assert list(res["data"]) == ["11000001", "99999999", "12000001"]
+    assert res["data"]["11000001"]["node_type"] == "entity"
+    assert res["data"]["99999999"] is None
+
+    # Same shape as the single-node endpoint
+    single = api_client.get("/api/v1/nodes/12000001").json()["data"]
+    assert res["data"]["12000001"] == single
+
+def test_batch_get_limit(api_client):
+    response = api_client.post("/api/v1/nodes:batchGet", json={"ids": list(range(5001))})
+    assert response.status_code == 422
+
+def test_batch_neighbors_matches_single(api_client):
+    ids = [12000001, 11000001, 99999999]
+    response = api_client.post("/api/v1/nodes/neighbors:batch", json={"ids": ids, "direction": "both"})
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert results["99999999"] == {"nodes": [], "edges": [], "truncated": False, "next_cursor": None}
+    for node_id in ids[:2]:
+        single = api_client.get(f"/api/v1/nodes/{node_id}/neighbors?direction=both").json()
+        assert results[str(node_id)] == single
+
+def test_batch_neighbors_invalid_direction(api_client):
+    response = api_client.post("/api/v1/nodes/neighbors:batch", json={"ids": [1], "direction": "up"})
+    assert response.status_code == 400
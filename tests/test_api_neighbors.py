@@ -93,3 +93,153 @@ def test_get_neighbors_count_entity_in(api_client):
 
 
 
+def test_get_neighbors_depth_two(api_client):
+    # Officer A -> Entity X -> Address 1
+    response = api_client.get("/api/v1/nodes/12000001/neighbors?direction=out&depth=2")
+    assert response.status_code == 200
+    res = response.json()
+    node_ids = [n["id"] for n in res["nodes"]]
+    assert node_ids == [11000001, 14000001]
+    edge_pairs = {(e["source"], e["target"]) for e in res["edges"]}
+    assert edge_pairs == {(12000001, 11000001), (11000001, 14000001)}
+
+def test_get_neighbors_depth_does_not_revisit_start(api_client):
+    # Entity X both ways reaches Officer A and Address 1; a second hop only walks back
+    response = api_client.get("/api/v1/nodes/11000001/neighbors?direction=both&depth=3")
+    assert response.status_code == 200
+    res = response.json()
+    node_ids = [n["id"] for n in res["nodes"]]
+    assert sorted(node_ids) == [12000001, 14000001]
+    assert len(res["edges"]) == 2
+
+def test_get_neighbors_max_fanout(api_client):
+    response = api_client.get("/api/v1/nodes/11000001/neighbors?direction=both&max_fanout=1")
+    assert response.status_code == 200
+    res = response.json()
+    assert len(res["nodes"]) == 1
+    assert len(res["edges"]) == 1
+
+def test_get_neighbors_depth_out_of_range(api_client):
+    response = api_client.get("/api/v1/nodes/12000001/neighbors?depth=0")
+    assert response.status_code == 422
+
+def test_top_degree_nodes(api_client):
+    response = api_client.get("/api/v1/degrees/top?limit=3&direction=both")
+    assert response.status_code == 200
+    res = response.json()
+    assert res["count"] == 3
+    degrees = [r["degree"] for r in res["results"]]
+    assert degrees == sorted(degrees, reverse=True)
+
+    # Degree agrees with the neighbor count of the hub
+    hub = res["results"][0]
+    count = api_client.get(f"/api/v1/nodes/{hub['node']['id']}/neighbors/count").json()
+    assert hub["degree"] == hub["in_degree"] + hub["out_degree"] >= count["count"]
+
+    typed = api_client.get("/api/v1/degrees/top?limit=5&node_type=officer").json()
+    assert all(r["node"]["node_type"] == "officer" for r in typed["results"])
+
+    assert api_client.get("/api/v1/degrees/top?direction=sideways").status_code == 400
+
+def test_path_between_nodes(api_client):
+    # Officer A -> Entity X -> Address
+    res = api_client.get("/api/v1/paths?from=12000001&to=14000001&direction=out").json()
+    assert res["found"] is True
+    assert res["length"] == 2
+    assert [n["id"] for n in res["nodes"]] == [12000001, 11000001, 14000001]
+    assert [(e["source"], e["target"]) for e in res["edges"]] == [(12000001, 11000001), (11000001, 14000001)]
+
+    # Against edge direction there is no path
+    res = api_client.get("/api/v1/paths?from=14000001&to=12000001&direction=out").json()
+    assert res == {"found": False, "length": None, "nodes": [], "edges": []}
+
+    # Edge-type filter
+    res = api_client.get("/api/v1/paths?from=12000001&to=14000001&edge_type=officer_of").json()
+    assert res["found"] is False
+    res = api_client.get("/api/v1/paths?from=12000001&to=14000001&edge_type=officer_of&edge_type=registered_address").json()
+    assert res["length"] == 2
+
+    assert api_client.get("/api/v1/paths?from=12000001&to=99999999").json()["found"] is False
+    assert api_client.get("/api/v1/paths?from=12000001&to=14000001&direction=up").status_code == 400
+
+def test_get_neighbors_node_type_filter(api_client):
+    # Officer A -> Entity X -> Address 1; only the address is returned, reached through the entity
+    res = api_client.get("/api/v1/nodes/12000001/neighbors?direction=out&depth=2&node_type=address").json()
+    assert [n["id"] for n in res["nodes"]] == [14000001]
+    # The edge into the address starts at a filtered-out node
+    assert res["edges"] == []
+
+    res = api_client.get("/api/v1/nodes/11000001/neighbors?node_type=officer").json()
+    assert [n["id"] for n in res["nodes"]] == [12000001]
+    assert [(e["source"], e["target"]) for e in res["edges"]] == [(12000001, 11000001)]
+
+def test_get_neighbors_edge_type_filter(api_client):
+    res = api_client.get("/api/v1/nodes/12000001/neighbors?direction=out&depth=2&edge_type=officer_of").json()
+    assert [n["id"] for n in res["nodes"]] == [11000001]
+
+def _with_budget(endpoint, **limits):
+    from src.budget import Budget
+    from src.deps import get_budgets
+    from src.main import app
+    budgets = dict(get_budgets())
+    budgets[endpoint] = Budget(**limits)
+    app.dependency_overrides[get_budgets] = lambda: budgets
+
+def test_get_neighbors_paged_by_row_budget(api_client):
+    full = api_client.get("/api/v1/nodes/11000001/neighbors?direction=both&depth=2").json()
+    assert not full["truncated"] and full["next_cursor"] is None
+
+    _with_budget("neighbors", max_rows=1)
+    pages = []
+    url = "/api/v1/nodes/11000001/neighbors"
+    params = {"direction": "both", "depth": 2}
+    response = api_client.get(url, params=params).json()
+    pages.append(response)
+    while response["next_cursor"]:
+        response = api_client.get(url, params={**params, "cursor": response["next_cursor"]}).json()
+        pages.append(response)
+
+    assert len(pages) == len(full["nodes"])
+    assert all(len(page["nodes"]) == 1 for page in pages)
+    assert pages[0]["truncated"] and not pages[-1]["truncated"]
+    assert [n for page in pages for n in page["nodes"]] == full["nodes"]
+    # Every edge lands on exactly one page
+    paged_edges = [e["id"] for page in pages for e in page["edges"]]
+    assert sorted(paged_edges) == sorted(e["id"] for e in full["edges"])
+
+def test_get_neighbors_frontier_budget(api_client):
+    _with_budget("neighbors", max_frontier=1)
+    response = api_client.get("/api/v1/nodes/11000001/neighbors?direction=both")
+    assert response.status_code == 200
+    res = response.json()
+    assert res["truncated"]
+    assert len(res["nodes"]) == 1
+
+def test_get_neighbors_bad_cursor(api_client):
+    response = api_client.get("/api/v1/nodes/11000001/neighbors", params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
+    from src.cursor import encode_cursor
+    stale = encode_cursor("0" * 12, skip=1)
+    response = api_client.get("/api/v1/nodes/11000001/neighbors", params={"cursor": stale})
+    assert response.status_code == 400
+
+def test_get_neighbors_keyset_pages(api_client):
+    url = "/api/v1/nodes/11000001/neighbors"
+    full = api_client.get(url, params={"direction": "both"}).json()
+    assert len(full["edges"]) > 1
+
+    pages = [api_client.get(url, params={"direction": "both", "limit": 1}).json()]
+    while pages[-1]["next_cursor"]:
+        pages.append(api_client.get(url, params={"direction": "both", "limit": 1, "cursor": pages[-1]["next_cursor"]}).json())
+
+    assert all(len(page["edges"]) == 1 and page["truncated"] for page in pages[:-1])
+    edge_ids = [page["edges"][0]["id"] for page in pages]
+    assert edge_ids == sorted(edge_ids)
+    assert sorted(edge_ids) == sorted(edge["id"] for edge in full["edges"])
+    assert {n["id"] for page in pages for n in page["nodes"]} == {n["id"] for n in full["nodes"]}
+
+    # A depth-2 cursor does not resume a direct neighborhood
+    from src.cursor import encode_cursor
+    from src.deps import get_current_dataset
+    wrong = encode_cursor(get_current_dataset().version, skip=1)
+    assert api_client.get(url, params={"direction": "both", "cursor": wrong}).status_code == 400
@@ -25,3 +25,24 @@ def test_get_schema(api_client):
     # id in nodes is BIGINT
     id_col = next(col for col in res["nodes"] if col["name"] == "id")
     assert id_col["type"] == "BIGINT"
+
+def test_get_schema_statistics(api_client):
+    res = api_client.get("/api/v1/schema").json()
+    id_col = next(col for col in res["nodes"] if col["name"] == "id")
+    # Parquet footer statistics for nodes.id
+    assert id_col["min"] == "11000001"
+    assert id_col["max"] == "14000001"
+    assert id_col["null_count"] == 0
+    assert id_col["distinct_estimate"] > 0
+
+def test_get_schema_etag(api_client):
+    response = api_client.get("/api/v1/schema")
+    etag = response.headers["etag"]
+    assert etag
+
+    cached = api_client.get("/api/v1/schema", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.headers["etag"] == etag
+
+    stale = api_client.get("/api/v1/schema", headers={"If-None-Match": '"other"'})
+    assert stale.status_code == 200
@@ -85,3 +85,112 @@ def test_search_empty_params_returns_empty(api_client):
     res = response.json()
     assert res["count"] == 0
     assert res["results"] == []
+
+def test_search_fuzzy_indexed_reports_total(api_client):
+    response = api_client.get("/api/v1/search?display_name=officer&fuzzy=true&limit=1")
+    assert response.status_code == 200
+    res = response.json()
+    assert res["count"] == 1
+    assert res["total"] == 2
+    assert res["results"][0]["id"] == 12000001
+
+def test_search_node_type_filter(api_client):
+    # Fuzzy on the indexed column, exact on the partition key
+    res = api_client.get("/api/v1/search?display_name=fficer&fuzzy=true&node_type=officer").json()
+    assert res["total"] == 2
+    res = api_client.get("/api/v1/search?display_name=ity&fuzzy=true&node_type=officer").json()
+    assert res["count"] == 0
+
+    # node_type is never a substring match
+    res = api_client.get("/api/v1/search?node_type=offic&fuzzy=true").json()
+    assert res["count"] == 0
+    res = api_client.get("/api/v1/search?node_type=officer&fuzzy=true").json()
+    assert {r["id"] for r in res["results"]} == {12000001, 12000002}
+
+def test_search_next_cursor(api_client):
+    params = {"display_name": "Officer", "fuzzy": "true", "limit": 1}
+    first = api_client.get("/api/v1/search", params=params).json()
+    assert first["next_cursor"]
+    second = api_client.get("/api/v1/search", params={**params, "cursor": first["next_cursor"]}).json()
+    assert second["results"][0]["id"] != first["results"][0]["id"]
+    assert second["next_cursor"] is None
+
+def test_search_candidate_budget(api_client):
+    from src.budget import Budget
+    from src.deps import get_budgets
+    from src.main import app
+    app.dependency_overrides[get_budgets] = lambda: {"search": Budget(max_rows=1), "neighbors": Budget()}
+    res = api_client.get("/api/v1/search?display_name=Officer&fuzzy=true").json()
+    assert res["truncated"]
+    assert res["total"] == 1 and len(res["results"]) == 1
+
+def test_search_keyset_pages(api_client):
+    # Values under 3 bytes bypass the trigram index and scan in id order
+    params = {"display_name": "e", "fuzzy": "true", "limit": 1}
+    full = api_client.get("/api/v1/search", params={**params, "limit": 100}).json()
+    assert full["count"] > 1
+    assert [r["id"] for r in full["results"]] == sorted(r["id"] for r in full["results"])
+
+    ids = []
+    cursor = None
+    while True:
+        res = api_client.get("/api/v1/search", params={**params, **({"cursor": cursor} if cursor else {})}).json()
+        ids += [r["id"] for r in res["results"]]
+        cursor = res["next_cursor"]
+        if not cursor:
+            break
+    assert ids == [r["id"] for r in full["results"]]
+
+def test_search_scan_interrupted_returns_partial_page(api_client, monkeypatch):
+    import contextlib
+    import threading
+    import duckdb
+    from src import api, profiling
+
+    params = {"display_name": "e", "fuzzy": "true"}
+    full = [r["id"] for r in api_client.get("/api/v1/search", params=params).json()["results"]]
+
+    # Window every scan, and run out of time during the second window
+    monkeypatch.setattr(api, "SCAN_WINDOW_ROWS", 0)
+    monkeypatch.setattr(api, "SCAN_WINDOWS", 2)
+    fired = threading.Event()
+    calls = []
+    execute = profiling.execute
+
+    def interrupting_execute(conn, sql, params=None):
+        calls.append(sql)
+        if len(calls) == 2:
+            fired.set()
+            raise duckdb.InterruptException("INTERRUPT Error: Interrupted!")
+        return execute(conn, sql, params)
+
+    @contextlib.contextmanager
+    def interrupt_after(conn, seconds):
+        yield fired
+
+    monkeypatch.setattr(profiling, "execute", interrupting_execute)
+    monkeypatch.setattr(api, "interrupt_after", interrupt_after)
+    res = api_client.get("/api/v1/search", params=params).json()
+    assert res["truncated"]
+    # The first window's rows are kept and the cursor resumes after it
+    first = [r["id"] for r in res["results"]]
+    assert first and first == full[:len(first)]
+    assert res["next_cursor"]
+
+    # Streams are cut the same way, with the cursor in a header
+    fired.clear()
+    calls.clear()
+    stream = api_client.get("/api/v1/search", params=params, headers={"Accept": "application/x-ndjson"})
+    assert stream.headers["X-Truncated"] == "true"
+    assert stream.headers["X-Next-Cursor"] == res["next_cursor"]
+    assert len(stream.text.splitlines()) == len(first)
+
+    # Past the second call nothing is interrupted any more
+    fired.clear()
+    rest = []
+    cursor = res["next_cursor"]
+    while cursor:
+        page = api_client.get("/api/v1/search", params={**params, "cursor": cursor}).json()
+        rest += [r["id"] for r in page["results"]]
+        cursor = page["next_cursor"]
+    assert first + rest == full
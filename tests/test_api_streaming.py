@@ -0,0 +1,61 @@
+import json
+import pyarrow as pa
+import pytest
+
+NDJSON = "application/x-ndjson"
+ARROW_STREAM = "application/vnd.apache.arrow.stream"
+
+def test_search_ndjson(api_client):
+    response = api_client.get(
+        "/api/v1/search?display_name=Officer&fuzzy=true",
+        headers={"Accept": NDJSON}
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith(NDJSON)
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert 12000001 in {r["id"] for r in rows}
+
+def test_search_arrow_stream(api_client):
+    response = api_client.get(
+        "/api/v1/search?display_name=Officer A",
+        headers={"Accept": ARROW_STREAM}
+    )
+    assert response.status_code == 200
+    table = pa.ipc.open_stream(response.content).read_all()
+    assert table.column("id").to_pylist() == [12000001]
+
+def test_neighbors_ndjson(api_client):
+    response = api_client.get(
+        "/api/v1/nodes/11000001/neighbors?direction=both",
+        headers={"Accept": NDJSON}
+    )
+    assert response.status_code == 200
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    nodes = [r for r in rows if r["kind"] == "node"]
+    edges = [r for r in rows if r["kind"] == "edge"]
+    assert {n["id"] for n in nodes} == {12000001, 14000001}
+    assert {(e["source"], e["target"]) for e in edges} == {(12000001, 11000001), (11000001, 14000001)}
+    assert "properties" in nodes[0]
+
+def test_neighbors_arrow_stream(api_client):
+    response = api_client.get(
+        "/api/v1/nodes/12000001/neighbors?direction=out",
+        headers={"Accept": ARROW_STREAM}
+    )
+    assert response.status_code == 200
+    source = pa.BufferReader(response.content)
+    nodes = pa.ipc.open_stream(source).read_all()
+    edges = pa.ipc.open_stream(source).read_all()
+    assert nodes.column("id").to_pylist() == [11000001]
+    assert edges.column("source").to_pylist() == [12000001]
+    assert edges.column("target").to_pylist() == [11000001]
+
+def test_neighbors_arrow_stream_unknown_node(api_client):
+    response = api_client.get(
+        "/api/v1/nodes/99999999/neighbors",
+        headers={"Accept": ARROW_STREAM}
+    )
+    assert response.status_code == 200
+    source = pa.BufferReader(response.content)
+    assert pa.ipc.open_stream(source).read_all().num_rows == 0
+    assert pa.ipc.open_stream(source).read_all().num_rows == 0
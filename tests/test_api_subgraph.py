@@ -0,0 +1,53 @@
+import json
+import xml.etree.ElementTree as ET
+
+NDJSON = "application/x-ndjson"
+GRAPHML = "application/graphml+xml"
+
+def test_subgraph_induced_by_seeds(api_client):
+    # Officer A -> Entity X -> Address 1
+    res = api_client.post("/api/v1/subgraph", json={"ids": [14000001, 12000001, 99999999]}).json()
+    assert [n["id"] for n in res["nodes"]] == [14000001, 12000001]
+    assert res["edges"] == [] and res["truncated"] is False
+
+    res = api_client.post("/api/v1/subgraph", json={"ids": [14000001, 12000001, 11000001]}).json()
+    assert {(e["source"], e["target"]) for e in res["edges"]} == {(12000001, 11000001), (11000001, 14000001)}
+
+def test_subgraph_ego_network(api_client):
+    res = api_client.post("/api/v1/subgraph", json={"ids": [12000001], "depth": 2}).json()
+    assert [n["id"] for n in res["nodes"]] == [12000001, 11000001, 14000001]
+    assert len(res["edges"]) == 2
+
+    # Traversal passes through the entity, which is then left out with its edges
+    typed = api_client.post(
+        "/api/v1/subgraph", json={"ids": [12000001], "depth": 2, "node_types": ["officer", "address"]}
+    ).json()
+    assert [n["id"] for n in typed["nodes"]] == [12000001, 14000001]
+    assert typed["edges"] == []
+
+    capped = api_client.post("/api/v1/subgraph", json={"ids": [12000001], "depth": 2, "max_nodes": 2}).json()
+    assert [n["id"] for n in capped["nodes"]] == [12000001, 11000001]
+    assert [(e["source"], e["target"]) for e in capped["edges"]] == [(12000001, 11000001)]
+    assert capped["truncated"] is True
+
+    bad = api_client.post("/api/v1/subgraph", json={"ids": [12000001], "direction": "sideways"})
+    assert bad.status_code == 400
+
+def test_subgraph_streams(api_client):
+    body = {"ids": [12000001], "depth": 2}
+    response = api_client.post("/api/v1/subgraph", json=body, headers={"Accept": NDJSON})
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert sorted(r["id"] for r in rows if r["kind"] == "node") == [11000001, 12000001, 14000001]
+    assert len([r for r in rows if r["kind"] == "edge"]) == 2
+
+    response = api_client.post("/api/v1/subgraph", json=body, headers={"Accept": GRAPHML})
+    assert response.headers["content-type"].startswith(GRAPHML)
+    ns = {"g": "http://graphml.graphdrawing.org/xmlns"}
+    root = ET.fromstring(response.content)
+    keys = {key.get("id"): key.get("attr.name") for key in root.findall("g:key", ns)}
+    nodes = root.findall("g:graph/g:node", ns)
+    assert sorted(node.get("id") for node in nodes) == ["11000001", "12000001", "14000001"]
+    officer = next(node for node in nodes if node.get("id") == "12000001")
+    assert {keys[d.get("key")]: d.text for d in officer.findall("g:data", ns)}["display_name"] == "Officer A"
+    edges = root.findall("g:graph/g:edge", ns)
+    assert {(e.get("source"), e.get("target")) for e in edges} == {("12000001", "11000001"), ("11000001", "14000001")}
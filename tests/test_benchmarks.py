@@ -0,0 +1,21 @@
+import duckdb
+from benchmarks.generate import generate
+
+def test_generate_power_law_graph(tmp_path):
+    """
+    The generator is deterministic, stays within the id space and puts a
+    large share of the edges on a few hubs.
+    """
+    stats = generate(str(tmp_path / "a"), 20000, 2000, skew=0.8, seed=7)
+    generate(str(tmp_path / "b"), 20000, 2000, skew=0.8, seed=7)
+    conn = duckdb.connect(":memory:")
+
+    a, b = (conn.execute(f"SELECT * FROM '{tmp_path / d / 'edges.parquet'}' ORDER BY id").fetchall() for d in "ab")
+    assert a == b and len(a) == 20000
+
+    assert conn.execute(f"SELECT count(*), min(id), max(id) FROM '{tmp_path / 'a' / 'nodes.parquet'}'").fetchone() == (2000, 1, 2000)
+    lo, hi = conn.execute(f"SELECT least(min(source_id), min(target_id)), greatest(max(source_id), max(target_id)) FROM '{tmp_path / 'a' / 'edges.parquet'}'").fetchone()
+    assert 1 <= lo and hi <= 2000
+
+    # Uniform endpoints would give every node about 20 edge endpoints
+    assert stats["max_degree"] > 1000
@@ -0,0 +1,41 @@
+import os
+import time
+import duckdb
+import pytest
+from unittest.mock import patch
+from src.budget import Budget, interrupt_after
+from src.cursor import CursorError, decode_cursor, encode_cursor
+
+
+def test_budget_from_env():
+    with patch.dict(os.environ, {"BUDGET_NEIGHBORS_MAX_ROWS": "50", "BUDGET_NEIGHBORS_MAX_SECONDS": "0"}):
+        budget = Budget.from_env("neighbors")
+    assert budget.max_rows == 50
+    assert budget.max_frontier == 1000000
+    assert budget.max_seconds is None
+    assert budget.deadline() is None
+
+
+def test_interrupt_after_stops_query():
+    conn = duckdb.connect(":memory:")
+    started = time.perf_counter()
+    with interrupt_after(conn, 0.2) as interrupted:
+        with pytest.raises(duckdb.InterruptException):
+            conn.execute("SELECT count(*) FROM range(100000000000) t(x) WHERE x % 7 = 3").fetchall()
+    assert interrupted.is_set()
+    assert time.perf_counter() - started < 3
+
+    # A query that finishes in time is untouched
+    with interrupt_after(conn, 5) as interrupted:
+        assert conn.execute("SELECT 1").fetchall() == [(1,)]
+    assert not interrupted.is_set()
+    conn.close()
+
+
+def test_cursor_round_trip():
+    token = encode_cursor("abc", skip=10)
+    assert decode_cursor(token, "abc") == {"skip": 10}
+    with pytest.raises(CursorError):
+        decode_cursor(token, "def")
+    with pytest.raises(CursorError):
+        decode_cursor("%%%", "abc")
@@ -0,0 +1,58 @@
+import pytest
+from src.cache import ResultCache, MISS
+
+def test_cache_hit_and_miss():
+    cache = ResultCache(max_entries=10)
+    assert cache.get(("node", 1)) is MISS
+    cache.put(("node", 1), {"count": 1})
+    assert cache.get(("node", 1)) == {"count": 1}
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["hit_ratio"] == 0.5
+
+def test_cache_evicts_least_recently_used():
+    cache = ResultCache(max_entries=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+
+    assert cache.get("b") is MISS
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+def test_cache_byte_budget():
+    cache = ResultCache(max_entries=100, max_bytes=20)
+    cache.put("small", "x" * 5)
+    cache.put("big", "x" * 50)
+    assert cache.get("big") is MISS
+    assert cache.stats()["rejected"] == 1
+
+    cache.put("other", "y" * 12)
+    # Both would exceed 20 bytes, so the older entry goes
+    assert cache.get("small") is MISS
+    assert cache.stats()["bytes"] <= 20
+
+def test_cache_disabled():
+    cache = ResultCache(max_entries=0)
+    cache.put("a", 1)
+    assert cache.get("a") is MISS
+
+def test_node_endpoint_uses_cache(api_client):
+    api_client.get("/api/v1/nodes/12000001")
+    first = api_client.get("/api/v1/stats").json()["cache"]
+    response = api_client.get("/api/v1/nodes/12000001")
+    assert response.json()["data"]["display_name"] == "Officer A"
+    second = api_client.get("/api/v1/stats").json()["cache"]
+    assert second["hits"] == first["hits"] + 1
+
+def test_neighbors_cache_keyed_by_params(api_client):
+    out = api_client.get("/api/v1/nodes/11000001/neighbors?direction=out").json()
+    both = api_client.get("/api/v1/nodes/11000001/neighbors?direction=both").json()
+    assert len(out["nodes"]) == 1
+    assert len(both["nodes"]) == 2
+    again = api_client.get("/api/v1/nodes/11000001/neighbors?direction=out").json()
+    assert again == out
@@ -0,0 +1,52 @@
+import duckdb
+import numpy as np
+from src.degrees import DegreeTable
+from src.graph import AdjacencyIndex
+
+
+def _toy_connection():
+    conn = duckdb.connect(":memory:")
+    conn.execute("""
+        CREATE TABLE nodes AS SELECT * FROM (VALUES
+            (1, 'officer', 'A'), (2, 'entity', 'B'), (3, 'entity', 'C'),
+            (4, 'address', 'D'), (5, NULL, 'E')
+        ) t(id, node_type, display_name)
+    """)
+    conn.execute("""
+        CREATE TABLE edges AS SELECT * FROM (VALUES
+            (10, 1, 2, 'officer_of'), (11, 1, 3, 'officer_of'),
+            (12, 2, 4, 'registered_address'), (13, 3, 4, 'registered_address'),
+            (14, 5, 4, 'registered_address'), (15, 1, 5, 'officer_of')
+        ) t(id, source_id, target_id, edge_type)
+    """)
+    return conn
+
+
+def test_counts_by_neighbor_type():
+    conn = _toy_connection()
+    graph = AdjacencyIndex.from_connection(conn)
+    degrees = DegreeTable.from_graph(conn, graph)
+
+    # Edges to the untyped node 5 are left out, as in a GROUP BY node_type
+    assert degrees.counts(graph.position_of(1), "out") == (2, {"entity": 2})
+    assert degrees.counts(graph.position_of(4), "in") == (2, {"entity": 2})
+    assert degrees.counts(graph.position_of(2), "both") == (2, {"officer": 1, "address": 1})
+    assert degrees.counts(graph.position_of(4), "out") == (0, {})
+
+    # Plain degrees count every edge
+    assert degrees.out_degree[graph.position_of(1)] == 3
+    assert degrees.in_degree[graph.position_of(4)] == 3
+
+
+def test_top_orders_by_degree_then_id():
+    conn = _toy_connection()
+    graph = AdjacencyIndex.from_connection(conn)
+    degrees = DegreeTable.from_graph(conn, graph)
+
+    # Untyped neighbors still count towards the node's own degree
+    assert degrees.degree("both")[graph.position_of(4)] == 3
+    assert degrees.degree("both")[graph.position_of(1)] == 3
+    top = degrees.node_ids[degrees.top(3, "both")].tolist()
+    assert top == [1, 4, 2]
+    assert degrees.node_ids[degrees.top(1, "in", node_type="entity")].tolist() == [2]
+    assert degrees.top(5, "both", node_type="missing").size == 0
@@ -0,0 +1,143 @@
+import asyncio
+import threading
+import time
+import duckdb
+import pytest
+from src.executor import QueryExecutor, QueryTimeout, POINT, HEAVY
+from src.pool import CursorPool
+
+SLOW_QUERY = "SELECT count(*) FROM range(100000000000) t(x) WHERE x % 7 = 3"
+
+
+@pytest.fixture
+def executor():
+    executor = QueryExecutor({POINT: 1, HEAVY: 1}, {POINT: 5.0, HEAVY: 5.0})
+    yield executor
+    executor.shutdown()
+
+
+@pytest.fixture
+def pool():
+    conn = duckdb.connect(":memory:")
+    pool = CursorPool(conn, size=2, timeout=5)
+    yield pool
+    pool.close()
+    conn.close()
+
+
+def test_timeout_interrupts_running_query(executor, pool):
+    """
+    A query past its timeout is interrupted, and its cursor is usable afterwards.
+    """
+    async def scenario():
+        started = time.perf_counter()
+        with pytest.raises(QueryTimeout):
+            await executor.run(HEAVY, pool, lambda conn: conn.execute(SLOW_QUERY).fetchall(), timeout=0.2)
+        elapsed = time.perf_counter() - started
+        rows = await executor.run(HEAVY, pool, lambda conn: conn.execute("SELECT 42").fetchall())
+        return elapsed, rows
+
+    elapsed, rows = asyncio.run(scenario())
+    assert elapsed < 3
+    assert rows == [(42,)]
+    stats = executor.stats()[HEAVY]
+    assert stats["timeouts"] == 1
+    assert stats["running"] == 0 and stats["queued"] == 0
+    assert pool.stats()["in_use"] == 0
+
+
+def test_point_lane_not_blocked_by_heavy_lane(executor, pool):
+    """
+    Point lookups keep running while every heavy lane thread is busy.
+    """
+    release = threading.Event()
+
+    async def scenario():
+        heavy = asyncio.ensure_future(executor.run(HEAVY, None, release.wait))
+        queued = asyncio.ensure_future(executor.run(HEAVY, None, lambda: "late"))
+        await asyncio.sleep(0.05)
+
+        started = time.perf_counter()
+        rows = await executor.run(POINT, pool, lambda conn: conn.execute("SELECT 1").fetchall())
+        point_seconds = time.perf_counter() - started
+        assert executor.stats()[HEAVY]["queued"] == 1
+
+        release.set()
+        return rows, point_seconds, await heavy, await queued
+
+    rows, point_seconds, heavy, queued = asyncio.run(scenario())
+    assert rows == [(1,)]
+    assert point_seconds < 1
+    assert heavy is True and queued == "late"
+
+
+def test_queued_call_dropped_on_timeout(executor):
+    """
+    A call that times out while still queued never runs.
+    """
+    release = threading.Event()
+    ran = []
+
+    async def scenario():
+        busy = asyncio.ensure_future(executor.run(HEAVY, None, release.wait))
+        await asyncio.sleep(0.05)
+        with pytest.raises(QueryTimeout):
+            await executor.run(HEAVY, None, lambda: ran.append(True), timeout=0.1)
+        release.set()
+        await busy
+
+    asyncio.run(scenario())
+    assert ran == []
+    assert executor.stats()[HEAVY]["dropped"] == 1
+
+
+def test_endpoints_report_lanes(api_client):
+    """
+    Point lookups and scans go through their own lanes, visible in /stats.
+    """
+    before = api_client.get("/api/v1/stats").json()["executor"]
+    assert api_client.get("/api/v1/nodes/11000001").status_code == 200
+    assert api_client.get("/api/v1/search", params={"display_name": "Entity", "fuzzy": "true"}).status_code == 200
+    after = api_client.get("/api/v1/stats").json()["executor"]
+
+    assert after[POINT]["submitted"] == before[POINT]["submitted"] + 1
+    assert after[HEAVY]["submitted"] == before[HEAVY]["submitted"] + 1
+    assert after[HEAVY]["workers"] >= 1
+
+
+def test_empty_neighbors_skip_the_executor(api_client):
+    """
+    Unknown nodes are answered from the index without taking a cursor.
+    """
+    before = api_client.get("/api/v1/stats").json()["executor"]
+    response = api_client.get("/api/v1/nodes/999999999/neighbors")
+    after = api_client.get("/api/v1/stats").json()["executor"]
+
+    assert response.status_code == 200
+    assert response.json()["nodes"] == [] and response.json()["edges"] == []
+    assert after[POINT]["submitted"] == before[POINT]["submitted"]
+    assert after[HEAVY]["submitted"] == before[HEAVY]["submitted"]
+
+
+def test_timeout_does_not_wait_for_uninterruptible_work(executor, pool):
+    """
+    Work that ignores conn.interrupt() still times out on schedule; its
+    cursor returns to the pool once the worker is done with it.
+    """
+    release = threading.Event()
+
+    async def scenario():
+        started = time.perf_counter()
+        with pytest.raises(QueryTimeout):
+            await executor.run(HEAVY, pool, lambda conn: release.wait(), timeout=0.1)
+        return time.perf_counter() - started
+
+    elapsed = asyncio.run(scenario())
+    assert elapsed < 1
+    assert pool.stats()["in_use"] == 1
+
+    release.set()
+    deadline = time.perf_counter() + 5
+    while pool.stats()["in_use"] and time.perf_counter() < deadline:
+        time.sleep(0.01)
+    assert pool.stats()["in_use"] == 0
@@ -0,0 +1,55 @@
+import os
+from unittest.mock import patch
+from fastapi import Response
+from src import fastjson
+from src.schemas import NodeResponse
+
+REQUESTS = [
+    ("GET", "/api/v1/search?display_name=e&fuzzy=true", None),
+    ("GET", "/api/v1/search?display_name=Nobody", None),
+    ("GET", "/api/v1/nodes/11000001/neighbors?depth=2", None),
+    ("POST", "/api/v1/nodes:batchGet", {"ids": [11000001, 99999999]}),
+    ("POST", "/api/v1/nodes/neighbors:batch", {"ids": [11000001, 99999999]}),
+    ("POST", "/api/v1/subgraph", {"ids": [12000001], "depth": 2}),
+    ("GET", "/api/v1/paths?from=12000001&to=14000001", None),
+    ("GET", "/api/v1/paths?from=12000001&to=13000001", None),
+    ("GET", "/api/v1/degrees/top", None),
+]
+
+def test_fast_json_matches_validated_responses(api_client):
+    for method, url, body in REQUESTS:
+        with patch.dict(os.environ, {"FAST_JSON": "0"}):
+            validated = api_client.request(method, url, json=body)
+        fast = api_client.request(method, url, json=body)
+        assert fast.status_code == validated.status_code == 200
+        assert fast.json() == validated.json(), url
+
+def test_encoders_match_pydantic_json_mode():
+    import datetime
+    import decimal
+    import json
+    import pyarrow as pa
+    from src.schemas import Node
+    from src.streaming import ndjson_lines
+
+    properties = {
+        "amount": decimal.Decimal("1.50"),
+        "held_for": datetime.timedelta(days=1, hours=2),
+        "updated": datetime.datetime(2024, 1, 2, tzinfo=datetime.timezone.utc),
+        "raw": b"abc",
+    }
+    # Shaped like node_records output, which always carries every Node field
+    node = {
+        "id": 1, "node_type": "entity", "display_name": "A", "properties": properties,
+        "pagerank": None, "component": None, "component_size": None,
+    }
+    expected = Node.model_validate(node).model_dump(mode="json")
+    assert expected["properties"] == {"amount": "1.50", "held_for": "P1DT2H", "updated": "2024-01-02T00:00:00Z", "raw": "abc"}
+
+    response = fastjson.response({"count": 1, "data": node}, NodeResponse)
+    assert isinstance(response, Response)
+    assert json.loads(response.body)["data"] == expected
+
+    # NDJSON streams render the same values the same way
+    batch = pa.RecordBatch.from_pylist([properties])
+    assert json.loads(b"".join(ndjson_lines([batch]))) == expected["properties"]
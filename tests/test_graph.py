@@ -0,0 +1,129 @@
+import pytest
+from unittest.mock import patch
+import os
+from src.loader import load_data
+from src.graph import AdjacencyIndex
+
+def test_adjacency_index_matches_edges(test_data_dir):
+    """
+    CSR offsets should account for every edge in both directions.
+    """
+    with patch.dict(os.environ, {"DATA_DIR": test_data_dir}):
+        conn = load_data()
+        graph = AdjacencyIndex.from_connection(conn)
+
+        e_count = conn.execute("SELECT count(*) FROM edges").fetchone()[0]
+        assert graph.num_edges == e_count
+        assert graph.out_offsets[-1] == e_count
+        assert graph.in_offsets[-1] == e_count
+
+        # Officer A -> Entity X
+        officer = graph.position_of(12000001)
+        nbrs, _ = graph.gather([officer], "out")
+        assert graph.node_ids[nbrs].tolist() == [11000001]
+
+def test_adjacency_index_unknown_node(test_data_dir):
+    with patch.dict(os.environ, {"DATA_DIR": test_data_dir}):
+        conn = load_data()
+        graph = AdjacencyIndex.from_connection(conn)
+        assert graph.position_of(99999999) is None
+
+def _chain_graph():
+    import duckdb
+    conn = duckdb.connect(":memory:")
+    conn.execute("CREATE TABLE nodes AS SELECT range AS id FROM range(1, 8)")
+    # 1 -> 2 -> 3 -> 4 -> 5 and a shortcut 1 -> 6 -> 5 of another type; 7 is isolated
+    conn.execute("""
+        CREATE TABLE edges AS SELECT * FROM (VALUES
+            (1, 1, 2, 'a'), (2, 2, 3, 'a'), (3, 3, 4, 'a'), (4, 4, 5, 'a'),
+            (5, 1, 6, 'b'), (6, 6, 5, 'b')
+        ) t(id, source_id, target_id, edge_type)
+    """)
+    return AdjacencyIndex.from_connection(conn)
+
+def test_shortest_path_bidirectional():
+    graph = _chain_graph()
+    pos = graph.position_of
+
+    nodes, edges = graph.shortest_path(pos(1), pos(5), max_depth=6, direction="out")
+    assert graph.node_ids[nodes].tolist() == [1, 6, 5]
+    assert graph.edge_ids[edges].tolist() == [5, 6]
+
+    # Edge-type filter forces the long way round
+    nodes, edges = graph.shortest_path(pos(1), pos(5), max_depth=6, direction="out", edge_types=["a"])
+    assert graph.node_ids[nodes].tolist() == [1, 2, 3, 4, 5]
+    assert graph.edge_ids[edges].tolist() == [1, 2, 3, 4]
+    assert graph.shortest_path(pos(1), pos(5), max_depth=3, direction="out", edge_types=["a"]) is None
+
+    # Direction is respected; "in" walks edges backwards
+    assert graph.shortest_path(pos(5), pos(1), max_depth=6, direction="out") is None
+    nodes, _ = graph.shortest_path(pos(5), pos(1), max_depth=6, direction="in")
+    assert graph.node_ids[nodes].tolist() == [5, 6, 1]
+
+    assert graph.shortest_path(pos(1), pos(7), max_depth=6) is None
+    nodes, edges = graph.shortest_path(pos(3), pos(3), max_depth=1)
+    assert nodes.tolist() == [pos(3)] and edges.size == 0
+
+def test_expand_within_frontier_budget():
+    graph = _chain_graph()
+    pos = graph.position_of
+
+    # Node 1 has two out-slots (2 and 6); a budget of one cuts its slice
+    nodes, edges, cut = graph.expand_within(pos(1), 1, "out", max_edges=1)
+    assert cut
+    assert graph.node_ids[nodes].tolist() == [2]
+    assert graph.edge_ids[edges].tolist() == [1]
+
+    # Enough budget for the whole traversal matches expand
+    nodes, edges, cut = graph.expand_within(pos(1), 4, "out", max_edges=100)
+    full_nodes, full_edges = graph.expand(pos(1), 4, "out")
+    assert not cut
+    assert nodes.tolist() == full_nodes.tolist() and edges.tolist() == full_edges.tolist()
+
+    # Budget spent after the first hop stops the traversal there
+    nodes, _, cut = graph.expand_within(pos(1), 4, "out", max_edges=2)
+    assert cut
+    assert sorted(graph.node_ids[nodes].tolist()) == [2, 6]
+
+    # An expired deadline still runs the first hop, then stops
+    nodes, _, cut = graph.expand_within(pos(1), 4, "out", deadline=0.0)
+    assert cut
+    assert sorted(graph.node_ids[nodes].tolist()) == [2, 6]
+
+def test_incident_page_keyset():
+    graph = _chain_graph()
+    pos = graph.position_of
+
+    # Node 6: in-edge 5 from 1, out-edge 6 to 5, merged in edge id order
+    nbrs, edges, resume, cut = graph.incident_page(pos(6), "both", limit=1)
+    assert graph.edge_ids[edges].tolist() == [5] and graph.node_ids[nbrs].tolist() == [1]
+    assert resume == 5 and not cut
+    nbrs, edges, resume, cut = graph.incident_page(pos(6), "both", after=resume, limit=1)
+    assert graph.edge_ids[edges].tolist() == [6] and graph.node_ids[nbrs].tolist() == [5]
+    assert resume is None and not cut
+
+    # Filters apply before the limit
+    _, edges, resume, _ = graph.incident_page(pos(5), "both", limit=1, edge_types=["b"])
+    assert graph.edge_ids[edges].tolist() == [6] and resume is None
+
+    # A slot budget stops the scan and reports where to resume
+    _, edges, resume, cut = graph.incident_page(pos(1), "out", limit=10, max_slots=1)
+    assert graph.edge_ids[edges].tolist() == [1]
+    assert resume == 1 and cut
+
+def test_multi_source_expansion_and_induced_edges():
+    graph = _chain_graph()
+    pos = graph.position_of
+
+    # Seeds expand together and are never reported as discovered
+    seeds = [pos(2), pos(6)]
+    nodes, _, _ = graph.expand_within(seeds, 1, "out")
+    assert sorted(graph.node_ids[nodes].tolist()) == [3, 5]
+
+    # Edges among {1, 2, 6, 5}: 1->2, 1->6, 6->5, but not 2->3 or 4->5
+    edges, cut = graph.induced_edges([pos(1), pos(2), pos(6), pos(5)])
+    assert graph.edge_ids[edges].tolist() == [1, 5, 6] and not cut
+    edges, _ = graph.induced_edges([pos(1), pos(2), pos(6), pos(5)], edge_types=["b"])
+    assert graph.edge_ids[edges].tolist() == [5, 6]
+    edges, cut = graph.induced_edges([pos(1), pos(2), pos(6), pos(5)], max_edges=2)
+    assert graph.edge_ids[edges].tolist() == [1, 5] and cut
@@ -45,3 +45,190 @@ def test_edge_query(test_data_dir):
         results = conn.execute(query).fetchall()
         
         assert len(results) > 0
+
+def test_load_data_materialized_indexed(test_data_dir):
+    """
+    materialized+indexed copies both tables into native storage with ART indexes.
+    """
+    with patch.dict(os.environ, {"DATA_DIR": test_data_dir, "LOAD_MODE": "materialized+indexed"}):
+        conn = load_data()
+
+        table_types = dict(conn.execute(
+            "SELECT table_name, table_type FROM information_schema.tables"
+        ).fetchall())
+        assert table_types["nodes"] == "BASE TABLE"
+        assert table_types["edges"] == "BASE TABLE"
+
+        indexes = {r[0] for r in conn.execute("SELECT index_name FROM duckdb_indexes()").fetchall()}
+        assert {"idx_nodes_id", "idx_edges_source_id", "idx_edges_target_id"} <= indexes
+
+        row = conn.execute("SELECT display_name FROM nodes WHERE id = 12000001").fetchone()
+        assert row[0] == "Officer A"
+
+def test_load_data_invalid_mode(test_data_dir):
+    with patch.dict(os.environ, {"DATA_DIR": test_data_dir, "LOAD_MODE": "bogus"}):
+        with pytest.raises(ValueError):
+            load_data()
+
+def test_load_data_persistent_reuses_matching_file(test_data_dir, tmp_path):
+    """
+    DB_PATH builds a .duckdb file once and re-attaches it while the fingerprint matches.
+    """
+    db_path = str(tmp_path / "graph.duckdb")
+    with patch.dict(os.environ, {"DATA_DIR": test_data_dir, "DB_PATH": db_path}):
+        conn = load_data()
+        assert conn.execute("SELECT count(*) FROM nodes").fetchone()[0] > 0
+        conn.close()
+        built_mtime = os.stat(db_path).st_mtime_ns
+
+        conn = load_data()
+        assert os.stat(db_path).st_mtime_ns == built_mtime
+        # Adjacency comes back from the file
+        from src.graph import AdjacencyIndex
+        graph = AdjacencyIndex.from_connection(conn)
+        officer = graph.position_of(12000001)
+        nbrs, _ = graph.gather([officer], "out")
+        assert graph.node_ids[nbrs].tolist() == [11000001]
+        conn.close()
+
+def test_load_data_persistent_rebuilds_on_change(test_data_dir, tmp_path):
+    import shutil
+    # Touch a copy: the session fixture's files are shared with other tests
+    data_dir = str(tmp_path / "data")
+    shutil.copytree(test_data_dir, data_dir)
+    db_path = str(tmp_path / "graph.duckdb")
+    with patch.dict(os.environ, {"DATA_DIR": data_dir, "DB_PATH": db_path}):
+        load_data().close()
+        first = _stored_fingerprint_of(db_path)
+
+        # Touching a source file changes its mtime, hence the fingerprint
+        edges_path = os.path.join(data_dir, "edges.parquet")
+        stat = os.stat(edges_path)
+        os.utime(edges_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        load_data().close()
+        assert _stored_fingerprint_of(db_path) != first
+
+def _stored_fingerprint_of(db_path):
+    import duckdb
+    conn = duckdb.connect(db_path, read_only=True)
+    try:
+        return conn.execute("SELECT value FROM yata.meta WHERE key = 'fingerprint'").fetchone()[0]
+    finally:
+        conn.close()
+
+def test_load_data_persistent_reload_while_attached(test_data_dir, tmp_path):
+    """
+    A rebuild while the previous build is still open in this process must
+    serve the new data, not DuckDB's cached instance of the old file.
+    """
+    import duckdb
+    import shutil
+    data_dir = str(tmp_path / "data")
+    shutil.copytree(test_data_dir, data_dir)
+    db_path = str(tmp_path / "graph.duckdb")
+    with patch.dict(os.environ, {"DATA_DIR": data_dir, "DB_PATH": db_path}):
+        old = load_data()
+        old_count = old.execute("SELECT count(*) FROM nodes").fetchone()[0]
+
+        nodes_path = os.path.join(data_dir, "nodes.parquet")
+        rewrite = duckdb.connect(":memory:")
+        rewrite.execute(f"CREATE TABLE t AS SELECT * FROM '{nodes_path}' LIMIT 1")
+        rewrite.execute(f"COPY t TO '{nodes_path}' (FORMAT PARQUET)")
+        rewrite.close()
+
+        new = load_data()
+        assert new.execute("SELECT count(*) FROM nodes").fetchone()[0] == 1
+        assert old.execute("SELECT count(*) FROM nodes").fetchone()[0] == old_count
+        old.close()
+        new.close()
+
+def test_load_data_hive_partitioned(test_data_dir, tmp_path):
+    """
+    A nodes/ directory partitioned by node_type is read as one table with the
+    partition key as a column, and filters on it only touch matching files.
+    """
+    import duckdb
+    from src.loader import data_paths, source_fingerprint
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    conn = duckdb.connect(":memory:")
+    conn.execute(
+        f"COPY (SELECT * FROM '{test_data_dir}/nodes.parquet') "
+        f"TO '{data_dir / 'nodes'}' (FORMAT PARQUET, PARTITION_BY (node_type))"
+    )
+    conn.execute(f"COPY (SELECT * FROM '{test_data_dir}/edges.parquet') TO '{data_dir / 'edges.parquet'}' (FORMAT PARQUET)")
+    conn.close()
+
+    with patch.dict(os.environ, {"DATA_DIR": str(data_dir)}):
+        paths = data_paths()
+        assert paths["nodes"].endswith(os.path.join("nodes", "**", "*.parquet"))
+
+        conn = load_data()
+        rows = conn.execute("SELECT id FROM nodes WHERE node_type = 'officer' ORDER BY id").fetchall()
+        assert rows == [(12000001,), (12000002,)]
+
+        plan = conn.execute("EXPLAIN ANALYZE SELECT id FROM nodes WHERE node_type = 'officer'").fetchall()[0][1]
+        assert "Total Files Read: 1" in plan
+        conn.close()
+
+        # Adding a part file changes the dataset fingerprint
+        before = source_fingerprint(paths["nodes"], paths["edges"], "view")
+        extra = data_dir / "nodes" / "node_type=officer" / "extra.parquet"
+        duckdb.sql(f"COPY (SELECT 12000003::BIGINT AS id, 'Officer C' AS display_name) TO '{extra}' (FORMAT PARQUET)")
+        assert source_fingerprint(paths["nodes"], paths["edges"], "view") != before
+
+def test_build_optimized(tmp_path, capsys):
+    """
+    `build` writes sorted copies with small row groups, reports row-group
+    skipping, and the output directory loads as a dataset with edges_by_target.
+    """
+    import duckdb
+    from src.catalog import Catalog
+    from src.loader import main, row_group_skips
+    # DuckDB rounds row groups up to 2048 rows, so use enough random edges to span several
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    out_dir = tmp_path / "optimized"
+    conn = duckdb.connect(":memory:")
+    conn.execute(
+        f"COPY (SELECT range AS id, 'node' AS node_type, 'n' || range AS display_name FROM range(1000)) "
+        f"TO '{data_dir / 'nodes.parquet'}' (FORMAT PARQUET)"
+    )
+    conn.execute(
+        f"COPY (SELECT range AS id, 'link' AS edge_type, (range * 7919) % 1000 AS source_id, "
+        f"(range * 104729) % 1000 AS target_id FROM range(10000)) "
+        f"TO '{data_dir / 'edges.parquet'}' (FORMAT PARQUET, ROW_GROUP_SIZE 2048)"
+    )
+    conn.close()
+
+    with patch.dict(os.environ, {"DATA_DIR": str(data_dir)}):
+        main(["build", "--out", str(out_dir), "--row-group-size", "2048", "--sample", "100"])
+    report = capsys.readouterr().out
+    assert "edges.target_id" in report and "after:" in report
+
+    conn = duckdb.connect(":memory:")
+    by_target = str(out_dir / "edges_by_target.parquet")
+    targets = [row[0] for row in conn.execute(f"SELECT target_id FROM '{by_target}'").fetchall()]
+    assert targets == sorted(targets)
+    row_groups = conn.execute(f"SELECT count(DISTINCT row_group_id) FROM parquet_metadata('{by_target}')").fetchone()[0]
+    assert row_groups > 1
+    skips = row_group_skips(conn, by_target, "target_id", [targets[0]])
+    assert skips["row_groups"] == row_groups and skips["skipped"] >= 1
+    conn.close()
+
+    with patch.dict(os.environ, {"DATA_DIR": str(out_dir)}):
+        conn = load_data()
+        catalog = Catalog.from_connection(conn, distinct=False)
+        assert catalog.lookup_relation("edges", ["target_id"]) == "edges_by_target"
+        assert catalog.lookup_relation("edges", ["source_id"]) == "edges"
+        assert conn.execute("SELECT count(*) FROM edges_by_target").fetchone() == conn.execute("SELECT count(*) FROM edges").fetchone()
+        conn.close()
+
+def test_load_data_engine_settings(test_data_dir):
+    with patch.dict(os.environ, {"DATA_DIR": test_data_dir, "DUCKDB_MEMORY_LIMIT": "512MB", "DUCKDB_THREADS": "2"}):
+        conn = load_data()
+        cursor = conn.cursor()
+        assert cursor.execute("SELECT current_setting('threads')").fetchone()[0] == 2
+        assert cursor.execute("SELECT current_setting('memory_limit')").fetchone()[0] == "488.2 MiB"
+        conn.close()
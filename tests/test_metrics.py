@@ -0,0 +1,39 @@
+from src.metrics import Histogram, Gauge
+
+def test_histogram_renders_cumulative_buckets():
+    histogram = Histogram("test_seconds", "Test.", (0.1, 1.0), ("route",))
+    for value in [0.05, 0.1, 0.5, 3.0]:
+        histogram.observe(value, "/a")
+    lines = histogram.render()
+    assert 'test_seconds_bucket{route="/a",le="0.1"} 2' in lines
+    assert 'test_seconds_bucket{route="/a",le="1.0"} 3' in lines
+    assert 'test_seconds_bucket{route="/a",le="+Inf"} 4' in lines
+    assert 'test_seconds_count{route="/a"} 4' in lines
+    assert "# TYPE test_seconds histogram" in lines
+
+    gauge = Gauge("test_phase", "Test.", ("phase",))
+    gauge.set(1.5, 'say "hi"')
+    assert gauge.render()[-1] == 'test_phase{phase="say \\"hi\\""} 1.5'
+
+def test_metrics_endpoint(api_client):
+    """
+    Requests show up per route template, with query, row and serialization
+    timings recorded below the endpoint, next to the startup phases.
+    """
+    assert api_client.get("/api/v1/nodes/11000001").status_code == 200
+    assert api_client.get("/api/v1/search", params={"display_name": "Officer", "fuzzy": "true"}).status_code == 200
+    assert api_client.get("/api/v1/search", params={"table": "bogus", "id": "1"}).status_code == 400
+
+    response = api_client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    body = response.text
+
+    assert 'yata_request_duration_seconds_count{route="/api/v1/nodes/{id}",method="GET",status="200"}' in body
+    assert 'yata_request_duration_seconds_count{route="/api/v1/search",method="GET",status="400"}' in body
+    assert 'yata_query_duration_seconds_count{route="/api/v1/nodes/{id}"}' in body
+    assert 'yata_query_rows_count{route="/api/v1/search"}' in body
+    assert 'yata_conversion_duration_seconds_count{route="/api/v1/search"}' in body
+    assert 'yata_serialization_duration_seconds_count{route="/api/v1/nodes/{id}"}' in body
+    assert 'yata_startup_phase_seconds{phase="adjacency"}' in body
+    assert 'yata_startup_phase_seconds{phase="tables"}' in body
@@ -0,0 +1,64 @@
+import pytest
+from src.pgq import MatchQuery, PatternError, MAX_MATCH_HOPS
+
+
+@pytest.fixture
+def match_query(api_client):
+    from src.main import app
+    from src.deps import get_dataset, get_match_query
+    query = MatchQuery(app.dependency_overrides[get_dataset]().catalog)
+    app.dependency_overrides[get_match_query] = lambda: query
+    return query
+
+
+def test_compile_shortest_path(match_query):
+    sql, params, columns = match_query.compile(
+        "p = ANY SHORTEST (a:nodes)-[e:edges]->{1,4}(b:nodes)",
+        columns=["path_length(p)", "vertices(p)", "b.display_name"],
+        where={"a.id": 12000001, "b.id": 14000001},
+        limit=10,
+    )
+    assert sql.startswith("SELECT * FROM GRAPH_TABLE (yata_graph MATCH p = ANY SHORTEST")
+    assert "WHERE a.id = ? AND b.id = ?" in sql
+    assert 'path_length(p) AS "path_length(p)"' in sql
+    assert params == [12000001, 14000001, 10]
+    assert columns == ["path_length(p)", "vertices(p)", "b.display_name"]
+
+
+def test_compile_default_columns(match_query):
+    _, _, columns = match_query.compile("(a:nodes)-[e:edges]->(b:nodes)")
+    assert columns == ["a.id", "b.id", "e.id"]
+
+
+@pytest.mark.parametrize("pattern", [
+    "(a:nodes)-[e:edges]->*(b:nodes)",
+    "(a:nodes)-[e:edges]->{1,}(b:nodes)",
+    f"(a:nodes)-[e:edges]->{{1,{MAX_MATCH_HOPS + 1}}}(b:nodes)",
+    "(a:nodes)) , (SELECT 1",
+    "(a:nodes); DROP TABLE nodes",
+    "(a:people)",
+    "(a:nodes) WHERE a.id = 1",
+    "",
+])
+def test_rejects_unbounded_or_foreign_patterns(match_query, pattern):
+    with pytest.raises(PatternError):
+        match_query.compile(pattern)
+
+
+def test_rejects_unknown_columns(match_query):
+    with pytest.raises(PatternError):
+        match_query.compile("(a:nodes)", columns=["a.missing"])
+    with pytest.raises(PatternError):
+        match_query.compile("(a:nodes)", where={"b.id": 1})
+    with pytest.raises(PatternError):
+        match_query.compile("(a:nodes)", columns=["path_length(a)"])
+
+
+def test_match_endpoint_validates_pattern(api_client, match_query):
+    response = api_client.post("/api/v1/graph/match", json={"pattern": "(a:nodes)-[e:edges]->*(b:nodes)"})
+    assert response.status_code == 400
+
+
+def test_match_endpoint_disabled(api_client):
+    response = api_client.post("/api/v1/graph/match", json={"pattern": "(a:nodes)"})
+    assert response.status_code == 501
@@ -0,0 +1,66 @@
+import pytest
+import threading
+import duckdb
+from src.pool import CursorPool, PoolTimeout
+
+def test_pool_hands_out_distinct_cursors():
+    conn = duckdb.connect(":memory:")
+    conn.execute("CREATE TABLE t AS SELECT range AS v FROM range(3)")
+    pool = CursorPool(conn, size=2)
+
+    with pool.acquire() as c1, pool.acquire() as c2:
+        assert c1 is not c2
+        # Both cursors see the same database
+        assert c1.execute("SELECT count(*) FROM t").fetchone()[0] == 3
+        assert c2.execute("SELECT count(*) FROM t").fetchone()[0] == 3
+        assert pool.stats()["in_use"] == 2
+
+    stats = pool.stats()
+    assert stats["in_use"] == 0
+    assert stats["acquired"] == 2
+    assert stats["peak_in_use"] == 2
+
+def test_pool_times_out_when_saturated():
+    conn = duckdb.connect(":memory:")
+    pool = CursorPool(conn, size=1)
+
+    with pool.acquire():
+        with pytest.raises(PoolTimeout):
+            with pool.acquire(timeout=0.01):
+                pass
+
+    stats = pool.stats()
+    assert stats["saturated"] == 1
+    assert stats["timeouts"] == 1
+
+def test_pool_waiter_gets_released_cursor():
+    conn = duckdb.connect(":memory:")
+    pool = CursorPool(conn, size=1)
+    release = threading.Event()
+
+    def holder():
+        with pool.acquire():
+            release.wait()
+
+    t = threading.Thread(target=holder)
+    t.start()
+    while pool.stats()["in_use"] == 0:
+        pass
+    threading.Timer(0.05, release.set).start()
+
+    with pool.acquire(timeout=5) as cursor:
+        assert cursor.execute("SELECT 1").fetchone()[0] == 1
+    t.join()
+
+    stats = pool.stats()
+    assert stats["saturated"] == 1
+    assert stats["wait_seconds_max"] > 0
+
+def test_stats_endpoint(api_client):
+    api_client.get("/api/v1/nodes/12000001")
+    response = api_client.get("/api/v1/stats")
+    assert response.status_code == 200
+    pool = response.json()["pool"]
+    assert pool["size"] == 2
+    assert pool["acquired"] >= 1
+    assert pool["in_use"] == 0
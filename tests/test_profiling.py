@@ -0,0 +1,43 @@
+import json
+
+def test_profile_requires_opt_in(api_client, monkeypatch):
+    monkeypatch.delenv("QUERY_PROFILING", raising=False)
+    response = api_client.get("/api/v1/search", params={"display_name": "Officer A", "profile": "true"})
+    assert response.status_code == 403
+
+def test_search_profile(api_client, monkeypatch):
+    monkeypatch.setenv("QUERY_PROFILING", "1")
+    response = api_client.get("/api/v1/search", params={"display_name": "Officer A", "profile": "true"})
+    assert response.status_code == 200
+    res = response.json()
+    assert [r["id"] for r in res["results"]] == [12000001]
+
+    profile = res["profile"]
+    assert profile["phases"]["query"] > 0 and "conversion" in profile["phases"]
+    query = profile["queries"][0]
+    assert "display_name = ?" in query["sql"]
+    assert query["plan"]["children"], "operator tree missing"
+    assert query["plan"]["rows_returned"] == 1
+
+    # Profiling is per request: the cursor goes back to the pool with it switched off
+    plain = api_client.get("/api/v1/search", params={"display_name": "Officer A"}).json()
+    assert "profile" not in plain
+
+def test_neighbors_profile(api_client, monkeypatch):
+    monkeypatch.setenv("QUERY_PROFILING", "1")
+    api_client.get("/api/v1/nodes/11000001/neighbors")
+    res = api_client.get("/api/v1/nodes/11000001/neighbors", params={"profile": "true"}).json()
+    assert len(res["nodes"]) == 2
+    assert "traversal" in res["profile"]["phases"]
+    assert any("SEMI JOIN" in q["sql"] for q in res["profile"]["queries"])
+
+def test_slow_query_log(api_client, monkeypatch, tmp_path):
+    log = tmp_path / "slow.jsonl"
+    monkeypatch.setenv("SLOW_QUERY_SECONDS", "0.000001")
+    monkeypatch.setenv("SLOW_QUERY_LOG", str(log))
+    assert api_client.get("/api/v1/search", params={"display_name": "Officer A"}).status_code == 200
+
+    entries = [json.loads(line) for line in log.read_text().splitlines()]
+    assert entries and entries[0]["event"] == "slow_query"
+    assert entries[0]["route"] == "/api/v1/search"
+    assert "Officer A" not in log.read_text()
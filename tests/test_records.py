@@ -0,0 +1,26 @@
+import pytest
+import duckdb
+import numpy as np
+from src.records import column_to_list, node_records
+
+def test_column_to_list_nulls_and_nan():
+    conn = duckdb.connect(":memory:")
+    cols = conn.execute(
+        "SELECT * FROM (VALUES (1, 'a', 1.5), (NULL, NULL, 'nan'::DOUBLE)) t(i, s, f)"
+    ).fetchnumpy()
+    assert column_to_list(cols["i"]) == [1, None]
+    assert column_to_list(cols["s"]) == ["a", None]
+    assert column_to_list(cols["f"]) == [1.5, None]
+
+def test_node_records_follow_requested_order():
+    conn = duckdb.connect(":memory:")
+    conn.execute("""
+        CREATE TABLE nodes AS
+        SELECT * FROM (VALUES (1::BIGINT, 'A', 'officer', 'JPN'), (2, 'B', 'entity', NULL)) t(id, display_name, node_type, country)
+    """)
+    records = node_records(conn, np.array([2, 99, 1]))
+    assert [r["id"] for r in records] == [2, 1]
+    assert records[0] == {
+        "id": 2, "node_type": "entity", "display_name": "B", "properties": {"country": None},
+        "pagerank": None, "component": None, "component_size": None,
+    }
@@ -0,0 +1,82 @@
+import os
+import shutil
+import duckdb
+import pytest
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+
+NEW_NODE = 99000001
+
+def _add_node(data_dir):
+    nodes_path = os.path.join(data_dir, "nodes.parquet")
+    conn = duckdb.connect(":memory:")
+    conn.execute(f"""
+        CREATE TABLE t AS
+        SELECT * FROM '{nodes_path}'
+        UNION ALL SELECT {NEW_NODE}, 'New Entity', 'entity'
+    """)
+    conn.execute(f"COPY t TO '{nodes_path}' (FORMAT PARQUET)")
+    conn.close()
+
+@pytest.fixture
+def live_client(test_data_dir, tmp_path):
+    """
+    Client on the real (non-overridden) dataset singleton over a private copy of the data.
+    """
+    from src import deps
+    from src.main import app
+
+    data_dir = str(tmp_path / "data")
+    shutil.copytree(test_data_dir, data_dir)
+    with patch.dict(os.environ, {"DATA_DIR": data_dir, "DB_POOL_SIZE": "2", "LOAD_MODE": "view", "ADMIN_TOKEN": "secret"}):
+        deps.close_dataset()
+        yield TestClient(app), data_dir
+        deps.close_dataset()
+
+def test_reload_swaps_in_new_data(live_client):
+    client, data_dir = live_client
+    before = client.get("/api/v1/stats").json()["dataset"]
+    assert client.get(f"/api/v1/nodes/{NEW_NODE}").json()["count"] == 0
+
+    _add_node(data_dir)
+    response = client.post("/api/v1/admin/reload?wait=true", headers={"Authorization": "Bearer secret"})
+    assert response.status_code == 200
+    assert response.json()["version"] != before["version"]
+
+    # Fresh dataset, fresh cache: the previously cached miss is gone
+    assert client.get(f"/api/v1/nodes/{NEW_NODE}").json()["count"] == 1
+    after = client.get("/api/v1/stats").json()["dataset"]
+    assert after["reloads"] == before["reloads"] + 1
+
+def test_reload_drains_in_flight_requests(live_client):
+    from src import deps
+
+    client, data_dir = live_client
+    # Views re-read Parquet on every query; materialized tables pin a version
+    os.environ["LOAD_MODE"] = "materialized"
+    old = deps.get_current_dataset()
+    # Simulate a request still running on the old dataset
+    assert old.acquire()
+
+    _add_node(data_dir)
+    new = deps.reload_dataset()
+    assert new is not old
+    with old.pool.acquire() as cursor:
+        assert cursor.execute(f"SELECT count(*) FROM nodes WHERE id = {NEW_NODE}").fetchone()[0] == 0
+    with new.pool.acquire() as cursor:
+        assert cursor.execute(f"SELECT count(*) FROM nodes WHERE id = {NEW_NODE}").fetchone()[0] == 1
+
+    old.release()
+    # Drained and closed; it no longer accepts requests
+    assert not old.acquire()
+
+def test_reload_requires_admin_token(live_client):
+    client, _ = live_client
+    assert client.post("/api/v1/admin/reload").status_code == 401
+    assert client.post("/api/v1/admin/reload", headers={"Authorization": "Bearer wrong"}).status_code == 401
+
+    # Off entirely without ADMIN_TOKEN
+    with patch.dict(os.environ):
+        del os.environ["ADMIN_TOKEN"]
+        response = client.post("/api/v1/admin/reload", headers={"Authorization": "Bearer secret"})
+        assert response.status_code == 403
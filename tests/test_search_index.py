@@ -0,0 +1,51 @@
+import pytest
+import duckdb
+import numpy as np
+from src.search_index import SearchIndex, TrigramIndex
+
+@pytest.fixture
+def names_conn():
+    conn = duckdb.connect(":memory:")
+    conn.execute("""
+        CREATE TABLE nodes AS SELECT * FROM (VALUES
+            (1::BIGINT, 'Apple Holdings Ltd', 'entity'),
+            (2, 'apple', 'entity'),
+            (3, 'Pineapple Trading', 'entity'),
+            (4, 'Appleby Global', 'intermediary'),
+            (5, NULL, 'address'),
+            (6, 'Müller & Söhne GmbH', 'entity'),
+            (7, 'APPLE', 'officer')
+        ) t(id, display_name, node_type)
+    """)
+    return conn
+
+def test_trigram_index_matches_ilike(names_conn):
+    index = TrigramIndex.build(names_conn, "display_name")
+    for needle in ["apple", "APP", "ltd", "söhne", "müll", "ple t", "xyz", "apple holdings ltd"]:
+        rows, _, _ = index.search(needle)
+        expected = {r[0] for r in names_conn.execute(
+            "SELECT id FROM nodes WHERE display_name ILIKE ?", [f"%{needle}%"]
+        ).fetchall()}
+        assert set(index.ids[rows].tolist()) == expected, needle
+
+def test_trigram_index_short_query_not_covered(names_conn):
+    index = SearchIndex.from_connection(names_conn, ["display_name"])
+    assert index.indexes["display_name"].search("ap") is None
+    assert not index.covers({"display_name": "ap"})
+    assert not index.covers({"node_type": "entity"})
+    assert index.covers({"display_name": "app"})
+
+def test_search_index_ranking(names_conn):
+    index = SearchIndex.from_connection(names_conn, ["display_name", "node_type"])
+    ranked = index.search({"display_name": "apple"}).tolist()
+    # Exact (case-insensitive) matches first, then prefixes, then substrings
+    assert ranked[:2] == [2, 7]
+    assert ranked[2:4] == [4, 1]
+    assert ranked[4:] == [3]
+
+    # Conditions on several columns intersect
+    assert index.search({"display_name": "apple", "node_type": "officer"}).tolist() == [7]
+
+def test_search_index_skips_non_varchar(names_conn):
+    index = SearchIndex.from_connection(names_conn, ["id", "display_name"])
+    assert list(index.indexes) == ["display_name"]